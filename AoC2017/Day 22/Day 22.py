@@ -1,47 +1,29 @@
-from xypair import XYpair
-from pointwalker import PointWalker
-from space import Space
+from sparsegrid import Ant, SparseGrid
 
 PART1_TEST_ANSWER = 5587
 PART2_TEST_ANSWER = 2511944
 
+CLEAN, WEAKENED, INFECTED, FLAGGED = range(4)
 
-class Cluster(Space):
-    def __init__(self, *args, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
-
-        self.infected_nodes: set[XYpair] = self.items['#']
-        self.weakened_nodes: set[XYpair] = set()
-        self.flagged_nodes: set[XYpair] = set()
-        self.carrier: PointWalker = PointWalker((self.width // 2, self.height // 2), 'NORTH')
-        self.infections_caused: int = 0
-
-    def burst(self, *, evolved: bool = False) -> None:
-        cur_pos: XYpair = self.carrier.position
-        if cur_pos in self.infected_nodes:
-            self.carrier.turn('RIGHT')
-            self.infected_nodes.remove(cur_pos)
-            if evolved:
-                self.flagged_nodes.add(cur_pos)
-
-        elif cur_pos in self.weakened_nodes:
-            self.weakened_nodes.remove(cur_pos)
-            self.infected_nodes.add(cur_pos)
-            self.infections_caused += 1
-
-        elif cur_pos in self.flagged_nodes:
-            self.carrier.turn('BACKWARD')
-            self.flagged_nodes.remove(cur_pos)
 
+class Cluster:
+    def __init__(self, puzzle_input: str, *, evolved: bool = False) -> None:
+        lines: list[str] = puzzle_input.split('\n')
+        self.nodes: SparseGrid = SparseGrid.from_lines(lines, '.W#F')
+        if evolved:
+            turns: dict[int, str] = {CLEAN: 'LEFT', INFECTED: 'RIGHT', FLAGGED: 'BACKWARD'}
+            next_states: dict[int, int] = {CLEAN: WEAKENED, WEAKENED: INFECTED, INFECTED: FLAGGED, FLAGGED: CLEAN}
         else:
-            self.carrier.turn('LEFT')
-            if evolved:
-                self.weakened_nodes.add(cur_pos)
-            else:
-                self.infected_nodes.add(cur_pos)
-                self.infections_caused += 1
+            turns = {CLEAN: 'LEFT', INFECTED: 'RIGHT'}
+            next_states = {CLEAN: INFECTED, INFECTED: CLEAN}
+        self.carrier: Ant = Ant(self.nodes, (len(lines[0]) // 2, len(lines) // 2), 'NORTH', turns, next_states)
 
-        self.carrier.step()
+    def burst(self, times: int = 1) -> None:
+        self.carrier.run(times)
+
+    @property
+    def infections_caused(self) -> int:
+        return self.carrier.writes[INFECTED]
 
 
 def parse(puzzle_input: str):
@@ -50,15 +32,13 @@ def parse(puzzle_input: str):
 
 def part1(data):
     cluster: Cluster = Cluster(data)
-    for _ in range(10000):
-        cluster.burst()
+    cluster.burst(10000)
     return cluster.infections_caused
 
 
 def part2(data):
-    cluster: Cluster = Cluster(data)
-    for _ in range(10000000):
-        cluster.burst(evolved=True)
+    cluster: Cluster = Cluster(data, evolved=True)
+    cluster.burst(10000000)
     return cluster.infections_caused
 
 
@@ -74,19 +54,35 @@ def get_puzzle_input(file: pathlib.Path) -> str:
     return file.read_text().strip('\n').replace('\t', ' ' * 4)
 
 
-def execute(func, puzzle_input: str) -> (..., int):
+def execute(func, puzzle_input: str) -> (..., int, int):
     import time
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
 
     start: int = time.perf_counter_ns()
-    result = func(parse(puzzle_input))
-    execution_time_us: int = (time.perf_counter_ns() - start) // 1000
-    return result, execution_time_us
-
-
-def timestamp(execution_time_us: int) -> str:
-    stamp: str = f'{round(execution_time_us / 1000000, 3)} s'
-    if execution_time_us < 1000000:
-        stamp = f'{round(execution_time_us / 1000, 3)} ms'
+    data = parsecache.cached(parse, puzzle_input, defer_snapshot=True) if parsecache else parse(puzzle_input)
+    parsed: int = time.perf_counter_ns()
+    if parsecache:
+        parsecache.snapshot()  # Copying the result for part 2 is timed as neither parse nor solve
+    solving: int = time.perf_counter_ns()
+    result = func(data)
+    parse_time_us: int = (parsed - start) // 1000
+    execution_time_us: int = (time.perf_counter_ns() - solving) // 1000
+    return result, parse_time_us, execution_time_us
+
+
+def duration(time_us: int) -> str:
+    if time_us < 1000000:
+        return f'{round(time_us / 1000, 3)} ms'
+    return f'{round(time_us / 1000000, 3)} s'
+
+
+def timestamp(execution_time_us: int, parse_time_us: int | None = None) -> str:
+    stamp: str = duration(execution_time_us)
+    if parse_time_us is not None:
+        stamp += f', parse {duration(parse_time_us)}'
     return f'\t[{stamp}]'
 
 
@@ -112,9 +108,9 @@ def test(part_num: int, directory: str) -> None:
         print(prefix + 'no input')
         return
 
-    result, duration = execute(func, puzzle_input)
+    result, parse_time, solve_time = execute(func, puzzle_input)
     result = 'PASS' if result == answer else 'FAIL'
-    print(prefix + result + timestamp(duration))
+    print(prefix + result + timestamp(solve_time, parse_time))
 
 
 def solve(part_num: int, directory: str) -> None:
@@ -131,8 +127,8 @@ def solve(part_num: int, directory: str) -> None:
         print(prefix + 'no input')
         return
 
-    result, duration = execute(func, puzzle_input)
-    suffix: str = '' if result is None else timestamp(duration)
+    result, parse_time, solve_time = execute(func, puzzle_input)
+    suffix: str = '' if result is None else timestamp(solve_time, parse_time)
     print(prefix + str(result) + suffix)
 
 
@@ -145,4 +141,4 @@ if __name__ == '__main__':
     test(2, working_directory)
     print()
     solve(1, working_directory)
-    #solve(2, working_directory)
+    solve(2, working_directory)
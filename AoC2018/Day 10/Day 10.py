@@ -2,32 +2,19 @@ import pathlib
 import sys
 import os
 import re
-from collections.abc import Iterable
 
-from xypair import XYpair
-
-
-class Point:
-    def __init__(self, pos_x: int, pos_y: int, vel_x: int, vel_y: int) -> None:
-        self.position: XYpair = XYpair(pos_x, pos_y)
-        self.velocity: XYpair = XYpair(vel_x, vel_y)
-
-    def position_at_time(self, t: int) -> XYpair:
-        return self.position + self.velocity * t
+from particle import ParticleSystem
 
 
 def parse(puzzle_input: str):
     """Parse input"""
-    return [Point(*(int(n) for n in re.findall(r'-?\d+', line))) for line in puzzle_input.split('\n')]
-
+    numbers: list[list[int]] = [[int(n) for n in re.findall(r'-?\d+', line)] for line in puzzle_input.split('\n')]
+    return ParticleSystem((n[:2] for n in numbers), (n[2:] for n in numbers))
 
-def print_points_at_time(points: Iterable[Point], t: int) -> str:
-    points_at_time: frozenset[XYpair] = frozenset(point.position_at_time(t) for point in points)
 
-    min_x: int = min(pt.x for pt in points_at_time)
-    max_x: int = max(pt.x for pt in points_at_time)
-    min_y: int = min(pt.y for pt in points_at_time)
-    max_y: int = max(pt.y for pt in points_at_time)
+def print_points_at_time(points: ParticleSystem, t: int) -> str:
+    points_at_time: frozenset[tuple[int, ...]] = frozenset(points.positions_at(t))
+    (min_x, min_y), (max_x, max_y) = points.bounding_box(t)
 
     if max_y - min_y > 10:
         return ''
@@ -46,11 +33,11 @@ def print_points_at_time(points: Iterable[Point], t: int) -> str:
 
 def part1(data):
     """Solve part 1"""
-    for t in range(1, 11000):
-        if message := print_points_at_time(data, t):
-            print(message)
-            print(f'after {t} seconds')
-            return
+    # Nothing accelerates, so the points are closest together exactly once
+    t: int = data.converge(100000)
+    if message := print_points_at_time(data, t):
+        print(message)
+        print(f'after {t} seconds')
 
 
 def solve(puzzle_input: str):
@@ -1,8 +1,8 @@
 import pathlib
 import sys
 import os
-import functools
 
+from prefixsum import PrefixSum2D
 from xypair import XYpair
 
 
@@ -17,69 +17,32 @@ def power_level(pt: XYpair, grid_serial_number: int) -> int:
     return (level // 100) % 10 - 5
 
 
-@functools.cache
-def total_power(top_left: XYpair, bottom_right: XYpair, grid_serial_number: int) -> int:
-    if bottom_right.x < top_left.x or bottom_right.y < top_left.y:
-        return 0
-
-    if top_left == bottom_right:
-        return power_level(top_left, grid_serial_number)
-
-    if top_left == (1, 1):
-        return power_level(bottom_right, grid_serial_number) \
-                + total_power(top_left, bottom_right.left(), grid_serial_number) \
-                + total_power(top_left, bottom_right.up(), grid_serial_number) \
-                - total_power(top_left, bottom_right.up_left(), grid_serial_number)
-
-    return total_power(XYpair(1, 1), bottom_right, grid_serial_number) \
-               + total_power(XYpair(1, 1), top_left.up_left(), grid_serial_number) \
-               - total_power(XYpair(1, 1), XYpair(bottom_right.x, top_left.y - 1), grid_serial_number) \
-               - total_power(XYpair(1, 1), XYpair(top_left.x - 1, bottom_right.y), grid_serial_number)
-
-
-def prep_cache(max_size: int, grid_serial_number: int) -> None:
-    for y in range(1, max_size + 1):
-        for x in range(1, max_size + 1):
-            total_power(XYpair(1, 1), XYpair(x, y), grid_serial_number)
+def power_grid(grid_serial_number: int) -> PrefixSum2D:
+    return PrefixSum2D.from_function(300, 300, lambda pt: power_level(pt, grid_serial_number), origin=(1, 1))
 
 
 def part1(data):
     """Solve part 1"""
-    prep_cache(300, data)
-
-    max_power: int = 0
-    max_power_cell: tuple[int, int] = (0, 0)
-    size: int = 3
-    for y in range(1, 302 - size):
-        for x in range(1, 302 - size):
-            power: int = total_power(XYpair(x, y), XYpair(x + size - 1, y + size - 1), data)
-            if power > max_power:
-                max_power = power
-                max_power_cell = (x, y)
-    return max_power_cell
+    _, max_power_cell = power_grid(data).best_window(3)
+    return tuple(max_power_cell)
 
 
 def part2(data):
     """Solve part 2"""
-    max_power: int = 0
-    max_power_cell: tuple[int, int] = (0, 0)
-    max_power_size: int = 0
-    for size in range(1, 301):
-        for y in range(1, 302 - size):
-            for x in range(1, 302 - size):
-                power: int = total_power(XYpair(x, y), XYpair(x + size - 1, y + size - 1), data)
-                if power > max_power:
-                    max_power = power
-                    max_power_cell = (x, y)
-                    max_power_size = size
+    _, max_power_cell, max_power_size = power_grid(data).best_window_any_size()
     return *max_power_cell, max_power_size
 
 
 def solve(puzzle_input: str):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -63,9 +63,14 @@ def part2(data):
 
 def solve(puzzle_input: str):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -27,7 +27,7 @@ class Unit:
 
 class Battle(Space):
     def __init__(self, in_put) -> None:
-        super().__init__(in_put)
+        super().__init__(in_put, dense=True)
 
         self.walls: set[XYpair] = self.items['#']
         self.goblins: set[XYpair] = self.items['G']
@@ -40,16 +40,14 @@ class Battle(Space):
         return not self.goblins or not self.elves
 
     def move(self, unit: Unit, destination: XYpair) -> None:
-        if unit.race == 'GOBLIN':
-            self.goblins.remove(unit.position)
-            self.goblins.add(destination)
-        else:
-            self.elves.remove(unit.position)
-            self.elves.add(destination)
+        # set_tile() keeps self.goblins/self.elves and the cached adjacency in sync
+        self.set_tile(unit.position, self.default)
+        self.set_tile(destination, 'G' if unit.race == 'GOBLIN' else 'E')
         unit.position = destination
 
     def first_steps_on_shortest_paths(self, start: XYtuple, finish: XYtuple) -> set[XYpair]:
-        return {path[1] for path in self.min_paths(start, [finish])[finish]}  # noqa
+        results: dict[XYpair, tuple[int, list[XYpair]]] = self.weighted_search(start, finish.__eq__)
+        return {pt for pt in self.on_shortest_paths(results, [finish]) if start in results[pt][1]}
 
     def round(self) -> None:
         for unit in sorted(self.units):
@@ -96,8 +94,7 @@ class Battle(Space):
             weakest_target.take_damage(unit.attack)
             if weakest_target.is_dead():
                 self.units.remove(weakest_target)
-                self.goblins.discard(weakest_target.position)
-                self.elves.discard(weakest_target.position)
+                self.set_tile(weakest_target.position, self.default)
 
         self.rounds_completed += 1
 
@@ -140,9 +137,14 @@ def part2(data):
 
 def solve(puzzle_input: str):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -3,74 +3,27 @@ import sys
 import os
 import re
 import collections
-from collections.abc import Sequence
-
-
-class Device:
-    opcode_list: tuple[str, ...] = ('eqri',  # 0
-                                    'bani',  # 1
-                                    'seti',  # 2
-                                    'bori',  # 3
-                                    'eqir',  # 4
-                                    'banr',  # 5
-                                    'borr',  # 6
-                                    'muli',  # 7
-                                    'setr',  # 8
-                                    'addr',  # 9
-                                    'eqrr',  # 10
-                                    'addi',  # 11
-                                    'gtir',  # 12
-                                    'gtrr',  # 13
-                                    'gtri',  # 14
-                                    'mulr')  # 15
-
-    def __init__(self, opcodes: Sequence[str] = tuple()) -> None:
-        self.registers: list[int] = [0, 0, 0, 0]
-        self.opcode_table: tuple[str, ...] = self.opcode_list
-        if opcodes:
-            assert sorted(opcodes) == sorted(self.opcode_list)
-            self.opcode_table = tuple(opcodes)
-
-    def set_registers(self, values: Sequence[int]) -> None:
-        assert len(values) == 4
-        self.registers = list(values)
-
-    def execute(self, instruction: Sequence[int]) -> None:
-        opcode, a, b, c = instruction
-
-        match self.opcode_table[opcode]:
-            case 'addr':
-                self.registers[c] = self.registers[a] + self.registers[b]
-            case 'addi':
-                self.registers[c] = self.registers[a] + b
-            case 'mulr':
-                self.registers[c] = self.registers[a] * self.registers[b]
-            case 'muli':
-                self.registers[c] = self.registers[a] * b
-            case 'banr':
-                self.registers[c] = self.registers[a] & self.registers[b]
-            case 'bani':
-                self.registers[c] = self.registers[a] & b
-            case 'borr':
-                self.registers[c] = self.registers[a] | self.registers[b]
-            case 'bori':
-                self.registers[c] = self.registers[a] | b
-            case 'setr':
-                self.registers[c] = self.registers[a]
-            case 'seti':
-                self.registers[c] = a
-            case 'gtir':
-                self.registers[c] = 1 if a > self.registers[b] else 0
-            case 'gtri':
-                self.registers[c] = 1 if self.registers[a] > b else 0
-            case 'gtrr':
-                self.registers[c] = 1 if self.registers[a] > self.registers[b] else 0
-            case 'eqir':
-                self.registers[c] = 1 if a == self.registers[b] else 0
-            case 'eqri':
-                self.registers[c] = 1 if self.registers[a] == b else 0
-            case 'eqrr':
-                self.registers[c] = 1 if self.registers[a] == self.registers[b] else 0
+
+from elfcode import Elfcode, OPERATIONS
+
+
+# Opcode numbers as worked out by part 1
+OPCODE_TABLE: tuple[str, ...] = ('eqri',  # 0
+                                 'bani',  # 1
+                                 'seti',  # 2
+                                 'bori',  # 3
+                                 'eqir',  # 4
+                                 'banr',  # 5
+                                 'borr',  # 6
+                                 'muli',  # 7
+                                 'setr',  # 8
+                                 'addr',  # 9
+                                 'eqrr',  # 10
+                                 'addi',  # 11
+                                 'gtir',  # 12
+                                 'gtrr',  # 13
+                                 'gtri',  # 14
+                                 'mulr')  # 15
 
 
 def parse(puzzle_input: str):
@@ -93,17 +46,9 @@ def part1(data):
     more_than_three_opcodes: int = 0
     opcode_options: dict[int, set[str]] = collections.defaultdict(set)
     for before, instruction, after in samples:
-        opcode_num: int = instruction[0]
-
-        potential_opcodes: set[str] = set()
-        possible_mapping: list[str] = list(Device.opcode_list)
-        for _ in range(len(possible_mapping)):
-            device: Device = Device(possible_mapping)
-            device.set_registers(before)
-            device.execute(instruction)
-            if device.registers == after:
-                potential_opcodes.add(possible_mapping[opcode_num])
-            possible_mapping = possible_mapping[1:] + [possible_mapping[0]]
+        opcode_num, a, b, c = instruction
+        potential_opcodes: set[str] = {opcode for opcode, operation in OPERATIONS.items()
+                                       if before[:c] + [operation(before, a, b)] + before[c + 1:] == after}
 
         if len(potential_opcodes) >= 3:
             more_than_three_opcodes += 1
@@ -128,17 +73,21 @@ def part1(data):
 def part2(data):
     """Solve part 2"""
     _, program = data
-    device: Device = Device()
-    for instruction in program:
-        device.execute(instruction)
+    device: Elfcode = Elfcode(((OPCODE_TABLE[opcode], a, b, c) for opcode, a, b, c in program), num_registers=4)
+    device.run()
     return device.registers[0]
 
 
 def solve(puzzle_input: str):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -2,61 +2,40 @@ import pathlib
 import sys
 import os
 
-from xypair import XYpair
-from space import Space
+import aoctools
+from automaton import Automaton, Rule
 
+OPEN, TREES, LUMBERYARD = 0, 1, 2
 
-class Forest(Space):
-    def __init__(self, in_put) -> None:
-        super().__init__(in_put)
 
-        self.trees: set[XYpair] = self.items['|']
-        self.lumberyards: set[XYpair] = self.items['#']
+def next_acre(acre: int, counts: tuple[int, ...]) -> int:
+    trees, lumberyards = counts
+    if acre == OPEN:
+        return TREES if trees >= 3 else OPEN
+    if acre == TREES:
+        return LUMBERYARD if lumberyards >= 3 else TREES
+    return LUMBERYARD if lumberyards >= 1 and trees >= 1 else OPEN
 
-    def minute(self) -> None:
-        new_trees: set[XYpair] = self.trees.copy()
-        new_lumberyards: set[XYpair] = self.lumberyards.copy()
-
-        open_acres: set[XYpair] = set()
-        for tree in self.trees:
-            open_acres.update(self.neighbors(tree, include_corners=True))
-        open_acres -= self.trees | self.lumberyards
-
-        for acre in open_acres:
-            if len(acre.neighbors(include_corners=True) & self.trees) >= 3:
-                new_trees.add(acre)
-
-        for acre in self.trees:
-            if len(acre.neighbors(include_corners=True) & self.lumberyards) >= 3:
-                new_lumberyards.add(acre)
-                new_trees.remove(acre)
 
-        for acre in self.lumberyards:
-            adjacent_acres: set[XYpair] = acre.neighbors(include_corners=True)
-            if not (len(adjacent_acres & self.lumberyards) >= 1 and len(adjacent_acres & self.trees) >= 1):
-                new_lumberyards.remove(acre)
+class Forest:
+    def __init__(self, in_put: str) -> None:
+        self.area: Automaton = Automaton.from_lines(in_put.split('\n'), '.|#',
+                                                    Rule.counting(3, (TREES, LUMBERYARD), next_acre))
 
-        self.trees = self.items['|'] = new_trees
-        self.lumberyards = self.items['#'] = new_lumberyards
+    def minute(self) -> None:
+        self.area.step()
 
     def resource_value(self) -> int:
-        return len(self.trees) * len(self.lumberyards)
+        return self.area.count(TREES) * self.area.count(LUMBERYARD)
 
-    def state(self) -> (frozenset[XYpair], frozenset[XYpair]):
-        return frozenset(self.trees), frozenset(self.lumberyards)
+    def next_state(self, state: bytes) -> bytes:
+        self.area.cells = state
+        self.minute()
+        return self.area.cells
 
     def minutes_pass(self, num_minutes: int) -> None:
-        seen: dict[tuple[frozenset[XYpair], frozenset[XYpair]], int] = {}
-        for m in range(num_minutes):
-            seen[self.state()] = m
-
-            self.minute()
-
-            if self.state() in seen:
-                startup: int = seen[self.state()]
-                cycle_length: int = m - startup + 1
-                reduced_minutes: int = (num_minutes - startup) % cycle_length
-                return self.minutes_pass(reduced_minutes)
+        # The stored history answers the final minute directly, no replaying once the cycle is found
+        self.area.cells = aoctools.iterate_state(self.area.cells, num_minutes, self.next_state)
 
 
 def parse(puzzle_input: str):
@@ -80,9 +59,14 @@ def part2(data):
 
 def solve(puzzle_input: str):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -3,7 +3,8 @@ import sys
 import os
 import dataclasses
 
-from xyztrio import XYZtrio
+from spatial import KDTree, most_overlapping_point
+from xyztrio import XYZtrio, ORIGIN
 
 
 @dataclasses.dataclass
@@ -29,19 +30,25 @@ def parse(puzzle_input: str):
 def part1(data):
     """Solve part 1"""
     strongest: Nanobot = max(data, key=lambda n: n.signal_radius)
-    return sum(strongest.in_range(n.position) for n in data)
+    return len(KDTree(n.position for n in data).within_manhattan(strongest.position, strongest.signal_radius))
 
 
 def part2(data):
     """Solve part 2"""
-    return data
+    _, best = most_overlapping_point([(n.position, n.signal_radius) for n in data])
+    return XYZtrio(*best).manhattan_distance(ORIGIN)
 
 
 def solve(puzzle_input: str):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
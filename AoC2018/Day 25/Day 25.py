@@ -3,6 +3,9 @@ import sys
 import os
 from typing import TypeAlias
 
+from aoctools import DisjointSet
+from spatial import KDTree
+
 HyperPoint: TypeAlias = tuple[int, ...]
 
 
@@ -11,32 +14,15 @@ def parse(puzzle_input: str):
     return [tuple(int(n) for n in line.split(',')) for line in puzzle_input.split('\n')]
 
 
-def distance(pt1: HyperPoint, pt2: HyperPoint) -> int:
-    return sum(abs(pt1[i] - pt2[i]) for i in range(len(pt1)))
-
-
 def part1(data):
     """Solve part 1"""
-    points = set(data)
-    num_constellations: int = 0
-    while points:
-        constellation: set[HyperPoint] = {points.pop()}
-        while True:
-            new_additions: set[HyperPoint] = set()
-            for pt in points - constellation:
-                for c in constellation:
-                    if distance(pt, c) <= 3:
-                        new_additions.add(pt)
-                        break
+    tree: KDTree[HyperPoint] = KDTree(data)
+    constellations: DisjointSet[HyperPoint] = DisjointSet(data)
+    for pt in data:
+        for other in tree.within_manhattan(pt, 3):
+            constellations.union(pt, other)
 
-            constellation.update(new_additions)
-            if not new_additions:
-                break
-
-        points.difference_update(constellation)
-        num_constellations += 1
-
-    return num_constellations
+    return constellations.components
 
 
 def part2(data):
@@ -46,9 +32,14 @@ def part2(data):
 
 def solve(puzzle_input: str):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -1,7 +1,8 @@
 import pathlib
 import sys
 import os
-from typing import Self
+
+from llnode import CircularList
 
 
 def parse(puzzle_input: str):
@@ -10,57 +11,23 @@ def parse(puzzle_input: str):
     return int(words[0]), int(words[6])
 
 
-class Marble:
-    def __init__(self, value: int) -> None:
-        self.value: int = value
-        self.clockwise: Marble = self
-        self.counter: Marble = self
-
-    def __repr__(self) -> str:
-        return f'{self.__class__.__name__}({self.value})'
-
-    def place_after(self, new_marble: Self) -> None:
-        new_marble.clockwise = self.clockwise
-        new_marble.counter = self
-        new_marble.clockwise.counter = new_marble
-        new_marble.counter.clockwise = new_marble
-
-    def remove(self) -> None:
-        self.clockwise.counter = self.counter
-        self.counter.clockwise = self.clockwise
-
-    def move_counter(self, steps: int = 1) -> Self:
-        m: Marble = self
-        for _ in range(steps):
-            m = m.counter
-        return m
-
-
-def take_turn(current_marble: Marble, next_marble: int) -> (Marble, int):
-    if next_marble % 23 == 0:
-        removed: Marble = current_marble.move_counter(7)
-        new_current: Marble = removed.clockwise
-        removed.remove()
-
-        score: int = next_marble + removed.value
-        return new_current, score
-
-    new_marble: Marble = Marble(next_marble)
-    current_marble.clockwise.place_after(new_marble)
-    return new_marble, 0
-
-
 def winner(num_players: int, last_marble: int) -> int:
     scores: list[int] = [0] * num_players
 
-    # First turn - trivial
-    current_marble: Marble = Marble(0)
+    # Marbles are their own slot ids, first turn - trivial
+    circle: CircularList = CircularList(last_marble + 1, [0])
+    current_marble: int = 0
 
     # Remaining turns
     for next_marble in range(1, last_marble + 1):
-        current_marble, points_earned = take_turn(current_marble, next_marble)
-        player: int = next_marble % num_players
-        scores[player] += points_earned
+        if next_marble % 23 == 0:
+            removed: int = circle.prev(current_marble, 7)
+            current_marble = circle.next(removed)
+            circle.unlink(removed)
+            scores[next_marble % num_players] += next_marble + removed
+        else:
+            circle.insert_after(circle.next(current_marble), next_marble)
+            current_marble = next_marble
     return max(scores)
 
 
@@ -78,9 +45,14 @@ def part2(data):
 
 def solve(puzzle_input: str):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -1,16 +1,16 @@
 import pathlib
 import sys
 import os
-import parse as scanf
 from math import lcm
 
+import scanner
+
+POSITION: scanner.Format = scanner.Format('<x={:d}, y={:d}, z={:d}>')
+
 
 def parse(puzzle_input):
     """Parse input"""
-    positions: list[tuple] = []
-    for line in puzzle_input.split('\n'):
-        x, y, z = scanf.parse('<x={:d}, y={:d}, z={:d}>', line)
-        positions.append((x, y, z))
+    positions: list[tuple] = POSITION.lines(puzzle_input)
     return positions
 
 
@@ -160,9 +160,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
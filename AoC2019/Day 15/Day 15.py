@@ -20,89 +20,60 @@ class RepairDroid:
     WEST: int = 3
     EAST: int = 4
 
-    TURN_RIGHT: dict[int, int] = {NORTH: EAST,
-                                  SOUTH: WEST,
-                                  WEST: NORTH,
-                                  EAST: SOUTH}
-    TURN_LEFT: dict[int, int] = {NORTH: WEST,
-                                 SOUTH: EAST,
-                                 WEST: SOUTH,
-                                 EAST: NORTH}
-
     def __init__(self, program: list[int]) -> None:
         self.origin: Point = Point(0, 0)
         self.oxygen_system: Point = self.origin
         self.walls: set[Point] = set()
         self.surface: set[Point] = {self.origin}
-        self.cur_pos: Point = self.origin
-        self.cur_dir: int = self.NORTH
         self.computer: IntcodeComputer = IntcodeComputer()
         self.program: list[int] = program
 
     def reset(self) -> None:
-        self.cur_pos = self.origin
-        self.cur_dir: int = self.NORTH
         self.computer.initialize(self.program)
 
-    def target_pos(self) -> Point:
-        match self.cur_dir:
-            case 1:
-                return Point(self.cur_pos.x, self.cur_pos.y + 1)
-            case 2:
-                return Point(self.cur_pos.x, self.cur_pos.y - 1)
-            case 3:
-                return Point(self.cur_pos.x - 1, self.cur_pos.y)
-            case 4:
-                return Point(self.cur_pos.x + 1, self.cur_pos.y)
-
     def neighbors(self, pt: Point) -> set[Point]:
         return {Point(pt.x, pt.y + 1),
                 Point(pt.x, pt.y - 1),
                 Point(pt.x - 1, pt.y),
                 Point(pt.x + 1, pt.y)} & self.surface
 
-    def move(self) -> int:
-        self.computer.run([self.cur_dir])
-        return self.computer.output[0]
-
-    def turn_left(self) -> None:
-        self.cur_dir = self.TURN_LEFT[self.cur_dir]
-
-    def turn_right(self) -> None:
-        self.cur_dir = self.TURN_RIGHT[self.cur_dir]
+    @staticmethod
+    def adjacent(pt: Point, direction: int) -> Point:
+        match direction:
+            case 1:
+                return Point(pt.x, pt.y + 1)
+            case 2:
+                return Point(pt.x, pt.y - 1)
+            case 3:
+                return Point(pt.x - 1, pt.y)
+            case 4:
+                return Point(pt.x + 1, pt.y)
 
     def map_area(self) -> None:
-        # Right hand on wall
-        self.reset()
-        status: int = -1
-        found_oxygen_system: bool = False
-        while status != self.O2_SYSTEM or found_oxygen_system:
-            found_oxygen_system = self.oxygen_system != self.origin
-            dst: Point = self.target_pos()
-            status = self.move()
-            if status == self.WALL:
-                self.walls.add(dst)
-                self.turn_left()
-            else:
-                self.cur_pos = dst
-                self.surface.add(self.cur_pos)
-                self.turn_right()
-                if status == self.O2_SYSTEM:
-                    self.oxygen_system = self.cur_pos
-
-        # Left hand on wall
+        # Breadth-first, each new position gets a fork of the computer that reached it
         self.reset()
-        status = -1
-        while status != self.O2_SYSTEM:
-            dst = self.target_pos()
-            status = self.move()
-            if status == self.WALL:
-                self.walls.add(dst)
-                self.turn_right()
-            else:
-                self.cur_pos = dst
-                self.surface.add(self.cur_pos)
-                self.turn_left()
+        frontier: dict[Point, IntcodeComputer] = {self.origin: self.computer}
+        while frontier:
+            new_frontier: dict[Point, IntcodeComputer] = {}
+            for pos, computer in frontier.items():
+                # Bumping into a wall doesn't move the droid, so only fork again after a successful move
+                droid: IntcodeComputer = computer.fork()
+                for direction in (self.NORTH, self.SOUTH, self.WEST, self.EAST):
+                    dst: Point = self.adjacent(pos, direction)
+                    if dst in self.surface or dst in self.walls:
+                        continue
+
+                    status: int = droid.run([direction])[0]
+                    if status == self.WALL:
+                        self.walls.add(dst)
+                        continue
+
+                    self.surface.add(dst)
+                    new_frontier[dst] = droid
+                    droid = computer.fork()
+                    if status == self.O2_SYSTEM:
+                        self.oxygen_system = dst
+            frontier = new_frontier
 
     def shortest_path_len(self, start: Point, end: Point) -> int:
         num_steps: int = 0
@@ -158,9 +129,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
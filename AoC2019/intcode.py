@@ -1,7 +1,29 @@
-from collections.abc import Iterable, Reversible
+import functools
+import typing
+from collections.abc import Callable, Iterable, Reversible
 
 DEBUG = False
 
+MNEMONICS: dict[int, tuple[str, int]] = {1: ('ADD', 3), 2: ('MUL', 3), 3: ('IN', 1), 4: ('OUT', 1),
+                                         5: ('JNZ', 2), 6: ('JZ', 2), 7: ('LT', 3), 8: ('EQ', 3),
+                                         9: ('REL', 1), 99: ('HALT', 0)}
+
+
+@functools.cache
+def decode(instruction: int) -> tuple[int, int, int, int]:
+    """ Split an instruction into (opcode, mode1, mode2, mode3), cached since programs only use a few dozen """
+    return instruction % 100, instruction // 100 % 10, instruction // 1000 % 10, instruction // 10000 % 10
+
+
+class Snapshot(typing.NamedTuple):
+    """ Immutable, so one snapshot can be restored any number of times """
+    memory: tuple[int, ...]
+    pc: int
+    relative_base: int
+    state: str
+    input: tuple[int, ...]
+    output: tuple[int, ...]
+
 
 class IntcodeComputer:
     def __init__(self) -> None:
@@ -9,15 +31,16 @@ class IntcodeComputer:
         self.state: str = 'CREATED'
         self.input: list[int] = []
         self.output: list[int] = []
-        self.memory: dict[int, int] = {}
+        self.memory: list[int] = []
         self.relative_base: int = 0
+        self.debug: bool = DEBUG
 
     def initialize(self, intcode: Iterable[int], noun: int | None = None, verb: int | None = None) -> None:
         self.pc = 0
         self.state = 'READY'
         self.input.clear()
         self.output.clear()
-        self.memory = {i: byte for i, byte in enumerate(intcode)}
+        self.memory = list(intcode)
         self.relative_base = 0
 
         if noun is not None:
@@ -25,119 +48,133 @@ class IntcodeComputer:
         if verb is not None:
             self.memory[2] = verb
 
-    def src_operand(self, position: int) -> tuple[int, str]:
-        value: int = self.memory[self.pc + position]
-        mode: int = self.memory[self.pc] // 100
-        for i in range(position - 1):
-            mode //= 10
-        mode %= 10
-
-        match mode:
-            case 0:
-                op: int = self.memory.get(value, 0)
-                return op, f'[{value}]=>{op}'
-            case 1:
-                return value, str(value)
-            case 2:
-                op = self.memory.get(value + self.relative_base, 0)
-                return op, f'[{value} + {self.relative_base}]=>{op}'
-
-    def dst_operand(self, position: int) -> tuple[int, str]:
-        value: int = self.memory[self.pc + position]
-        mode: int = self.memory[self.pc] // 100
-        for i in range(position - 1):
-            mode //= 10
-        mode %= 10
-
-        match mode:
-            case 0:
-                return value, f'{value}'
-            case 2:
-                return value + self.relative_base, f'{value} + {self.relative_base}'
+    def snapshot(self) -> Snapshot:
+        return Snapshot(tuple(self.memory), self.pc, self.relative_base, self.state,
+                        tuple(self.input), tuple(self.output))
+
+    def restore(self, snapshot: Snapshot) -> None:
+        self.memory = list(snapshot.memory)
+        self.pc = snapshot.pc
+        self.relative_base = snapshot.relative_base
+        self.state = snapshot.state
+        self.input = list(snapshot.input)
+        self.output = list(snapshot.output)
+
+    def fork(self) -> typing.Self:
+        """ Independent copy of a paused computer, so a search can branch without replaying the program """
+        child: IntcodeComputer = self.__class__()
+        child.memory = self.memory.copy()
+        child.pc = self.pc
+        child.relative_base = self.relative_base
+        child.state = self.state
+        child.input = self.input.copy()
+        child.output = self.output.copy()
+        child.debug = self.debug
+        return child
+
+    def read(self, address: int) -> int:
+        try:
+            return self.memory[address]
+        except IndexError:
+            return 0
+
+    def write(self, address: int, value: int) -> None:
+        try:
+            self.memory[address] = value
+        except IndexError:
+            # Grow geometrically so a program walking upward doesn't reallocate on every write
+            self.memory.extend([0] * (max(address + 1, 2 * len(self.memory)) - len(self.memory)))
+            self.memory[address] = value
+
+    def src_operand(self, position: int, mode: int) -> int:
+        value: int = self.read(self.pc + position)
+        if mode == 1:
+            return value
+        if mode == 2:
+            value += self.relative_base
+        return self.read(value)
+
+    def dst_operand(self, position: int, mode: int) -> int:
+        value: int = self.read(self.pc + position)
+        return value + self.relative_base if mode == 2 else value
+
+    # Math and comparisons
+    def add(self, m1: int, m2: int, m3: int) -> None:
+        self.write(self.dst_operand(3, m3), self.src_operand(1, m1) + self.src_operand(2, m2))
+        self.pc += 4
+
+    def multiply(self, m1: int, m2: int, m3: int) -> None:
+        self.write(self.dst_operand(3, m3), self.src_operand(1, m1) * self.src_operand(2, m2))
+        self.pc += 4
+
+    def less_than(self, m1: int, m2: int, m3: int) -> None:
+        self.write(self.dst_operand(3, m3), 1 if self.src_operand(1, m1) < self.src_operand(2, m2) else 0)
+        self.pc += 4
+
+    def equals(self, m1: int, m2: int, m3: int) -> None:
+        self.write(self.dst_operand(3, m3), 1 if self.src_operand(1, m1) == self.src_operand(2, m2) else 0)
+        self.pc += 4
+
+    # I/O
+    def read_input(self, m1: int, _: int, __: int) -> None:
+        if not self.input:
+            self.state = 'PAUSED'
+            return
+
+        self.write(self.dst_operand(1, m1), self.input.pop())
+        self.pc += 2
+
+    def write_output(self, m1: int, _: int, __: int) -> None:
+        self.output.append(self.src_operand(1, m1))
+        self.pc += 2
+
+    # Jumps
+    def jump_if_true(self, m1: int, m2: int, _: int) -> None:
+        if self.src_operand(1, m1) != 0:
+            self.pc = self.src_operand(2, m2)
+        else:
+            self.pc += 3
+
+    def jump_if_false(self, m1: int, m2: int, _: int) -> None:
+        if self.src_operand(1, m1) == 0:
+            self.pc = self.src_operand(2, m2)
+        else:
+            self.pc += 3
+
+    # Addressing
+    def adjust_relative_base(self, m1: int, _: int, __: int) -> None:
+        self.relative_base += self.src_operand(1, m1)
+        self.pc += 2
+
+    # Execution state
+    def halt(self, _: int, __: int, ___: int) -> None:
+        self.state = 'HALTED'
+
+    DISPATCH: dict[int, Callable[..., None]] = {1: add, 2: multiply, 3: read_input, 4: write_output,
+                                                5: jump_if_true, 6: jump_if_false, 7: less_than, 8: equals,
+                                                9: adjust_relative_base, 99: halt}
 
     def execute_instruction(self) -> None:
-        opcode: int = self.memory[self.pc] % 100
-        prefix: str = f"{self.pc} ({self.memory[self.pc]}):"
-
-        # Math and comparisons
-        match opcode:
-            case 1 | 2 | 7 | 8:
-                src1, src1_str = self.src_operand(1)
-                src2, src2_str = self.src_operand(2)
-                dst, dst_str = self.dst_operand(3)
-
-                match opcode:
-                    case 1:  # add
-                        if DEBUG:
-                            print(f'{prefix} [{dst_str}] = {src1_str} + {src2_str}')
-                        self.memory[dst] = src1 + src2
-                    case 2:  # mult
-                        if DEBUG:
-                            print(f'{prefix} [{dst_str}] = {src1_str} * {src2_str}')
-                        self.memory[dst] = src1 * src2
-                    case 7:  # less than
-                        if DEBUG:
-                            print(f'{prefix} [{dst_str}] =  ({src1_str} < {src2_str})')
-                        self.memory[dst] = 1 if src1 < src2 else 0
-                    case 8:  # equals
-                        if DEBUG:
-                            print(f'{prefix} [{dst_str}] = ({src1_str} == {src2_str})')
-                        self.memory[dst] = 1 if src1 == src2 else 0
-                self.pc += 4
-
-            # I/O
-            case 3:  # input
-                if not self.input:
-                    self.state = 'PAUSED'
-                    return
-
-                dst, dst_str = self.dst_operand(1)
-                if DEBUG:
-                    print(f'{prefix} [{dst_str}] << {self.input[-1]}')
-                self.memory[dst] = self.input.pop()
-                self.pc += 2
-
-            case 4:  # output
-                src, src_str = self.src_operand(1)
-                if DEBUG:
-                    print(f'{prefix} {src} >> output')
-                self.output.append(src)
-                self.pc += 2
-
-            # Jumps
-            case 5 | 6:
-                condition, cond_str = self.src_operand(1)
-                target, target_str = self.src_operand(2)
-
-                if opcode == 5:  # jump if not zero
-                    if DEBUG:
-                        print(f'{prefix} if ({cond_str}) goto {target_str}')
-                    if condition != 0:
-                        self.pc = target
-                    else:
-                        self.pc += 3
-                elif opcode == 6:  # jump if zero
-                    if DEBUG:
-                        print(f'{prefix} if !({cond_str}) goto {target_str}')
-                    if condition == 0:
-                        self.pc = target
-                    else:
-                        self.pc += 3
-
-            # Addressing
-            case 9:  # Modify relative base
-                src, src_str = self.src_operand(1)
-
-                if DEBUG:
-                    print(f'{prefix} REL_BASE += {src_str}')
-                self.relative_base += src
-                self.pc += 2
-
-            # Execution state
-            case 99:  # halt
-                if DEBUG:
-                    print(f'{prefix} HALT')
-                self.state = 'HALTED'
+        opcode, m1, m2, m3 = decode(self.memory[self.pc])
+        self.DISPATCH[opcode](self, m1, m2, m3)
+
+    def disassemble(self) -> str:
+        """ Describe the instruction at pc, only built when tracing """
+        instruction: int = self.read(self.pc)
+        opcode, *modes = decode(instruction)
+        mnemonic, num_operands = MNEMONICS.get(opcode, ('???', 0))
+
+        operands: list[str] = []
+        for position, mode in enumerate(modes[:num_operands], start=1):
+            value: int = self.read(self.pc + position)
+            match mode:
+                case 0:
+                    operands.append(f'[{value}]=>{self.read(value)}')
+                case 1:
+                    operands.append(str(value))
+                case 2:
+                    operands.append(f'[{value} + {self.relative_base}]=>{self.read(value + self.relative_base)}')
+        return f'{self.pc} ({instruction}): {mnemonic} ' + ', '.join(operands)
 
     def run(self, inputs: Reversible[int] | None = None) -> list[int]:
         if inputs is None:
@@ -151,8 +188,17 @@ class IntcodeComputer:
             return []
 
         self.state = 'RUNNING'
+        if self.debug:
+            while self.state == 'RUNNING':
+                print(self.disassemble())
+                self.execute_instruction()
+            return self.output
+
+        memory: list[int] = self.memory
+        dispatch: dict[int, Callable[..., None]] = self.DISPATCH
         while self.state == 'RUNNING':
-            self.execute_instruction()
+            opcode, m1, m2, m3 = decode(memory[self.pc])
+            dispatch[opcode](self, m1, m2, m3)
         return self.output
 
     def run_ASCII(self, str_input: str = '') -> str:
@@ -1,9 +1,13 @@
 import pathlib
 import sys
 import os
-from collections import namedtuple
 
-Point = namedtuple('Point', 'x y')
+from automaton import Automaton, Rule
+from pointwalker import Heading
+from space import Space
+from xypair import PointPacker
+
+FLOOR, EMPTY, OCCUPIED = 0, 1, 2
 
 
 def parse(puzzle_input):
@@ -13,109 +17,53 @@ def parse(puzzle_input):
 
 class WaitingArea:
     def __init__(self, grid: list[str]) -> None:
-        self.height: int = len(grid)
-        self.width: int = len(grid[0])
-        self.seats: set[Point] = set()
-        for y, row in enumerate(grid):
-            for x in range(len(row)):
-                if grid[y][x] == 'L':
-                    self.seats.add(Point(x, y))
-        self.occupied: set[Point] = set()
-        self.empty: set[Point] = self.seats.copy()
+        # Seats as packed ints, neighbors are int offsets
+        space: Space = Space(grid, 'L')
+        self.packer: PointPacker = space.point_packer()
+        self.seats: set[int] = space.packed_items('L')
+        self.cells: set[int] = self.packer.encode_all((x, y) for y in range(space.height) for x in range(space.width))
+        self.occupied: set[int] = set()
+        self.empty: set[int] = self.seats.copy()
         self.stable: bool = False
-
-    def neighbors(self, seat: Point) -> set[Point]:
-        surrounding: set[Point] = {Point(seat.x - 1, seat.y - 1),
-                                   Point(seat.x, seat.y - 1),
-                                   Point(seat.x + 1, seat.y - 1),
-                                   Point(seat.x - 1, seat.y),
-                                   Point(seat.x + 1, seat.y),
-                                   Point(seat.x - 1, seat.y + 1),
-                                   Point(seat.x, seat.y + 1),
-                                   Point(seat.x + 1, seat.y + 1)}
-        return surrounding & self.seats
-
-    def visible_seats(self, seat: Point) -> set[Point]:
-        visible: set[Point] = set()
-        x, y = seat
-        while y >= 0:
-            y -= 1
-            if (x, y) in self.seats:
-                visible.add(Point(x, y))
-                break
-        x, y = seat
-        while y < self.height:
-            y += 1
-            if (x, y) in self.seats:
-                visible.add(Point(x, y))
-                break
-        x, y = seat
-        while x >= 0:
-            x -= 1
-            if (x, y) in self.seats:
-                visible.add(Point(x, y))
-                break
-        x, y = seat
-        while x < self.width:
-            x += 1
-            if (x, y) in self.seats:
-                visible.add(Point(x, y))
-                break
-        x, y = seat
-        while x >= 0 and y >= 0:
-            x -= 1
-            y -= 1
-            if (x, y) in self.seats:
-                visible.add(Point(x, y))
-                break
-        x, y = seat
-        while x < self.width and y < self.height:
-            x += 1
-            y += 1
-            if (x, y) in self.seats:
-                visible.add(Point(x, y))
-                break
-        x, y = seat
-        while x >= 0 and y < self.height:
-            x -= 1
-            y += 1
-            if (x, y) in self.seats:
-                visible.add(Point(x, y))
-                break
-        x, y = seat
-        while x < self.width and y >= 0:
-            x += 1
-            y -= 1
-            if (x, y) in self.seats:
-                visible.add(Point(x, y))
-                break
+        # Seats never move, so what each one sees is found once
+        self.in_sight: dict[int, set[int]] = {seat: set(self.visible_seats(seat)) for seat in self.seats}
+
+    def visible_seats(self, seat: int) -> list[int]:
+        visible: list[int] = []
+        for heading in Heading:
+            step: int = self.packer.offset(heading.delta())
+            pt: int = seat + step
+            while pt in self.cells:
+                if pt in self.seats:
+                    visible.append(pt)
+                    break
+                pt += step
         return visible
 
-    def update(self) -> None:
-        sat_down: set[Point] = {seat for seat in self.empty if len(self.neighbors(seat) & self.occupied) == 0}
-        left: set[Point] = {seat for seat in self.occupied if len(self.neighbors(seat) & self.occupied) >= 4}
+    def update_visible(self) -> None:
+        sat_down: set[int] = {seat for seat in self.empty if len(self.in_sight[seat] & self.occupied) == 0}
+        left: set[int] = {seat for seat in self.occupied if len(self.in_sight[seat] & self.occupied) >= 5}
         if not left and not sat_down:
             self.stable = True
 
         self.empty = (self.empty | left) - sat_down
         self.occupied = (self.occupied | sat_down) - left
 
-    def update_visible(self) -> None:
-        sat_down: set[Point] = {seat for seat in self.empty if len(self.visible_seats(seat) & self.occupied) == 0}
-        left: set[Point] = {seat for seat in self.occupied if len(self.visible_seats(seat) & self.occupied) >= 5}
-        if not left and not sat_down:
-            self.stable = True
 
-        self.empty = (self.empty | left) - sat_down
-        self.occupied = (self.occupied | sat_down) - left
+def next_seat(seat: int, counts: tuple[int, ...]) -> int:
+    occupied_neighbors, = counts
+    if seat == EMPTY and occupied_neighbors == 0:
+        return OCCUPIED
+    if seat == OCCUPIED and occupied_neighbors >= 4:
+        return EMPTY
+    return seat
 
 
 def part1(data):
     """Solve part 1"""
-    area: WaitingArea = WaitingArea(data)
-    while not area.stable:
-        area.update()
-    return len(area.occupied)
+    area: Automaton = Automaton.from_lines(data, '.L#', Rule.counting(3, (OCCUPIED,), next_seat))
+    area.run_until_stable()
+    return area.count(OCCUPIED)
 
 
 def part2(data):
@@ -128,9 +76,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -1,7 +1,11 @@
 import pathlib
 import sys
 import os
-import parse as scanf
+
+import scanner
+
+MASK: scanner.Format = scanner.Format('mask = {}')
+MEMORY: scanner.Format = scanner.Format('mem[{:d}] = {:d}')
 
 
 def parse(puzzle_input):
@@ -71,9 +75,9 @@ class Computer:
     def run(self, program: list[str]) -> None:
         for instruction in program:
             if instruction.startswith('mask'):
-                self.mask = scanf.parse('mask = {}', instruction)[0]
+                self.mask = MASK.parse(instruction)[0]
             elif instruction.startswith('mem'):
-                address, value = scanf.parse('mem[{:d}] = {:d}', instruction)
+                address, value = MEMORY.parse(instruction)
                 self.write_memory(address, value)
 
 
@@ -94,9 +98,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
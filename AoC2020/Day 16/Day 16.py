@@ -1,26 +1,27 @@
 import pathlib
 import sys
 import os
-import parse as scanf
 from collections import deque
 
+import scanner
+
 Range = tuple[int, int]
 
+FIELD: scanner.Format = scanner.Format('{}: {:d}-{:d} or {:d}-{:d}')
+
 
 def parse(puzzle_input):
     """Parse input"""
     fields_str, my_ticket_str, nearby_str = puzzle_input.split('\n\n')
 
     fields: dict[str, tuple[Range, Range]] = {}
-    for line in fields_str.split('\n'):
-        field, lo1, hi1, lo2, hi2 = scanf.parse('{}: {:d}-{:d} or {:d}-{:d}', line)
+    for field, lo1, hi1, lo2, hi2 in FIELD.lines(fields_str):
         fields[field] = ((lo1, hi1), (lo2, hi2))
 
     my_ticket_str = my_ticket_str.split('\n')[1]
     my_ticket: list[int] = [int(n) for n in my_ticket_str.split(',')]
 
-    nearby_lines: list[str] = nearby_str.split('\n')[1:]
-    nearby_tickets: list[list[int]] = [[int(n) for n in line.split(',')] for line in nearby_lines]
+    nearby_tickets: list[list[int]] = scanner.int_matrix(nearby_str.split('\n', 1)[1])
 
     return fields, my_ticket, nearby_tickets
 
@@ -90,9 +91,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
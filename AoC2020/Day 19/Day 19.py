@@ -1,7 +1,10 @@
 import pathlib
 import sys
 import os
-import parse as scanf
+
+import scanner
+
+RULE: scanner.Format = scanner.Format('{:d}: {}')
 
 
 def parse(puzzle_input):
@@ -15,7 +18,7 @@ class MessageValidater:
         self.rules: dict[int, tuple] = {}
         self.cache: dict[tuple[int, str], bool] = {}
         for rule_str in rule_strs:
-            rule_num, rule = scanf.parse('{:d}: {}', rule_str)
+            rule_num, rule = RULE.parse(rule_str)
             if rule in ('"a"', '"b"'):
                 self.rules[rule_num] = tuple(rule.strip('"'))
             else:
@@ -107,9 +110,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
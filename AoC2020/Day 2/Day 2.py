@@ -1,19 +1,21 @@
 import pathlib
 import sys
 import os
-import parse as scanf
+
+import scanner
+
+POLICY: scanner.Format = scanner.Format('{:d}-{:d} {}: {}')
 
 
 def parse(puzzle_input):
     """Parse input"""
-    return [line for line in puzzle_input.split('\n')]
+    return POLICY.lines(puzzle_input)
 
 
 def part1(data):
     """Solve part 1"""
     num_valid: int = 0
-    for line in data:
-        min_count, max_count, ch, password = scanf.parse('{:d}-{:d} {}: {}', line)
+    for min_count, max_count, ch, password in data:
         if min_count <= password.count(ch) <= max_count:
             num_valid += 1
     return num_valid
@@ -22,8 +24,7 @@ def part1(data):
 def part2(data):
     """Solve part 2"""
     num_valid: int = 0
-    for line in data:
-        pos1, pos2, ch, password = scanf.parse('{:d}-{:d} {}: {}', line)
+    for pos1, pos2, ch, password in data:
         if (password[pos1 - 1] == ch) ^ (password[pos2 - 1] == ch):
             num_valid += 1
     return num_valid
@@ -31,9 +32,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
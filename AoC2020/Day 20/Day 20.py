@@ -1,19 +1,22 @@
 import pathlib
 import sys
 import os
-import parse as scanf
 from collections import defaultdict, deque, namedtuple
 from typing import Optional
 
+import scanner
+
 Borders = dict[str, str]
 Point = namedtuple('Point', 'x y')
 
+TILE: scanner.Format = scanner.Format('Tile {:d}:\n{}')
+
 
 def parse(puzzle_input):
     """Parse input"""
     tiles: dict[int, list[str]] = {}
     for tile_str in puzzle_input.split('\n\n'):
-        tile_id, tile = scanf.parse('Tile {:d}:\n{}', tile_str)
+        tile_id, tile = TILE.parse(tile_str)
         tiles[tile_id] = tile.split('\n')
     return tiles
 
@@ -163,7 +166,7 @@ def matches_surrounding(tile: Tile, surrounding: defaultdict[Point, Borders]) ->
 
 def part1(data):
     """Solve part 1"""
-    tile_list: list[Tile] = [Tile(tile_id, pixels) for tile_id, pixels in data.held_items()]
+    tile_list: list[Tile] = [Tile(tile_id, pixels) for tile_id, pixels in data.items()]
     image: Image = Image()
     image.build_from_tiles(tile_list)
 
@@ -175,7 +178,7 @@ def part1(data):
 
 def part2(data):
     """Solve part 2"""
-    tile_list: list[Tile] = [Tile(tile_id, pixels) for tile_id, pixels in data.held_items()]
+    tile_list: list[Tile] = [Tile(tile_id, pixels) for tile_id, pixels in data.items()]
     image: Image = Image()
     image.build_from_tiles(tile_list)
     total_pixels: int = image.num_active_pixels()
@@ -200,9 +203,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
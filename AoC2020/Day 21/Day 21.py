@@ -1,14 +1,16 @@
 import pathlib
 import sys
 import os
-import parse as scanf
+
+import scanner
+
+FOOD: scanner.Format = scanner.Format('{} (contains {})')
 
 
 def parse(puzzle_input):
     """Parse input"""
     lines = []
-    for line in puzzle_input.split('\n'):
-        ingredients_str, allergens_str = scanf.parse('{} (contains {})', line)
+    for ingredients_str, allergens_str in FOOD.lines(puzzle_input):
         ingredients = set(ingredients_str.split())
         allergens = set(allergens_str.split(', '))
         lines.append((ingredients, allergens))
@@ -82,9 +84,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -1,6 +1,10 @@
 import pathlib
 import sys
 import os
+import itertools
+from array import array
+
+from llnode import CircularList
 
 
 def parse(puzzle_input):
@@ -13,30 +17,18 @@ class CupCircle:
         self.min_label: int = min(labels)
         self.max_label: int = max(labels) if max_label == 0 else max_label
         self.cur_cup: int = labels[0]
-        self.next: dict[int, int] = {labels[i]: labels[i + 1] for i in range(len(labels) - 1)}
-        if max_label > max(labels):
-            cur: int = labels[-1]
-            for label in range(max(labels) + 1, max_label + 1):
-                self.next[cur] = label
-                cur = label
-            self.next[cur] = labels[0]
-        else:
-            self.next[labels[-1]] = labels[0]
+        order: itertools.chain[int] = itertools.chain(labels, range(max(labels) + 1, self.max_label + 1))
+        self.cups: CircularList = CircularList(self.max_label + 1, order)
 
     def list_of_labels(self) -> list[int]:
-        labels: list[int] = [self.cur_cup]
-        cur: int = self.next[self.cur_cup]
-        while cur != self.cur_cup:
-            labels.append(cur)
-            cur = self.next[cur]
-        return labels
+        return list(self.cups.iter_from(self.cur_cup))
 
     def move(self) -> None:
-        first_picked_up: int = self.next[self.cur_cup]
-        last_picked_up: int = self.next[self.next[first_picked_up]]
-        picked_up: set[int] = {first_picked_up, self.next[first_picked_up], last_picked_up}
-
-        self.next[self.cur_cup] = self.next[last_picked_up]
+        successors: array = self.cups.successors
+        first_picked_up: int = successors[self.cur_cup]
+        second_picked_up: int = successors[first_picked_up]
+        last_picked_up: int = successors[second_picked_up]
+        picked_up: tuple[int, int, int] = (first_picked_up, second_picked_up, last_picked_up)
 
         destination: int = self.cur_cup - 1
         if destination < self.min_label:
@@ -46,10 +38,9 @@ class CupCircle:
             if destination < self.min_label:
                 destination = self.max_label
 
-        self.next[last_picked_up] = self.next[destination]
-        self.next[destination] = first_picked_up
+        self.cups.move_run(first_picked_up, last_picked_up, destination)
 
-        self.cur_cup = self.next[self.cur_cup]
+        self.cur_cup = successors[self.cur_cup]
 
 
 def part1(data):
@@ -69,16 +60,20 @@ def part2(data):
     for i in range(10000000):
         circle.move()
 
-    circle.cur_cup = 1
-    circle.cur_cup = circle.next[circle.cur_cup]
-    return circle.cur_cup * circle.next[circle.cur_cup]
+    first: int = circle.cups.next(1)
+    return first * circle.cups.next(first)
 
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -1,22 +1,25 @@
 import pathlib
 import sys
 import os
-import parse as scanf
+
+import scanner
+
+RULE: scanner.Format = scanner.Format('{} bags contain {}.')
+CONTENTS: scanner.Format = scanner.Format('{:d} {} bag')
 
 
 def parse(puzzle_input):
     """Parse input"""
-    return parse_rules([line for line in puzzle_input.split('\n')])
+    return parse_rules(puzzle_input)
 
 
-def parse_rules(rules: list[str]) -> dict[str, dict[str, int]]:
+def parse_rules(rules: str) -> dict[str, dict[str, int]]:
     rule_dict: dict[str, dict[str, int]] = {}
-    for rule in rules:
-        color, contents = scanf.parse('{} bags contain {}.', rule)
+    for color, contents in RULE.lines(rules):
         rule_dict[color] = {}
         if contents != 'no other bags':
             for inner_bag in contents.split(','):
-                amount, inner_color = scanf.search('{:d} {} bag', inner_bag)
+                amount, inner_color = CONTENTS.search(inner_bag)
                 rule_dict[color][inner_color] = amount
     return rule_dict
 
@@ -50,9 +53,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
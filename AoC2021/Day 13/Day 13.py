@@ -3,15 +3,16 @@ import sys
 import os
 import re
 
+import scanner
+
+FOLD: scanner.Format = scanner.Format('fold along {}={:d}')
+
 
 def parse(puzzle_input):
     """Parse input"""
     point_list, instructions = puzzle_input.split('\n\n')
     points: set[tuple[int, int]] = {tuple(int(n) for n in line.split(',')) for line in point_list.split()}
-    folds: list[tuple[str, int]] = []
-    for inst in instructions.split('\n'):
-        direction, position = scanf.parse('fold along {}={:d}', inst)
-        folds.append((direction, position))
+    folds: list[tuple[str, int]] = FOLD.lines(instructions)
     return points, folds
 
 
@@ -56,9 +57,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     part2(data)
 
     return solution1,
@@ -1,15 +1,16 @@
 import pathlib
 import sys
 import os
-import parse as scanf
 from collections import namedtuple
 
+import scanner
+
 PosVel = namedtuple('PosVel', 'x y Vx Vy')
 
 
 def parse(puzzle_input):
     """Parse input"""
-    return tuple(scanf.parse('target area: x={:d}..{:d}, y={:d}..{:d}', puzzle_input))
+    return scanner.parse('target area: x={:d}..{:d}, y={:d}..{:d}', puzzle_input)
 
 
 def step_x(pv: PosVel) -> PosVel:
@@ -89,9 +90,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -1,20 +1,20 @@
 import pathlib
 import sys
 import os
-import parse as scanf
 from collections import namedtuple
 
+import scanner
+
 Box = namedtuple('Box', 'x1 x2 y1 y2 z1 z2')
 
+REBOOT_STEP: scanner.Format = scanner.Format('{} x={:d}..{:d},y={:d}..{:d},z={:d}..{:d}')
+
 
 def parse(puzzle_input):
     """Parse input"""
     reboot_steps: list[tuple[str, Box]] = []
-    for line in puzzle_input.split('\n'):
-        result = scanf.parse('{} x={:d}..{:d},y={:d}..{:d},z={:d}..{:d}', line)
-        status: str = result[0]
-        region: Box = Box(*result[1:])
-        reboot_steps.append((status, region))
+    for status, *bounds in REBOOT_STEP.lines(puzzle_input):
+        reboot_steps.append((status, Box(*bounds)))
     return reboot_steps
 
 
@@ -165,9 +165,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -1,11 +1,14 @@
 import typing
-from computer import AbstractComputer
+from computer import AbstractComputer, CompiledInstruction, Profiling
 
 PART1_TEST_ANSWER = None
 PART2_TEST_ANSWER = None
 
 
 class ALU(AbstractComputer):
+    COMPILE: bool = True
+    PROFILING: Profiling = Profiling.OFF
+
     def decode(self) -> int | None:
         self.instruction = typing.cast(str, self.instruction)
         self.opcode, *operands = self.instruction.split()
@@ -36,6 +39,46 @@ class ALU(AbstractComputer):
                 case 'eql':
                     self.register[a] = 1 if self.register[a] == b else 0
 
+    def compile_instruction(self, address: int) -> CompiledInstruction | None:
+        opcode, a, *operands = typing.cast(str, self.read_memory(address)).split()
+        register: dict[str | int, int] = self.register
+        next_ip: int = address + 1
+
+        if opcode == 'inp':
+            def function() -> int | None:
+                if not self.input_available():
+                    return None
+                register[a] = self.next_input()
+                return next_ip
+            return CompiledInstruction(opcode, function)
+
+        b_value = self.operand_reader(operands[0])
+        match opcode:
+            case 'add':
+                def function() -> int:
+                    register[a] += b_value()
+                    return next_ip
+            case 'mul':
+                def function() -> int:
+                    register[a] *= b_value()
+                    return next_ip
+            case 'div':
+                def function() -> int:
+                    register[a] //= b_value()
+                    return next_ip
+            case 'mod':
+                def function() -> int:
+                    register[a] %= b_value()
+                    return next_ip
+            case 'eql':
+                def function() -> int:
+                    register[a] = 1 if register[a] == b_value() else 0
+                    return next_ip
+            case _:
+                return None
+
+        return CompiledInstruction(opcode, function)
+
 
 def parse(puzzle_input: str):
     return puzzle_input.split('\n')
@@ -101,19 +144,35 @@ def get_puzzle_input(file: pathlib.Path) -> str:
     return file.read_text().strip('\n').replace('\t', ' ' * 4)
 
 
-def execute(func, puzzle_input: str) -> (..., int):
+def execute(func, puzzle_input: str) -> (..., int, int):
     import time
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
 
     start: int = time.perf_counter_ns()
-    result = func(parse(puzzle_input))
-    execution_time_us: int = (time.perf_counter_ns() - start) // 1000
-    return result, execution_time_us
-
-
-def timestamp(execution_time_us: int) -> str:
-    stamp: str = f'{round(execution_time_us / 1000000, 3)} s'
-    if execution_time_us < 1000000:
-        stamp = f'{round(execution_time_us / 1000, 3)} ms'
+    data = parsecache.cached(parse, puzzle_input, defer_snapshot=True) if parsecache else parse(puzzle_input)
+    parsed: int = time.perf_counter_ns()
+    if parsecache:
+        parsecache.snapshot()  # Copying the result for part 2 is timed as neither parse nor solve
+    solving: int = time.perf_counter_ns()
+    result = func(data)
+    parse_time_us: int = (parsed - start) // 1000
+    execution_time_us: int = (time.perf_counter_ns() - solving) // 1000
+    return result, parse_time_us, execution_time_us
+
+
+def duration(time_us: int) -> str:
+    if time_us < 1000000:
+        return f'{round(time_us / 1000, 3)} ms'
+    return f'{round(time_us / 1000000, 3)} s'
+
+
+def timestamp(execution_time_us: int, parse_time_us: int | None = None) -> str:
+    stamp: str = duration(execution_time_us)
+    if parse_time_us is not None:
+        stamp += f', parse {duration(parse_time_us)}'
     return f'\t[{stamp}]'
 
 
@@ -139,9 +198,9 @@ def test(part_num: int, directory: str) -> None:
         print(prefix + 'no input')
         return
 
-    result, duration = execute(func, puzzle_input)
+    result, parse_time, solve_time = execute(func, puzzle_input)
     result = 'PASS' if result == answer else 'FAIL'
-    print(prefix + result + timestamp(duration))
+    print(prefix + result + timestamp(solve_time, parse_time))
 
 
 def solve(part_num: int, directory: str) -> None:
@@ -158,8 +217,8 @@ def solve(part_num: int, directory: str) -> None:
         print(prefix + 'no input')
         return
 
-    result, duration = execute(func, puzzle_input)
-    suffix: str = '' if result is None else timestamp(duration)
+    result, parse_time, solve_time = execute(func, puzzle_input)
+    suffix: str = '' if result is None else timestamp(solve_time, parse_time)
     print(prefix + str(result) + suffix)
 
 
@@ -2,76 +2,49 @@ import pathlib
 import sys
 import os
 
-points = set[tuple[int, int]]
+from bitgrid import BitGrid
 
 
 def parse(puzzle_input):
     """Parse input"""
     floor: list[str] = puzzle_input.split('\n')
-    x_len: int = len(floor[0])
-    y_len: int = len(floor)
-    east: points = set()
-    south: points = set()
-    for y, row in enumerate(floor):
-        for x, space in enumerate(row):
-            if space == '>':
-                east.add((x, y))
-            elif space == 'v':
-                south.add((x, y))
-    return x_len, y_len, east, south
+    return BitGrid.from_lines(floor, '>'), BitGrid.from_lines(floor, 'v')
 
 
-def moveable(direction: str, east: points, south: points, x_len: int, y_len: int) -> tuple[points, points]:
-    sources: points = set()
-    destinations: points = set()
-    combined: points = east | south
-
-    if direction == '>':
-        for x, y in east:
-            dst: tuple[int, int] = (x + 1) % x_len, y
-            if dst not in combined:
-                sources.add((x, y))
-                destinations.add(dst)
-    else:
-        for x, y in south:
-            dst: tuple[int, int] = x, (y + 1) % y_len
-            if dst not in combined:
-                sources.add((x, y))
-                destinations.add(dst)
-
-    return sources, destinations
-
-
-def move_east(east: points, south: points, x_len: int, y_len: int) -> bool:
-    old_spots, new_spots = moveable('>', east, south, x_len, y_len)
-    east.update(new_spots)
-    for cucumber in old_spots:
-        east.remove(cucumber)
-    return len(new_spots) != 0
+def move_east(east: BitGrid, south: BitGrid) -> bool:
+    moved: bool = False
+    for y, (east_row, south_row) in enumerate(zip(east.rows, south.rows)):
+        free: int = ~(east_row | south_row) & east.full
+        movers: int = east_row & east.roll(free, -1)
+        if movers:
+            east.rows[y] = east_row & ~movers | east.roll(movers, 1)
+            moved = True
+    return moved
 
 
-def move_south(east: points, south: points, x_len: int, y_len: int) -> bool:
-    old_spots, new_spots = moveable('v', east, south, x_len, y_len)
-    south.update(new_spots)
-    for cucumber in old_spots:
-        south.remove(cucumber)
-    return len(new_spots) != 0
+def move_south(east: BitGrid, south: BitGrid) -> bool:
+    y_len: int = south.height
+    occupied: list[int] = [east_row | south_row for east_row, south_row in zip(east.rows, south.rows)]
+    movers: list[int] = [south.rows[y] & ~occupied[(y + 1) % y_len] for y in range(y_len)]
+    for y in range(y_len):
+        south.rows[y] = south.rows[y] & ~movers[y] | movers[y - 1]
+    return any(movers)
 
 
-def step(east: points, south: points, x_len: int, y_len: int) -> bool:
+def step(east: BitGrid, south: BitGrid) -> bool:
     moved: bool = False
-    if move_east(east, south, x_len, y_len):
+    if move_east(east, south):
         moved = True
-    if move_south(east, south, x_len, y_len):
+    if move_south(east, south):
         moved = True
     return moved
 
 
 def part1(data):
     """Solve part 1"""
-    x_len, y_len, east, south = data
+    east, south = data
     steps: int = 1
-    while step(east, south, x_len, y_len):
+    while step(east, south):
         steps += 1
     return steps
 
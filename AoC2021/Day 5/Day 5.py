@@ -3,18 +3,15 @@ import sys
 import os
 from collections import namedtuple, defaultdict
 
+import scanner
+
 Point = namedtuple('Point', ['x', 'y'])
 line_segment = tuple[Point, Point]
 
 
-def parse_line(line: str) -> line_segment:
-    point1, point2 = (pair.split(',') for pair in line.split('->'))
-    return Point(int(point1[0]), int(point1[1])),  Point(int(point2[0]), int(point2[1]))
-
-
 def parse(puzzle_input):
     """Parse input"""
-    return {parse_line(line) for line in puzzle_input.split('\n')}
+    return {(Point(x1, y1), Point(x2, y2)) for x1, y1, x2, y2 in scanner.int_matrix(puzzle_input)}
 
 
 def points_on_segment(ends: line_segment, diag: bool = False) -> set[Point]:
@@ -6,6 +6,8 @@ from collections import namedtuple
 from typing import Optional
 import cProfile
 
+from aoctools import IntervalSet
+
 Point = namedtuple('Point', 'x y')
 
 
@@ -38,20 +40,6 @@ def get_horizontal_line_intercepts(sensor: Point, radius: int, y: int) -> Option
     return left, right
 
 
-def merge_segments(segments: list[tuple[int, int]]) -> None:
-    segments.sort()
-
-    i: int = 0
-    while i != len(segments) - 1:
-        cur_seg: tuple[int, int] = segments[i]
-        next_seg: tuple[int, int] = segments[i + 1]
-        if cur_seg[1] >= next_seg[0]:
-            segments[i] = (cur_seg[0], max(cur_seg[1], next_seg[1]))
-            segments.remove(next_seg)
-            continue
-        i += 1
-
-
 def beacon_on_horizontal_segment(sensors: list[tuple[Point, Point, int]], y: int, x: tuple[int, int]) -> int:
     segments: list[tuple[int, int]] = []
     finished_sensors: list[tuple[Point, Point, int]] = []
@@ -94,11 +82,7 @@ def part1(data):
         if intercepts:
             segments.append(intercepts)
 
-    merge_segments(segments)
-
-    non_beacon_points: int = 0
-    for left, right in segments:
-        non_beacon_points += right - left + 1
+    non_beacon_points: int = IntervalSet(segments, inclusive=True).total()
 
     intercept_beacons: set[Point] = {beacon for _, beacon, _ in data if beacon.y == y}
 
@@ -118,9 +102,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
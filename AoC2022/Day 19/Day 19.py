@@ -1,10 +1,11 @@
 import pathlib
 import sys
 import os
-import re
 from collections import namedtuple
-from copy import copy
-from typing import Optional
+from typing import NamedTuple
+
+import scanner
+from search import branch_and_bound
 
 Blueprint = namedtuple('Blueprint', 'ID ore clay obsidian geode')
 
@@ -14,8 +15,7 @@ ORE, CLAY, OBSIDIAN, GEODE = 0, 1, 2, 3
 def parse(puzzle_input):
     """Parse input"""
     blueprints: list[Blueprint] = []
-    for line in puzzle_input.split('\n'):
-        nums: list[int] = [int(n) for n in re.findall(r'\d+', line)]
+    for nums in scanner.int_matrix(puzzle_input):
         id_num: int = nums[0]
         ore: int = nums[1]
         clay: int = nums[2]
@@ -26,44 +26,23 @@ def parse(puzzle_input):
     return blueprints
 
 
-class State:
-    def __init__(self) -> None:
-        self.ore: int = 0
-        self.clay: int = 0
-        self.obsidian: int = 0
-        self.geode: int = 0
-        self.ore_robots: int = 1
-        self.clay_robots: int = 0
-        self.obsidian_robots: int = 0
-        self.do_not_craft_ore: bool = False
-        self.do_not_craft_clay: bool = False
-        self.do_not_craft_obsidian: bool = False
-
-    def produce(self) -> None:
-        self.ore += self.ore_robots
-        self.clay += self.clay_robots
-        self.obsidian += self.obsidian_robots
-        # geode is produced in bulk when robot is built
-
-    def build(self, robot: int, blueprint: Blueprint, minutes_remaining: int) -> None:
-        self.do_not_craft_ore = False
-        self.do_not_craft_clay = False
-        self.do_not_craft_obsidian = False
-        match robot:
-            case 0:
-                self.ore -= blueprint.ore
-                self.ore_robots += 1
-            case 1:
-                self.ore -= blueprint.clay
-                self.clay_robots += 1
-            case 2:
-                self.ore -= blueprint.obsidian[0]
-                self.clay -= blueprint.obsidian[1]
-                self.obsidian_robots += 1
-            case 3:
-                self.ore -= blueprint.geode[0]
-                self.obsidian -= blueprint.geode[1]
-                self.geode += minutes_remaining  # produce in bulk
+class State(NamedTuple):
+    minutes_remaining: int
+    ore: int
+    clay: int
+    obsidian: int
+    geode: int  # produced in bulk when a geode robot is built
+    ore_robots: int
+    clay_robots: int
+    obsidian_robots: int
+
+
+def minutes_to_afford(cost: int, stock: int, robots: int) -> int | None:
+    if stock >= cost:
+        return 0
+    if not robots:
+        return None
+    return -((stock - cost) // robots)
 
 
 class Factory:
@@ -71,60 +50,71 @@ class Factory:
         self.blueprint: Blueprint = blueprint
         self.max_ore_robots: int = max(blueprint.ore, blueprint.clay, blueprint.obsidian[0], blueprint.geode[0])
         self.max_clay_robots: int = blueprint.obsidian[1]
-
-    def robots_able_to_build(self, s: State) -> set[int]:
-        # Always build a geode robot if possible
-        if s.ore >= self.blueprint.geode[0] and s.obsidian >= self.blueprint.geode[1]:
-            return {GEODE}
-
-        if not s.do_not_craft_obsidian and s.ore >= self.blueprint.obsidian[0] and s.clay >= self.blueprint.obsidian[1]:
-            return {OBSIDIAN}
-
-        robots: set[int] = set()
-        if not s.do_not_craft_clay and s.ore >= self.blueprint.clay and s.clay_robots < self.max_clay_robots:
-            robots.add(CLAY)
-        if not s.do_not_craft_ore and s.ore >= self.blueprint.ore and s.ore_robots < self.max_ore_robots:
-            robots.add(ORE)
-        return robots
-
-    def max_geodes(self, minutes_remaining: int, s: Optional[State] = None) -> int:
-        if s is None:
-            s = State()
-
-        minutes_remaining -= 1
-
-        # Skip the last minute
-        if minutes_remaining == 0:
-            return s.geode
-
-        # Create new states for each robot type built
-        possible_robots: set[int] = self.robots_able_to_build(s)
-        while not possible_robots:
-            s.produce()
-            minutes_remaining -= 1
-            if minutes_remaining == 0:
-                return s.geode
-            possible_robots = self.robots_able_to_build(s)
-
-        most_geodes: int = 0
-
-        s.produce()
-        for new_robot in possible_robots:
-            new_state: State = copy(s)
-            new_state.build(new_robot, self.blueprint, minutes_remaining)
-            most_geodes = max(most_geodes, self.max_geodes(minutes_remaining, new_state))
-
-        # Collect resources on default state
-        if ORE in possible_robots:
-            s.do_not_craft_ore = True
-        if CLAY in possible_robots:
-            s.do_not_craft_clay = True
-        if OBSIDIAN in possible_robots:
-            s.do_not_craft_obsidian = True
-        if GEODE not in possible_robots and not (s.do_not_craft_ore and s.do_not_craft_clay and s.do_not_craft_obsidian):
-            most_geodes = max(most_geodes, self.max_geodes(minutes_remaining, s))
-
-        return most_geodes
+        self.max_obsidian_robots: int = blueprint.geode[1]
+
+    def next_builds(self, s: State) -> list[State]:
+        """ One state per robot type to save up for and build next, geode robots last so they're searched first """
+        bp: Blueprint = self.blueprint
+        builds: list[State] = []
+        for robot, ore_cost, other_cost, other_stock, other_robots, enough in (
+                (ORE, bp.ore, 0, 0, 0, s.ore_robots >= self.max_ore_robots),
+                (CLAY, bp.clay, 0, 0, 0, s.clay_robots >= self.max_clay_robots),
+                (OBSIDIAN, *bp.obsidian, s.clay, s.clay_robots, s.obsidian_robots >= self.max_obsidian_robots),
+                (GEODE, *bp.geode, s.obsidian, s.obsidian_robots, False)):
+            if enough:
+                continue
+            wait_ore: int | None = minutes_to_afford(ore_cost, s.ore, s.ore_robots)
+            wait_other: int | None = minutes_to_afford(other_cost, other_stock, other_robots)
+            if wait_ore is None or wait_other is None:
+                continue
+            minutes: int = max(wait_ore, wait_other) + 1
+            remaining: int = s.minutes_remaining - minutes
+            if remaining <= 0:
+                continue
+
+            ore: int = s.ore + s.ore_robots * minutes - ore_cost
+            clay: int = s.clay + s.clay_robots * minutes
+            obsidian: int = s.obsidian + s.obsidian_robots * minutes
+            match robot:
+                case 0:
+                    builds.append(State(remaining, ore, clay, obsidian, s.geode,
+                                        s.ore_robots + 1, s.clay_robots, s.obsidian_robots))
+                case 1:
+                    builds.append(State(remaining, ore, clay, obsidian, s.geode,
+                                        s.ore_robots, s.clay_robots + 1, s.obsidian_robots))
+                case 2:
+                    builds.append(State(remaining, ore, clay - other_cost, obsidian, s.geode,
+                                        s.ore_robots, s.clay_robots, s.obsidian_robots + 1))
+                case 3:
+                    builds.append(State(remaining, ore, clay, obsidian - other_cost, s.geode + remaining,
+                                        s.ore_robots, s.clay_robots, s.obsidian_robots))
+        return builds
+
+    def most_geodes_possible(self, s: State) -> int:
+        """ Upper bound with free ore, so a clay robot every minute plus any obsidian or geode robot affordable """
+        obsidian_cost: int = self.blueprint.obsidian[1]
+        geode_cost: int = self.blueprint.geode[1]
+        clay, obsidian, geode = s.clay, s.obsidian, s.geode
+        clay_robots, obsidian_robots = s.clay_robots, s.obsidian_robots
+        for remaining in range(s.minutes_remaining - 1, 0, -1):
+            build_geode: bool = obsidian >= geode_cost
+            build_obsidian: bool = clay >= obsidian_cost
+            clay += clay_robots
+            obsidian += obsidian_robots
+            if build_geode:
+                obsidian -= geode_cost
+                geode += remaining
+            if build_obsidian:
+                clay -= obsidian_cost
+                obsidian_robots += 1
+            clay_robots += 1
+        return geode
+
+    def max_geodes(self, minutes_remaining: int) -> int:
+        return branch_and_bound(State(minutes_remaining, 0, 0, 0, 0, 1, 0, 0),
+                                self.next_builds,
+                                lambda s: s.geode,
+                                self.most_geodes_possible)
 
 
 def part1(data):
@@ -149,9 +139,14 @@ def part2(data):
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
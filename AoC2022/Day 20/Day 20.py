@@ -1,7 +1,9 @@
 import pathlib
 import sys
 import os
-from typing import Optional
+import math
+
+from llnode import CircularList
 
 
 def parse(puzzle_input):
@@ -9,88 +11,44 @@ def parse(puzzle_input):
     return [int(n) for n in puzzle_input.split()]
 
 
-class Node:
-    def __init__(self, n: int):
-        self.val: int = n
-        self.next: Node = self
-        self.prev: Node = self
-
-    def extract(self) -> None:
-        self.next.prev = self.prev
-        self.prev.next = self.next
-
-    def insert_after(self, successor: 'Node') -> None:
-        successor.next = self.next
-        successor.prev = self
-        self.next.prev = successor
-        self.next = successor
-
-    def shift(self, n: int, length: int) -> None:
-        self.extract()
-        target: Node = self.prev
-        for _ in range(n % (length - 1)):
-            target = target.next
-        target.insert_after(self)
-
-    def find(self, value: int) -> Optional['Node']:
-        if self.val == value:
-            return self
-
-        cur_node: Node = self.next
-        while cur_node is not self:
-            if cur_node.val == value:
-                return cur_node
-            cur_node = cur_node.next
-
-        return None
-
-    def get_value_at(self, i: int) -> int:
-        cur_node: Node = self
-        for _ in range(i):
-            cur_node = cur_node.next
-        return cur_node.val
-
-
-def mix(nodes: list[Node], count: int) -> None:
-    num_nodes: int = len(nodes)
+def mix(numbers: list[int], count: int) -> CircularList:
+    """ Slot ids are positions in the original list, since numbers repeat """
+    num_nodes: int = len(numbers)
+    circle: CircularList = CircularList(num_nodes, range(num_nodes), skip=math.isqrt(num_nodes))
     for _ in range(count):
-        for node in nodes:
-            node.shift(node.val, num_nodes)
+        for slot, n in enumerate(numbers):
+            target: int = circle.prev(slot)
+            circle.unlink(slot)
+            circle.insert_after(circle.next(target, n % (num_nodes - 1)), slot)
+    return circle
 
 
-def decrypt(nodes: list[Node]) -> int:
-    num_nodes: int = len(nodes)
-    znode: Node = nodes[0].find(0)
-    return sum(znode.get_value_at(d % num_nodes) for d in (1000, 2000, 3000))
+def decrypt(numbers: list[int], circle: CircularList) -> int:
+    zero: int = numbers.index(0)
+    return sum(numbers[circle.next(zero, d)] for d in (1000, 2000, 3000))
 
 
 def part1(data):
     """Solve part 1"""
-    nodes: list[Node] = [Node(n) for n in data]
-    for i, node in enumerate(nodes[:-1]):
-        node.insert_after(nodes[i + 1])
-
-    mix(nodes, 1)
-
-    return decrypt(nodes)
+    return decrypt(data, mix(data, 1))
 
 
 def part2(data):
     """Solve part 2"""
-    nodes: list[Node] = [Node(n * 811589153) for n in data]
-    for i, node in enumerate(nodes[:-1]):
-        node.insert_after(nodes[i + 1])
-
-    mix(nodes, 10)
-
-    return decrypt(nodes)
+    numbers: list[int] = [n * 811589153 for n in data]
+    return decrypt(numbers, mix(numbers, 10))
 
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -1,113 +1,101 @@
 import pathlib
 import sys
 import os
-from collections import namedtuple, defaultdict
 
-Point = namedtuple('Point', 'x y')
+from bitgrid import BitGrid
 
 DIRECTIONS: list[str] = ['N', 'S', 'W', 'E']
 
 
 def parse(puzzle_input):
     """Parse input"""
-    elves: set[Point] = set()
-    for y, line in enumerate(puzzle_input.split('\n')):
-        for x, pos in enumerate(line):
-            if pos == '#':
-                elves.add(Point(x, y))
-    return elves
-
-
-def has_no_neighbor(elf: Point, elves: set[Point]) -> bool:
-    neighbors: set[Point] = {Point(x, y) for x in range(elf.x - 1, elf.x + 2)
-                                            for y in range(elf.y - 1, elf.y + 2)} - {elf}
-    return len(neighbors & elves) == 0
-
-
-def propose_single_move(elf: Point, elves: set[Point], direction: int) -> Point:
-    if has_no_neighbor(elf, elves):
-        return elf
-
-    for _ in range(len(DIRECTIONS)):
-        match DIRECTIONS[direction]:
-            case 'N':
-                if len(elves & {Point(x, elf.y - 1) for x in range(elf.x - 1, elf.x + 2)}) == 0:
-                    return Point(elf.x, elf.y - 1)
-            case 'S':
-                if len(elves & {Point(x, elf.y + 1) for x in range(elf.x - 1, elf.x + 2)}) == 0:
-                    return Point(elf.x, elf.y + 1)
-            case 'W':
-                if len(elves & {Point(elf.x - 1, y) for y in range(elf.y - 1, elf.y + 2)}) == 0:
-                    return Point(elf.x - 1, elf.y)
-            case 'E':
-                if len(elves & {Point(elf.x + 1, y) for y in range(elf.y - 1, elf.y + 2)}) == 0:
-                    return Point(elf.x + 1, elf.y)
-
-        direction = (direction + 1) % len(DIRECTIONS)
-
-    return elf
-
-
-def propose_all_moves(elves: set[Point], first_direction: int) -> dict[Point, list[Point]]:
-    moves: defaultdict[Point, list[Point]] = defaultdict(list)
-    for elf in elves:
-        move: Point = propose_single_move(elf, elves, first_direction)
-        moves[move].append(elf)
-    return moves
-
-
-def move_elves(elves: set[Point], first_direction: int) -> set[Point]:
-    new_positions: set[Point] = set()
-    for dst, src in propose_all_moves(elves, first_direction).items():
-        if len(src) == 1:
-            new_positions.add(dst)
-        else:
-            new_positions.update(src)
-
-    return new_positions
-
-
-def empty_ground(elves: set[Point]) -> int:
-    min_x: int = 0
-    max_x: int = 0
-    min_y: int = 0
-    max_y: int = 0
-    for x, y in elves:
-        min_x = min(x, min_x)
-        max_x = max(x, max_x)
-        min_y = min(y, min_y)
-        max_y = max(y, max_y)
-
-    return (max_x - min_x + 1) * (max_y - min_y + 1) - len(elves)
+    return BitGrid.from_lines(puzzle_input.split('\n'))
+
+
+def propose_moves(elves: BitGrid, first_direction: int) -> list[list[int]]:
+    """ Per direction, per row, the elves proposing to move that way """
+    proposals: list[list[int]] = [[0] * elves.height for _ in DIRECTIONS]
+    for y, row in enumerate(elves.rows):
+        column: int = elves.vertical(y)
+        free: list[int] = [~elves.horizontal(y - 1), ~elves.horizontal(y + 1), ~(column << 1), ~(column >> 1)]
+
+        # Elves with no neighbor at all stay put
+        undecided: int = row & ~(free[0] & free[1] & free[2] & free[3])
+        for i in range(len(DIRECTIONS)):
+            direction: int = (first_direction + i) % len(DIRECTIONS)
+            proposals[direction][y] = undecided & free[direction]
+            undecided &= ~free[direction]
+    return proposals
+
+
+def move_elves(elves: BitGrid, first_direction: int) -> bool:
+    """ False if no elf moved """
+    top_left, bottom_right = elves.bounds()
+    if min(top_left) == 0 or bottom_right.x == elves.width - 1 or bottom_right.y == elves.height - 1:
+        elves.pad()
+
+    north, south, west, east = propose_moves(elves, first_direction)
+    height: int = elves.height
+
+    # Only elves facing each other across an empty cell can propose the same one
+    for y in range(1, height - 1):
+        clash: int = north[y + 1] & south[y - 1]
+        north[y + 1] &= ~clash
+        south[y - 1] &= ~clash
+    for y in range(height):
+        clash = (west[y] >> 1) & (east[y] << 1)
+        west[y] &= ~(clash << 1)
+        east[y] &= ~(clash >> 1)
+
+    moved: bool = False
+    rows: list[int] = elves.rows
+    for y in range(height):
+        leaving: int = north[y] | south[y] | west[y] | east[y]
+        moved = moved or bool(leaving)
+        rows[y] = rows[y] & ~leaving | west[y] >> 1 | east[y] << 1
+    for y in range(1, height):
+        rows[y - 1] |= north[y]
+        rows[y] |= south[y - 1]
+
+    return moved
+
+
+def empty_ground(elves: BitGrid) -> int:
+    top_left, bottom_right = elves.bounds()
+    return (bottom_right.x - top_left.x + 1) * (bottom_right.y - top_left.y + 1) - len(elves)
 
 
 def part1(data):
     """Solve part 1"""
-    elves: set[Point] = data
+    elves: BitGrid = data
     for rd in range(10):
-        elves = move_elves(elves, rd % len(DIRECTIONS))
+        move_elves(elves, rd % len(DIRECTIONS))
 
     return empty_ground(elves)
 
 
 def part2(data):
     """Solve part 2"""
-    elves: set[Point] = data
+    elves: BitGrid = data
     rd: int = 0
     while True:
-        new_elves: set[Point] = move_elves(elves, rd % len(DIRECTIONS))
+        moved: bool = move_elves(elves, rd % len(DIRECTIONS))
         rd += 1
 
-        if new_elves == elves:
+        if not moved:
             return rd
-        elves = new_elves
 
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
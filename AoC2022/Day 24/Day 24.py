@@ -1,25 +1,18 @@
 import pathlib
 import sys
 import os
-from collections import namedtuple, defaultdict
+import math
+from collections import namedtuple
 
-Point = namedtuple('Point', 'x y')
+from bitgrid import BitGrid
 
-BlizzardDict = dict[Point, set[str]]
+Point = namedtuple('Point', 'x y')
 
 
 def parse(puzzle_input):
     """Parse input"""
     lines: list[str] = [line.strip('#') for line in puzzle_input.split('\n')[1:-1]]
-    valley: Valley = Valley(lines)
-
-    blizzards: BlizzardDict = defaultdict(set)
-    for y, line in enumerate(lines):
-        for x, pos in enumerate(line):
-            if pos != '.':
-                blizzards[Point(x, y)].add(pos)
-
-    return valley, dict(blizzards)
+    return Valley(lines)
 
 
 def manhattan_distance(a: Point, b: Point) -> int:
@@ -33,83 +26,82 @@ class Valley:
         self.start: Point = Point(0, -1)
         self.end: Point = Point(self.width - 1, self.height)
 
-    def update_blizzards(self, blizzards: BlizzardDict) -> BlizzardDict:
-        new_blizzards: BlizzardDict = defaultdict(set)
-        for (x, y), directions in blizzards.items():
-            for direction in directions:
-                match direction:
-                    case '<':
-                        new_blizzards[Point((x - 1) % self.width, y)].add(direction)
-                    case '>':
-                        new_blizzards[Point((x + 1) % self.width, y)].add(direction)
-                    case '^':
-                        new_blizzards[Point(x, (y - 1) % self.height)].add(direction)
-                    case 'v':
-                        new_blizzards[Point(x, (y + 1) % self.height)].add(direction)
-
-        return new_blizzards
-
-    def neighbors(self, pt: Point) -> set[Point]:
-        if pt == self.start:
-            return {Point(self.start.x, self.start.y + 1)}
-        if pt == self.end:
-            return {Point(self.end.x, self.end.y - 1)}
-
-        n: set[Point] = set()
-        if pt.x > 0:
-            n.add(Point(pt.x - 1, pt.y))
-        if pt.x < self.width - 1:
-            n.add(Point(pt.x + 1, pt.y))
-        if pt.y > 0 or pt == (self.start.x, self.start.y + 1):
-            n.add(Point(pt.x, pt.y - 1))
-        if pt.y < self.height - 1 or pt == (self.end.x, self.end.y - 1):
-            n.add(Point(pt.x, pt.y + 1))
-        return n
-
-
-def min_travel_time(start: Point, end: Point, valley: Valley, blizzards: BlizzardDict) -> tuple[int, BlizzardDict]:
-    minutes_elapsed: int = 0
-    states: set[Point] = {start}
-    while states:
-        minutes_elapsed += 1
-        blizzards = valley.update_blizzards(blizzards)
-
-        # All moves/holds without blizzards
-        new_states: set[Point] = set(states)
-        for pt in states:
-            new_states |= valley.neighbors(pt)
-        new_states -= blizzards.keys()
-
-        if end in new_states:
-            return minutes_elapsed, blizzards
-
-        states = new_states
-    return -1, blizzards
+        # Blizzards only drift and wrap, so the starting rows of each kind give their cells at any minute
+        self.period: int = math.lcm(self.width, self.height)
+        self.blizzards: dict[str, BitGrid] = {arrow: BitGrid.from_lines(scan, arrow) for arrow in '<>^v'}
+        self.__free_rows: dict[int, list[int]] = {}
+
+    def is_free(self, pt: Point, minute: int) -> bool:
+        if pt == self.start or pt == self.end:
+            return True
+        x, y = pt
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return not (self.blizzards['<'].rows[y] >> (x + minute) % self.width & 1
+                    or self.blizzards['>'].rows[y] >> (x - minute) % self.width & 1
+                    or self.blizzards['^'].rows[(y + minute) % self.height] >> x & 1
+                    or self.blizzards['v'].rows[(y - minute) % self.height] >> x & 1)
+
+    def free_rows(self, minute: int) -> list[int]:
+        """ Per row, the cells without a blizzard at that minute """
+        minute %= self.period
+        if minute not in self.__free_rows:
+            left, right, up, down = (self.blizzards[arrow] for arrow in '<>^v')
+            self.__free_rows[minute] = [~(left.roll(left.rows[y], -minute) | right.roll(right.rows[y], minute)
+                                          | up.rows[(y + minute) % self.height]
+                                          | down.rows[(y - minute) % self.height]) & left.full
+                                        for y in range(self.height)]
+        return self.__free_rows[minute]
+
+    def min_travel_time(self, start: Point, end: Point, departure: int = 0) -> int:
+        """ Minute of arrival at end, -1 if it can't be reached. Every cell reachable by now moves at once """
+        entry_row: int = 0 if start.y < 0 else self.height - 1
+        exit_row: int = 0 if end.y < 0 else self.height - 1
+        reachable: list[int] = [0] * self.height
+
+        minute: int = departure
+        seen: set[tuple[int, tuple[int, ...]]] = set()
+        while True:
+            if reachable[exit_row] >> end.x & 1:
+                return minute + 1
+            key: tuple[int, tuple[int, ...]] = (minute % self.period, tuple(reachable))
+            if key in seen:
+                return -1
+            seen.add(key)
+
+            minute += 1
+            free: list[int] = self.free_rows(minute)
+            reachable = [(row | row << 1 | row >> 1 | above | below) & free_row
+                         for row, above, below, free_row in zip(reachable, [0] + reachable, reachable[1:] + [0], free)]
+
+            # Waiting at the entrance is always safe, step in whenever the cell beside it is clear
+            reachable[entry_row] |= 1 << start.x & free[entry_row]
 
 
 def part1(data):
     """Solve part 1"""
-    valley, blizzards = data
-    min_time, _ = min_travel_time(valley.start, valley.end, valley, blizzards)
-
-    return min_time
+    valley: Valley = data
+    return valley.min_travel_time(valley.start, valley.end)
 
 
 def part2(data):
     """Solve part 2"""
-    valley, blizzards = data
-    first_trip, blizzards = min_travel_time(valley.start, valley.end, valley, blizzards)
-    second_trip, blizzards = min_travel_time(valley.end, valley.start, valley, blizzards)
-    third_trip, blizzards = min_travel_time(valley.start, valley.end, valley, blizzards)
-
-    return first_trip + second_trip + third_trip
+    valley: Valley = data
+    first_trip: int = valley.min_travel_time(valley.start, valley.end)
+    second_trip: int = valley.min_travel_time(valley.end, valley.start, first_trip)
+    return valley.min_travel_time(valley.start, valley.end, second_trip)
 
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -3,6 +3,8 @@ import sys
 import os
 from collections import defaultdict
 
+from aoctools import DisjointSet
+
 
 def parse(puzzle_input):
     """Parse input"""
@@ -30,15 +32,11 @@ def expand(to_expand: set[str], nodes: dict[str, set[str]], min_connections: int
 
 
 def connected_components(nodes: dict[str, set[str]]) -> list[set[str]]:
-    components: list[set[str]] = []
-    
-    remaining_nodes: set[str] = set(nodes.keys())
-    while remaining_nodes:
-        cur_component: set[str] = expand({remaining_nodes.pop()}, nodes)
-        components.append(cur_component)
-        remaining_nodes -= cur_component
-        
-    return components
+    components: DisjointSet[str] = DisjointSet(nodes)
+    for node, neighbors in nodes.items():
+        for neighbor in neighbors:
+            components.union(node, neighbor)
+    return components.groups()
 
 
 def independent_groups(nodes: dict[str, set[str]]) -> (set[str], set[str]):
@@ -1,49 +1,10 @@
 import pathlib
 import sys
 import os
-import itertools
-from typing import Iterable, Sequence
-
-
-class ComponentMap:
-    def __init__(self, source: str, destination: str, ranges: Iterable[tuple[int, int, int]]) -> None:
-        self.source: str = source
-        self.destination: str = destination
-        self.ranges: list[tuple[int, int, int]] = list(ranges)
-
-    def lookup(self, n: int, *, reverse: bool = False) -> int:
-        for dst, src, length in self.ranges:
-            if reverse:
-                dst, src = src, dst
-            if src <= n < src + length:
-                return n - src + dst
-        return n
-
-    def remaining_range_length(self, n: int, *, reverse: bool = False) -> int:
-        for dst, src, length in self.ranges:
-            if reverse:
-                dst, src = src, dst
-            if src <= n < src + length:
-                return src + length - n
-        return 1
-
-    def merge(self, post: 'ComponentMap') -> None:
-        new_ranges: list[tuple[int, int, int]] = []
-
-        points: set[int] = set()
-        for dst, _, length in self.ranges:
-            points.update((dst, dst + length))
-        for _, src, length in post.ranges:
-            points.update((src, src + length))
-
-        for pt1, pt2 in itertools.pairwise(sorted(points)):
-            src: int = self.lookup(pt1, reverse=True)
-            dst: int = post.lookup(pt1)
-            if src != dst:
-                new_ranges.append((dst, src, pt2 - pt1))
-
-        self.destination = post.destination
-        self.ranges = new_ranges
+import functools
+from typing import Sequence
+
+from aoctools import IntervalSet, RangeMap
 
 
 def parse(puzzle_input):
@@ -51,51 +12,45 @@ def parse(puzzle_input):
     components: list[str] = puzzle_input.split('\n\n')
     seeds: list[int] = [int(n) for n in components[0].split()[1:]]
 
-    almanac: list[ComponentMap] = []
+    almanac: list[RangeMap] = []
     for component in components[1:]:
-        name: str = component.split(':')[0]
-        src, dest = name.split()[0].split('-to-')
         ranges: list[tuple[int, int, int]] = [tuple(int(n) for n in r.split()) for r in
                                               component.split(':')[1].strip().split('\n')]
-        almanac.append(ComponentMap(src, dest, ranges))
+        almanac.append(RangeMap.from_destinations(ranges))
     return seeds, almanac
 
 
-def merge_maps(maps: Sequence[ComponentMap]) -> ComponentMap:
-    consolidated: ComponentMap = maps[0]
-    for cmap in maps[1:]:
-        consolidated.merge(cmap)
-    return consolidated
+def merge_maps(maps: Sequence[RangeMap]) -> RangeMap:
+    return functools.reduce(RangeMap.then, maps)
 
 
 def part1(data):
     """Solve part 1"""
     seeds, almanac = data
-    merged: ComponentMap = merge_maps(almanac)
-    return min(merged.lookup(seed) for seed in seeds)
+    merged: RangeMap = merge_maps(almanac)
+    return min(merged[seed] for seed in seeds)
 
 
 def part2(data):
     """Solve part 2"""
     seed_ranges, almanac = data
-    merged: ComponentMap = merge_maps(almanac)
-
-    location: int = 0
-    while True:
-        seed: int = merged.lookup(location, reverse=True)
-        for i in range(0, len(seed_ranges), 2):
-            start, length = seed_ranges[i:i + 2]
-            if start <= seed < start + length:
-                return location
+    merged: RangeMap = merge_maps(almanac)
 
-        location += merged.remaining_range_length(location, reverse=True)
+    seeds: IntervalSet = IntervalSet((start, start + length)
+                                       for start, length in zip(seed_ranges[::2], seed_ranges[1::2]))
+    return merged.map_intervals(seeds).starts[0]
 
 
 def solve(puzzle_input):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
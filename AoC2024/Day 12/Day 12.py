@@ -3,6 +3,7 @@ import sys
 import os
 from typing import Generator, Iterable
 
+from aoctools import DisjointSet
 from xypair import XYpair
 from pointwalker import PointWalker
 from space import Space
@@ -54,24 +55,15 @@ class Region:
 
 
 class Garden(Space):
-    def expand_to_region(self, start: XYpair) -> Region:
-        plant: str = self[start]
-        seen: set[XYpair] = set()
-        new_pts: set[XYpair] = {start}
-        while new_pts:
-            pt: XYpair = new_pts.pop()
-            seen.add(pt)
-            new_pts |= (self.neighbors(pt) & self.items[plant]) - seen
-        return Region(seen)
-
     def regions(self) -> Generator[Region, None, None]:
         for plots in self.items.values():
-            plots = set(plots)
-            while plots:
-                seed: XYpair = plots.pop()
-                region: Region = self.expand_to_region(seed)
-                plots -= region.plots
-                yield region
+            regions: DisjointSet[XYpair] = DisjointSet(plots)
+            for pt in plots:
+                # Joining each plot to the ones right and below it covers every adjacent pair once
+                for neighbor in (pt.right(), pt.down()):
+                    if neighbor in regions:
+                        regions.union(pt, neighbor)
+            yield from (Region(region) for region in regions.groups())
 
 
 def parse(puzzle_input: str):
@@ -93,9 +85,14 @@ def part2(data):
 
 def solve(puzzle_input: str):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -1,45 +1,34 @@
 import pathlib
 import sys
 import os
-from typing import Iterable
 
-from xypair import XYpair, XYtuple
+from particle import ParticleSystem
 
 
-class Robot:
-    def __init__(self, pos: XYtuple, vel: XYtuple) -> None:
-        self.position: XYpair = XYpair(*pos)
-        self.velocity: XYpair = XYpair(*vel)
+def quadrant(position: tuple[int, ...], width: int, height: int) -> int | None:
+    middle_x: int = width // 2
+    middle_y: int = height // 2
+    x, y = position
+    if x > middle_x and y < middle_y:
+        return 1
+    if x < middle_x and y < middle_y:
+        return 2
+    if x < middle_x and y > middle_y:
+        return 3
+    if x > middle_x and y > middle_y:
+        return 4
 
-    def __repr__(self) -> str:
-        return f'{self.__class__.__name__}({self.position})'
 
-    def move(self, seconds: int, width: int, height: int) -> None:
-        self.position = self.velocity * seconds + self.position
-        self.position = XYpair(self.position.x % width, self.position.y % height)
-
-    def quadrant(self, width: int, height: int) -> int:
-        middle_x: int = width // 2
-        middle_y: int = height // 2
-        if self.position.x > middle_x and self.position.y < middle_y:
-            return 1
-        if self.position.x < middle_x and self.position.y < middle_y:
-            return 2
-        if self.position.x < middle_x and self.position.y > middle_y:
-            return 3
-        if self.position.x > middle_x and self.position.y > middle_y:
-            return 4
-
-
-def safety_factor(robots: Iterable[Robot], width: int, height: int) -> int:
+def safety_factor(robots: ParticleSystem, width: int, height: int) -> int:
+    quadrants: list[int | None] = [quadrant(position, width, height) for position in robots.positions_at()]
     factor: int = 1
-    for quadrant in range(1, 5):
-        factor *= len([r for r in robots if r.quadrant(width, height) == quadrant])
+    for q in range(1, 5):
+        factor *= quadrants.count(q)
     return factor
 
 
-def print_robots(robots: Iterable[Robot], width: int, height: int) -> None:
-    robot_positions: set[XYpair] = {r.position for r in robots}
+def print_robots(robots: ParticleSystem, width: int, height: int) -> None:
+    robot_positions: set[tuple[int, ...]] = set(robots.positions_at())
     lines: list[str] = []
     for y in range(height):
         line: str = ''
@@ -52,45 +41,53 @@ def print_robots(robots: Iterable[Robot], width: int, height: int) -> None:
     print('\n'.join(lines))
 
 
-def touching(robots: Iterable[Robot]) -> int:
-    robot_positions: set[XYpair] = {r.position for r in robots}
-    return sum(len(r.position.neighbors(include_corners=True) & robot_positions) for r in robots)
-
-
 def parse(puzzle_input: str):
     """Parse input"""
-    robots: list[Robot] = []
+    positions: list[tuple[int, ...]] = []
+    velocities: list[tuple[int, ...]] = []
     for line in puzzle_input.split('\n'):
         p_str, v_str = line.split()
-        p: XYtuple = tuple(int(n) for n in p_str.removeprefix('p=').split(','))
-        v: XYtuple = tuple(int(n) for n in v_str.removeprefix('v=').split(','))
-        robots.append(Robot(p, v))
-    return robots
+        positions.append(tuple(int(n) for n in p_str.removeprefix('p=').split(',')))
+        velocities.append(tuple(int(n) for n in v_str.removeprefix('v=').split(',')))
+    return positions, velocities
 
 
 def part1(data):
     """Solve part 1"""
     space_width: int = 101  # test = 11, input = 101
     space_height: int = 103  # test = 7, input = 103
-    for robot in data:
-        robot.move(100, space_width, space_height)
-    return safety_factor(data, space_width, space_height)
+    robots: ParticleSystem = ParticleSystem(*data, wrap=(space_width, space_height))
+    robots.tick(100)
+    return safety_factor(robots, space_width, space_height)
 
 
 def part2(data):
-    """Solve part 2"""  # 6752
+    """Solve part 2"""
     space_width: int = 101
     space_height: int = 103
-    for robot in data:
-        robot.move(6752, space_width, space_height)
-    print_robots(data, space_width, space_height)
+    robots: ParticleSystem = ParticleSystem(*data, wrap=(space_width, space_height))
+
+    # The picture is where the robots bunch up, x repeats every width seconds and y every height seconds
+    best_x: int = min(range(space_width), key=lambda t: robots.variance(0, t))
+    best_y: int = min(range(space_height), key=lambda t: robots.variance(1, t))
+    seconds: int = next(t for t in range(best_x, space_width * space_height, space_width)
+                        if t % space_height == best_y)
+
+    robots.tick(seconds)
+    print_robots(robots, space_width, space_height)
+    return seconds
 
 
 def solve(puzzle_input: str):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -1,6 +1,7 @@
 import pathlib
 import sys
 import os
+from collections.abc import Iterator
 
 from xypair import XYpair
 from pointwalker import State, Heading, PointWalker
@@ -9,63 +10,39 @@ from space import Space
 
 class ReindeerMaze(Space):
     def __init__(self, in_put) -> None:
-        super().__init__(in_put)
+        super().__init__(in_put, dense=True)
 
         self.start: XYpair = self.initial_position('S')
         self.end: XYpair = self.initial_position('E')
         self.walls: set[XYpair] = self.items['#']
 
         self.score: dict[State, int] = {}
-        self.paths: dict[State, set[tuple[State, ...]]] = {}
         self.lowest_path_score: int = 0
         self.lowest_path_points: set[XYpair] = set()
 
         self.analyze()
 
+    def moves(self, state: State) -> Iterator[tuple[State, int]]:
+        forward: PointWalker = PointWalker(state.position, state.heading)
+        if forward.next() not in self.walls:
+            yield State(forward.next(), state.heading), 1
+        if forward.peek('LEFT') not in self.walls:
+            yield State(state.position, state.heading.left()), 1000
+        if forward.peek('RIGHT') not in self.walls:
+            yield State(state.position, state.heading.right()), 1000
+
     def analyze(self) -> None:
         init_state: State = State(self.start, Heading.EAST)
-        current: set[State] = {init_state}
-        new_pts: set[State] = set()
-        self.score = {init_state: 0}
-        self.paths = {init_state: {(init_state, )}}
-
-        while current:
-            while current:
-                cur_state: State = current.pop()
-                if cur_state.position == self.end:
-                    continue
-
-                targets: set[tuple[State, int]] = set()
-                forward: PointWalker = PointWalker(cur_state.position, cur_state.heading)
-                if forward.next() not in self.walls:
-                    targets.add((State(forward.next(), cur_state.heading), self.score[cur_state] + 1))
-                if forward.peek('LEFT') not in self.walls:
-                    targets.add((State(cur_state.position, cur_state.heading.left()), self.score[cur_state] + 1000))
-                if forward.peek('RIGHT') not in self.walls:
-                    targets.add((State(cur_state.position, cur_state.heading.right()), self.score[cur_state] + 1000))
-
-                for next_state, next_score in targets:
-                    if next_state not in self.score or next_score <= self.score[next_state]:
-                        target_paths: set[tuple[State, ...]] = {path + (next_state,) for path in self.paths[cur_state]}
-                        if next_score == self.score.get(next_state, 0):
-                            self.paths[next_state].update(target_paths)  # noqa
-                        else:
-                            self.paths[next_state] = target_paths
-                        self.score[next_state] = next_score
-                        new_pts.add(next_state)
-
-            current = new_pts
-            new_pts = set()
+        results: dict[State, tuple[int, list[State]]] = \
+            self.weighted_search(init_state, lambda s: s.position == self.end, self.moves)
+        self.score = {s: score for s, (score, _) in results.items()}
 
         # Aggregate path points
-        self.lowest_path_points = set()
         min_score: int = self.min_score(self.end)
-        for s, paths in self.paths.items():
-            if s.position == self.end and self.score[s] == min_score:
-                for path in paths:
-                    self.lowest_path_points.update(s.position for s in path)
+        best_finishes: list[State] = [s for s in self.score if s.position == self.end and self.score[s] == min_score]
+        self.lowest_path_points = {s.position for s in self.on_shortest_paths(results, best_finishes)}
 
-        self.lowest_path_score = self.min_score(self.end)
+        self.lowest_path_score = min_score
 
     def min_score(self, pt: XYpair) -> int:
         return min(self.score[state] for state in self.score if state.position == pt)
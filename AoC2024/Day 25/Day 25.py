@@ -1,27 +1,27 @@
 import pathlib
 import sys
 import os
-from typing import Sequence
+
+from bitgrid import BitGrid
 
 
 def parse(puzzle_input: str):
     """Parse input"""
-    locks: list[list[int]] = []
-    keys: list[list[int]] = []
+    locks: list[int] = []
+    keys: list[int] = []
     for grid in puzzle_input.split('\n\n'):
         rows: list[str] = grid.split('\n')
-        top_row: str = rows[0]
-        width: int = len(top_row)
-        heights: list[int] = [[line[i] for line in rows].count('#') - 1 for i in range(width)]
-        if set(top_row) == {'#'}:
-            locks.append(heights)
+        # A whole schematic packs into one int, overlapping pins share a set bit
+        schematic: int = BitGrid.from_lines(rows).packed()
+        if set(rows[0]) == {'#'}:
+            locks.append(schematic)
         else:
-            keys.append(heights)
+            keys.append(schematic)
     return locks, keys
 
 
-def fits(key: Sequence[int], lock: Sequence[int]) -> bool:
-    return all(k + l <= 5 for k, l in zip(key, lock, strict=True))
+def fits(key: int, lock: int) -> bool:
+    return not key & lock
 
 
 def part1(data):
@@ -1,15 +1,10 @@
 import pathlib
 import sys
 import os
-from collections import defaultdict
 
 from xypair import XYpair
 from space import Space
-
-TURN_RIGHT: dict[str, str] = {'^': '>',
-                              '>': 'v',
-                              'v': '<',
-                              '<': '^'}
+from pointwalker import Direction, Heading, ObstacleIndex, PointWalker, State
 
 
 class Lab(Space):
@@ -19,49 +14,22 @@ class Lab(Space):
         self.obstacles: set[XYpair] = self.items['#']
         self.guard_starting_position: XYpair = self.initial_position('^')
 
-    def path(self) -> set[XYpair]:
-        visited: set[XYpair] = set()
-        cur_dir: str = '^'
-        cur_pos: XYpair = self.guard_starting_position
-        while self.in_space(cur_pos):
-            visited.add(cur_pos)
-            next_pos: XYpair = self.get_next(cur_pos, cur_dir)
-            while next_pos in self.obstacles:
-                cur_dir = TURN_RIGHT[cur_dir]
-                next_pos = self.get_next(cur_pos, cur_dir)
-            cur_pos = next_pos
+    def path(self) -> dict[XYpair, State]:
+        """ Every position the guard visits, with the guard's state when it first got there """
+        visited: dict[XYpair, State] = {}
+        guard: PointWalker = PointWalker(self.guard_starting_position, Heading.NORTH)
+        while self.in_space(guard.position):
+            visited.setdefault(guard.position, guard.state())
+            while guard.next() in self.obstacles:
+                guard.turn(Direction.RIGHT)
+            guard.move()
         return visited
 
-    def loops(self) -> bool:
-        visited: dict[XYpair, set[str]] = defaultdict(set)
-        cur_dir: str = '^'
-        cur_pos: XYpair = self.guard_starting_position
-        while self.in_space(cur_pos):
-            visited[cur_pos].add(cur_dir)
-            next_pos: XYpair = self.get_next(cur_pos, cur_dir)
-            while next_pos in self.obstacles:
-                cur_dir = TURN_RIGHT[cur_dir]
-                next_pos = self.get_next(cur_pos, cur_dir)
-            cur_pos = next_pos
-
-            if cur_dir in visited[cur_pos]:
-                return True
-
-        return False
-
-    @staticmethod
-    def get_next(pos: XYpair, direction: str) -> XYpair:
-        match direction:
-            case '^':
-                return pos.up()
-            case '>':
-                return pos.right()
-            case 'v':
-                return pos.down()
-            case '<':
-                return pos.left()
-            case _:
-                raise ValueError('invalid direction')
+    def loops(self, obstacle_index: ObstacleIndex, new_obstacle: XYpair, arrival: State) -> bool:
+        # Nothing changes before the guard first reaches the new obstacle, so start one step short of it
+        guard: PointWalker = PointWalker(State(new_obstacle - arrival.heading.delta(), arrival.heading))
+        with obstacle_index.extra_obstacle(new_obstacle):
+            return guard.loops(obstacle_index)
 
 
 def parse(puzzle_input: str):
@@ -77,23 +45,23 @@ def part1(data):
 def part2(data):
     """Solve part 2"""
     lab: Lab = Lab(data)
+    obstacle_index: ObstacleIndex = ObstacleIndex(lab.obstacles)
 
-    num_loops: int = 0
-    possible: set[XYpair] = lab.path()
-    possible.remove(lab.guard_starting_position)
-    for pt in possible:
-        lab.obstacles.add(pt)
-        if lab.loops():
-            num_loops += 1
-        lab.obstacles.remove(pt)
-    return num_loops
+    possible: dict[XYpair, State] = lab.path()
+    del possible[lab.guard_starting_position]
+    return sum(lab.loops(obstacle_index, pt, arrival) for pt, arrival in possible.items())
 
 
 def solve(puzzle_input: str):
     """Solve the puzzle for the given input"""
-    data = parse(puzzle_input)
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
+
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution1 = part1(data)
-    data = parse(puzzle_input)
+    data = parsecache.cached(parse, puzzle_input) if parsecache else parse(puzzle_input)
     solution2 = part2(data)
 
     return solution1, solution2
@@ -1,4 +1,9 @@
-from collections.abc import Sequence
+import collections
+import functools
+import itertools
+import math
+
+from search import PackedSet, StateLayout, bfs
 
 PART1_TEST_ANSWER = 7
 PART2_TEST_ANSWER = 33
@@ -15,55 +20,45 @@ class Machine:
             self.buttons.append(tuple(int(b) for b in button.split(',')))
 
     def fewest_button_presses_lights(self) -> int:
-        fewest: dict[tuple[bool, ...], int] = {}
-        edge: set[tuple[bool, ...]] = {tuple(False for _ in self.lights)}
-        distance: int = 0
-        while edge:
-            new_edge: set[tuple[bool, ...]] = set()
-            for state in edge:
-                fewest[state] = distance
-                for button in self.buttons:
-                    next_state: tuple[bool, ...] = update_lights(state, button)
-                    if next_state not in fewest and next_state not in edge:
-                        new_edge.add(next_state)
-
-            edge = new_edge
-            distance += 1
-
-        return fewest[tuple(self.lights)]
-
-    def fewest_button_presses_joltages(self) -> int:
-        fewest: dict[tuple[int, ...], int] = {}
-        edge: set[tuple[int, ...]] = {tuple(0 for _ in self.joltages)}
-        distance: int = 0
-        while edge:
-            new_edge: set[tuple[int, ...]] = set()
-            for state in edge:
-                fewest[state] = distance
-                for button in self.buttons:
-                    next_state: tuple[int, ...] = update_joltages(state, button)
-                    if next_state not in fewest and next_state not in edge:
-                        if all(n <= j for n, j in zip(next_state, self.joltages)):
-                            new_edge.add(next_state)
-
-            edge = new_edge
-            distance += 1
-
-        return fewest[tuple(self.joltages)]
+        target: int = sum(1 << i for i, light in enumerate(self.lights) if light)
+        masks: list[int] = [sum(1 << i for i in button) for button in self.buttons]
 
+        presses, _ = bfs(0,
+                         lambda lights: (lights ^ mask for mask in masks),
+                         lambda lights: lights == target,
+                         seen=PackedSet(len(self.lights)))
+        return presses
 
-def update_lights(lights: Sequence[bool], button_pressed: tuple[int, ...]) -> tuple[bool, ...]:
-    lights = list(lights)
-    for i in button_pressed:
-        lights[i] ^= True
-    return tuple(lights)
-
-
-def update_joltages(joltages: Sequence[int], button_pressed: tuple[int, ...]) -> tuple[int, ...]:
-    joltages = list(joltages)
-    for i in button_pressed:
-        joltages[i] += 1
-    return tuple(joltages)
+    def fewest_button_presses_joltages(self) -> int:
+        """
+        Pressing a subset of the buttons once each has to leave even joltages behind, and half of those is
+        the same problem again. Joltages are packed with a guard bit on top of each counter, so the
+        subtraction, its underflow check and the halving work on every counter at once.
+        """
+        width: int = max(*self.joltages, len(self.buttons)).bit_length() + 1
+        layout: StateLayout = StateLayout.uniform(len(self.joltages), width)
+        guard: int = layout.high_bits
+        effects: list[int] = [layout.pack({i: 1 for i in button}) for button in self.buttons]
+
+        # Joltage parity -> (joltage increase, presses) of every subset of buttons with that parity
+        subsets: dict[int, list[tuple[int, int]]] = collections.defaultdict(list)
+        for presses in range(len(effects) + 1):
+            for pressed in itertools.combinations(effects, presses):
+                effect: int = sum(pressed)
+                subsets[effect & layout.low_bits].append((effect, presses))
+
+        @functools.cache
+        def fewest(joltages: int) -> float:
+            if joltages == 0:
+                return 0
+            best: float = math.inf
+            for effect, presses in subsets[joltages & layout.low_bits]:
+                remaining: int = (joltages | guard) - effect
+                if remaining & guard == guard:
+                    best = min(best, presses + 2 * fewest((remaining ^ guard) >> 1))
+            return best
+
+        return int(fewest(layout.pack(self.joltages)))
 
 
 def parse(puzzle_input: str):
@@ -101,19 +96,35 @@ def get_puzzle_input(file: pathlib.Path) -> str:
     return file.read_text().strip('\n').replace('\t', ' ' * 4)
 
 
-def execute(func, puzzle_input: str) -> (..., int):
+def execute(func, puzzle_input: str) -> (..., int, int):
     import time
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
 
     start: int = time.perf_counter_ns()
-    result = func(parse(puzzle_input))
-    execution_time_us: int = (time.perf_counter_ns() - start) // 1000
-    return result, execution_time_us
-
-
-def timestamp(execution_time_us: int) -> str:
-    stamp: str = f'{round(execution_time_us / 1000000, 3)} s'
-    if execution_time_us < 1000000:
-        stamp = f'{round(execution_time_us / 1000, 3)} ms'
+    data = parsecache.cached(parse, puzzle_input, defer_snapshot=True) if parsecache else parse(puzzle_input)
+    parsed: int = time.perf_counter_ns()
+    if parsecache:
+        parsecache.snapshot()  # Copying the result for part 2 is timed as neither parse nor solve
+    solving: int = time.perf_counter_ns()
+    result = func(data)
+    parse_time_us: int = (parsed - start) // 1000
+    execution_time_us: int = (time.perf_counter_ns() - solving) // 1000
+    return result, parse_time_us, execution_time_us
+
+
+def duration(time_us: int) -> str:
+    if time_us < 1000000:
+        return f'{round(time_us / 1000, 3)} ms'
+    return f'{round(time_us / 1000000, 3)} s'
+
+
+def timestamp(execution_time_us: int, parse_time_us: int | None = None) -> str:
+    stamp: str = duration(execution_time_us)
+    if parse_time_us is not None:
+        stamp += f', parse {duration(parse_time_us)}'
     return f'\t[{stamp}]'
 
 
@@ -139,9 +150,9 @@ def test(part_num: int, directory: str) -> None:
         print(prefix + 'no input')
         return
 
-    result, duration = execute(func, puzzle_input)
+    result, parse_time, solve_time = execute(func, puzzle_input)
     result = 'PASS' if result == answer else 'FAIL'
-    print(prefix + result + timestamp(duration))
+    print(prefix + result + timestamp(solve_time, parse_time))
 
 
 def solve(part_num: int, directory: str) -> None:
@@ -158,8 +169,8 @@ def solve(part_num: int, directory: str) -> None:
         print(prefix + 'no input')
         return
 
-    result, duration = execute(func, puzzle_input)
-    suffix: str = '' if result is None else timestamp(duration)
+    result, parse_time, solve_time = execute(func, puzzle_input)
+    suffix: str = '' if result is None else timestamp(solve_time, parse_time)
     print(prefix + str(result) + suffix)
 
 
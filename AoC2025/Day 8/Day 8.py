@@ -1,8 +1,8 @@
-import heapq
 import itertools
-import typing
-from collections.abc import Sequence, MutableSequence, Container, Iterable
+from collections.abc import Iterable, Iterator
 
+from aoctools import DisjointSet, product
+from spatial import KDTree
 from xyztrio import XYZtrio
 
 
@@ -10,9 +10,6 @@ PART1_TEST_ANSWER = None  # 40
 PART2_TEST_ANSWER = 25272
 
 
-XYZPairHeap: typing.TypeAlias = list[tuple[float, XYZtrio, XYZtrio]]
-
-
 def parse(puzzle_input: str):
     trios: list[XYZtrio] = []
     for line in puzzle_input.split('\n'):
@@ -21,62 +18,30 @@ def parse(puzzle_input: str):
     return trios
 
 
-def build_distance_heap(boxes: Iterable[XYZtrio]) -> XYZPairHeap:
-    distance_heap: XYZPairHeap = []
-    for box1, box2 in itertools.combinations(boxes, 2):
-        heapq.heappush(distance_heap, (box1.distance(box2), box1, box2))
-    return distance_heap
-
-
-def circuit_num(box: XYZtrio, circuits: Sequence[Container[XYZtrio]]) -> int:
-    for i, circuit in enumerate(circuits):
-        if box in circuit:
-            return i
-    return -1
-
-
-def connect_boxes(box1: XYZtrio, box2: XYZtrio, circuits: MutableSequence[set[XYZtrio]]) -> None:
-    connection: set[XYZtrio] = {box1, box2}
-
-    num1: int = circuit_num(box1, circuits)
-    num2: int = circuit_num(box2, circuits)
-
-    if num1 == num2 == -1:  # Neither found
-        circuits.append(connection)
-    elif num1 == num2:  # Both found in same circuit
-        circuits[num1].update(connection)
-    elif num1 == -1:  # Only found box2
-        circuits[num2].add(box1)
-    elif num2 == -1:  # Only found box1
-        circuits[num1].add(box2)
-    else:  # Both found in different circuits
-        circuits[num1].update(circuits[num2])
-        circuits.pop(num2)
+def closest_pairs(boxes: Iterable[XYZtrio]) -> Iterator[tuple[float, XYZtrio, XYZtrio]]:
+    """ Streamed closest first, without materializing all n^2 pairs """
+    return KDTree(boxes).closest_pairs()
 
 
 def part1(data):
     max_connections: int = 1000  # test = 10, input = 1000
 
-    distance_heap: XYZPairHeap = build_distance_heap(data)
-
-    circuits: list[set[XYZtrio]] = []
-    for _ in range(max_connections):
-        _, box1, box2 = heapq.heappop(distance_heap)
-        connect_boxes(box1, box2, circuits)
+    circuits: DisjointSet[XYZtrio] = DisjointSet(data)
+    for _, box1, box2 in itertools.islice(closest_pairs(data), max_connections):
+        circuits.union(box1, box2)
 
-    sizes: list[int] = sorted((len(circuit) for circuit in circuits), reverse=True)
-    return sizes[0] * sizes[1] * sizes[2]
+    return product(circuits.largest(3))
 
 
 def part2(data):
-    distance_heap: XYZPairHeap = build_distance_heap(data)
+    pairs: Iterator[tuple[float, XYZtrio, XYZtrio]] = closest_pairs(data)
 
     box1, box2 = None, None  # Avoid 'uninitialized' warning
 
-    circuits: list[set[XYZtrio]] = []
-    while not circuits or len(circuits[0]) < len(data):
-        _, box1, box2 = heapq.heappop(distance_heap)
-        connect_boxes(box1, box2, circuits)
+    circuits: DisjointSet[XYZtrio] = DisjointSet(data)
+    while circuits.components > 1:
+        _, box1, box2 = next(pairs)
+        circuits.union(box1, box2)
 
     return box1.x * box2.x
 
@@ -93,19 +58,35 @@ def get_puzzle_input(file: pathlib.Path) -> str:
     return file.read_text().strip('\n').replace('\t', ' ' * 4)
 
 
-def execute(func, puzzle_input: str) -> (..., int):
+def execute(func, puzzle_input: str) -> (..., int, int):
     import time
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
 
     start: int = time.perf_counter_ns()
-    result = func(parse(puzzle_input))
-    execution_time_us: int = (time.perf_counter_ns() - start) // 1000
-    return result, execution_time_us
-
-
-def timestamp(execution_time_us: int) -> str:
-    stamp: str = f'{round(execution_time_us / 1000000, 3)} s'
-    if execution_time_us < 1000000:
-        stamp = f'{round(execution_time_us / 1000, 3)} ms'
+    data = parsecache.cached(parse, puzzle_input, defer_snapshot=True) if parsecache else parse(puzzle_input)
+    parsed: int = time.perf_counter_ns()
+    if parsecache:
+        parsecache.snapshot()  # Copying the result for part 2 is timed as neither parse nor solve
+    solving: int = time.perf_counter_ns()
+    result = func(data)
+    parse_time_us: int = (parsed - start) // 1000
+    execution_time_us: int = (time.perf_counter_ns() - solving) // 1000
+    return result, parse_time_us, execution_time_us
+
+
+def duration(time_us: int) -> str:
+    if time_us < 1000000:
+        return f'{round(time_us / 1000, 3)} ms'
+    return f'{round(time_us / 1000000, 3)} s'
+
+
+def timestamp(execution_time_us: int, parse_time_us: int | None = None) -> str:
+    stamp: str = duration(execution_time_us)
+    if parse_time_us is not None:
+        stamp += f', parse {duration(parse_time_us)}'
     return f'\t[{stamp}]'
 
 
@@ -131,9 +112,9 @@ def test(part_num: int, directory: str) -> None:
         print(prefix + 'no input')
         return
 
-    result, duration = execute(func, puzzle_input)
+    result, parse_time, solve_time = execute(func, puzzle_input)
     result = 'PASS' if result == answer else 'FAIL'
-    print(prefix + result + timestamp(duration))
+    print(prefix + result + timestamp(solve_time, parse_time))
 
 
 def solve(part_num: int, directory: str) -> None:
@@ -150,8 +131,8 @@ def solve(part_num: int, directory: str) -> None:
         print(prefix + 'no input')
         return
 
-    result, duration = execute(func, puzzle_input)
-    suffix: str = '' if result is None else timestamp(duration)
+    result, parse_time, solve_time = execute(func, puzzle_input)
+    suffix: str = '' if result is None else timestamp(solve_time, parse_time)
     print(prefix + str(result) + suffix)
 
 
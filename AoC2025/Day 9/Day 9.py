@@ -2,6 +2,7 @@ import itertools
 import heapq
 from collections.abc import Sequence
 
+from aoctools import IntervalSet
 from xypair import XYpair
 
 PART1_TEST_ANSWER = 50
@@ -49,6 +50,19 @@ class Floor:
         self.vertical_segments.sort()
         self.horizontal_segments.sort()
 
+        self.column_tiles: dict[int, IntervalSet] = {}
+        self.row_tiles: dict[int, IntervalSet] = {}
+
+    def tiles_in_column(self, x: int) -> IntervalSet:
+        if x not in self.column_tiles:
+            self.column_tiles[x] = IntervalSet(self.tile_intervals_in_column(x), inclusive=True)
+        return self.column_tiles[x]
+
+    def tiles_in_row(self, y: int) -> IntervalSet:
+        if y not in self.row_tiles:
+            self.row_tiles[y] = IntervalSet(self.tile_intervals_in_row(y), inclusive=True)
+        return self.row_tiles[y]
+
     def tile_intervals_in_column(self, x: int) -> list[tuple[int, int]]:
         intersectors: list[tuple[int, int, bool]] = []
 
@@ -142,20 +156,10 @@ def part2(data):
 
         valid_rectangle: bool = True
         for a, b in sides:
-            valid_side: bool = False
-
             if a.x == b.x:
-                intervals: list[tuple[int, int]] = floor.tile_intervals_in_column(a.x)
-                for y1, y2 in intervals:
-                    if y1 <= min(a.y, b.y) and max(a.y, b.y) <= y2:
-                        valid_side = True
-                        break
+                valid_side: bool = floor.tiles_in_column(a.x).covers(min(a.y, b.y), max(a.y, b.y) + 1)
             else:
-                intervals = floor.tile_intervals_in_row(a.y)
-                for x1, x2 in intervals:
-                    if x1 <= min(a.x, b.x) and max(a.x, b.x) <= x2:
-                        valid_side = True
-                        break
+                valid_side = floor.tiles_in_row(a.y).covers(min(a.x, b.x), max(a.x, b.x) + 1)
 
             if not valid_side:
                 valid_rectangle = False
@@ -177,19 +181,35 @@ def get_puzzle_input(file: pathlib.Path) -> str:
     return file.read_text().strip('\n').replace('\t', ' ' * 4)
 
 
-def execute(func, puzzle_input: str) -> (..., int):
+def execute(func, puzzle_input: str) -> (..., int, int):
     import time
+    try:
+        import parsecache  # Part 2 gets a fresh copy of part 1's parse instead of parsing again
+    except ImportError:  # Running standalone, outside the repo
+        parsecache = None
 
     start: int = time.perf_counter_ns()
-    result = func(parse(puzzle_input))
-    execution_time_us: int = (time.perf_counter_ns() - start) // 1000
-    return result, execution_time_us
-
-
-def timestamp(execution_time_us: int) -> str:
-    stamp: str = f'{round(execution_time_us / 1000000, 3)} s'
-    if execution_time_us < 1000000:
-        stamp = f'{round(execution_time_us / 1000, 3)} ms'
+    data = parsecache.cached(parse, puzzle_input, defer_snapshot=True) if parsecache else parse(puzzle_input)
+    parsed: int = time.perf_counter_ns()
+    if parsecache:
+        parsecache.snapshot()  # Copying the result for part 2 is timed as neither parse nor solve
+    solving: int = time.perf_counter_ns()
+    result = func(data)
+    parse_time_us: int = (parsed - start) // 1000
+    execution_time_us: int = (time.perf_counter_ns() - solving) // 1000
+    return result, parse_time_us, execution_time_us
+
+
+def duration(time_us: int) -> str:
+    if time_us < 1000000:
+        return f'{round(time_us / 1000, 3)} ms'
+    return f'{round(time_us / 1000000, 3)} s'
+
+
+def timestamp(execution_time_us: int, parse_time_us: int | None = None) -> str:
+    stamp: str = duration(execution_time_us)
+    if parse_time_us is not None:
+        stamp += f', parse {duration(parse_time_us)}'
     return f'\t[{stamp}]'
 
 
@@ -215,9 +235,9 @@ def test(part_num: int, directory: str) -> None:
         print(prefix + 'no input')
         return
 
-    result, duration = execute(func, puzzle_input)
+    result, parse_time, solve_time = execute(func, puzzle_input)
     result = 'PASS' if result == answer else 'FAIL'
-    print(prefix + result + timestamp(duration))
+    print(prefix + result + timestamp(solve_time, parse_time))
 
 
 def solve(part_num: int, directory: str) -> None:
@@ -234,8 +254,8 @@ def solve(part_num: int, directory: str) -> None:
         print(prefix + 'no input')
         return
 
-    result, duration = execute(func, puzzle_input)
-    suffix: str = '' if result is None else timestamp(duration)
+    result, parse_time, solve_time = execute(func, puzzle_input)
+    suffix: str = '' if result is None else timestamp(solve_time, parse_time)
     print(prefix + str(result) + suffix)
 
 
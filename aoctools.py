@@ -1,5 +1,10 @@
+import array
+import bisect
+import enum
+import itertools
 import math
 import typing
+import collections
 import collections.abc
 import functools
 import operator
@@ -8,26 +13,168 @@ import operator
 _T: typing.TypeVar = typing.TypeVar('_T', bound=collections.abc.Hashable)
 
 
-def iterate_state(initial_state: _T, num_iterations: int, transformation: collections.abc.Callable[[_T], _T]) -> _T:
-    """ Repeatedly call transformation() on current state, cache results to detect cycles """
+@enum.unique
+class CycleStrategy(enum.Enum):
+    HISTORY = enum.auto()  # keep every state, answer the target straight from the stored cycle
+    FINGERPRINT = enum.auto()  # keep only hash(state), verify a matching hash by replaying to it
+    BRENT = enum.auto()  # constant memory, replays the prefix once the period is known
+    FLOYD = enum.auto()  # constant memory, slower than Brent but simpler
+
+
+class Cycle(typing.NamedTuple):
+    prefix: int  # iterations before the first repeated state
+    period: int
+
+    def reduce(self, num_iterations: int) -> int:
+        """ Smallest number of iterations reaching the same state as num_iterations """
+        if num_iterations < self.prefix:
+            return num_iterations
+        return self.prefix + (num_iterations - self.prefix) % self.period
+
+
+def iterate_state(initial_state: _T,
+                  num_iterations: int,
+                  transformation: collections.abc.Callable[[_T], _T],
+                  *,
+                  strategy: CycleStrategy = CycleStrategy.HISTORY) -> _T:
+    """ Repeatedly call transformation() on current state, detect cycles to skip ahead """
+    return iterate_state_with_cycle(initial_state, num_iterations, transformation, strategy=strategy)[0]
+
+
+def iterate_state_with_cycle(initial_state: _T,
+                             num_iterations: int,
+                             transformation: collections.abc.Callable[[_T], _T],
+                             *,
+                             strategy: CycleStrategy = CycleStrategy.HISTORY) -> tuple[_T, Cycle | None]:
+    """ Same as iterate_state() but also report the cycle, None if none was found within num_iterations """
 
     if num_iterations < 0:
         raise ValueError('number of iterations cannot be negative')
 
+    match strategy:
+        case CycleStrategy.HISTORY:
+            return _iterate_history(initial_state, num_iterations, transformation)
+        case CycleStrategy.FINGERPRINT:
+            return _iterate_fingerprint(initial_state, num_iterations, transformation)
+        case CycleStrategy.BRENT:
+            return _iterate_brent(initial_state, num_iterations, transformation)
+        case CycleStrategy.FLOYD:
+            return _iterate_floyd(initial_state, num_iterations, transformation)
+
+
+def _advance(state: _T, num_iterations: int, transformation: collections.abc.Callable[[_T], _T]) -> _T:
+    for _ in range(num_iterations):
+        state = transformation(state)
+    return state
+
+
+def _iterate_history(initial_state: _T,
+                     num_iterations: int,
+                     transformation: collections.abc.Callable[[_T], _T]) -> tuple[_T, Cycle | None]:
     seen: dict[_T, int] = {}
+    history: list[_T] = []
     current_state: _T = initial_state
     for i in range(num_iterations):
         seen[current_state] = i
+        history.append(current_state)
 
         current_state = transformation(current_state)
 
         if current_state in seen:
-            startup: int = seen[current_state]
-            cycle_length: int = i - startup + 1
-            reduced_iterations: int = (num_iterations - startup) % cycle_length
-            return iterate_state(current_state, reduced_iterations, transformation)
+            cycle: Cycle = Cycle(seen[current_state], i - seen[current_state] + 1)
+            return history[cycle.reduce(num_iterations)], cycle
+
+    return current_state, None
+
+
+def _iterate_fingerprint(initial_state: _T,
+                         num_iterations: int,
+                         transformation: collections.abc.Callable[[_T], _T]) -> tuple[_T, Cycle | None]:
+    seen: dict[int, list[int]] = collections.defaultdict(list)
+    current_state: _T = initial_state
+    for i in range(num_iterations):
+        seen[hash(current_state)].append(i)
+
+        current_state = transformation(current_state)
+
+        for startup in seen.get(hash(current_state), []):
+            # Rule out a hash collision by replaying to the earlier state
+            if _advance(initial_state, startup, transformation) == current_state:
+                cycle: Cycle = Cycle(startup, i - startup + 1)
+                remaining: int = cycle.reduce(num_iterations) - startup
+                return _advance(current_state, remaining, transformation), cycle
+
+    return current_state, None
 
-    return current_state
+
+def _iterate_brent(initial_state: _T,
+                   num_iterations: int,
+                   transformation: collections.abc.Callable[[_T], _T]) -> tuple[_T, Cycle | None]:
+    if num_iterations == 0:
+        return initial_state, None
+
+    # Find the period, the hare is always `steps` iterations in
+    power: int = 1
+    period: int = 1
+    tortoise: _T = initial_state
+    hare: _T = transformation(initial_state)
+    steps: int = 1
+    while tortoise != hare:
+        if steps == num_iterations:
+            return hare, None
+        if power == period:
+            tortoise = hare
+            power *= 2
+            period = 0
+        hare = transformation(hare)
+        steps += 1
+        period += 1
+
+    # Find the prefix, the hare stays one period ahead of the tortoise
+    tortoise = initial_state
+    hare = _advance(initial_state, period, transformation)
+    prefix: int = 0
+    while tortoise != hare:
+        tortoise = transformation(tortoise)
+        hare = transformation(hare)
+        prefix += 1
+
+    cycle: Cycle = Cycle(prefix, period)
+    return _advance(tortoise, cycle.reduce(num_iterations) - prefix, transformation), cycle
+
+
+def _iterate_floyd(initial_state: _T,
+                   num_iterations: int,
+                   transformation: collections.abc.Callable[[_T], _T]) -> tuple[_T, Cycle | None]:
+    if num_iterations == 0:
+        return initial_state, None
+
+    # Tortoise is `steps` iterations in, the hare twice as many
+    tortoise: _T = transformation(initial_state)
+    hare: _T = transformation(tortoise)
+    steps: int = 1
+    while tortoise != hare:
+        if steps == num_iterations:
+            return tortoise, None
+        tortoise = transformation(tortoise)
+        hare = transformation(transformation(hare))
+        steps += 1
+
+    tortoise = initial_state
+    prefix: int = 0
+    while tortoise != hare:
+        tortoise = transformation(tortoise)
+        hare = transformation(hare)
+        prefix += 1
+
+    period: int = 1
+    hare = transformation(tortoise)
+    while tortoise != hare:
+        hare = transformation(hare)
+        period += 1
+
+    cycle: Cycle = Cycle(prefix, period)
+    return _advance(tortoise, cycle.reduce(num_iterations) - prefix, transformation), cycle
 
 
 def linear_roots_int(a: int, b: int) -> int | None:
@@ -72,3 +219,325 @@ def pad_to_equal_length(str_list: collections.abc.Sequence[str], *, padding: str
 
 def product(iterable: collections.abc.Iterable[int], /, start: int = 1) -> int:
     return functools.reduce(operator.mul, iterable, start)
+
+
+class IntervalSet:
+    """
+    Set of integers stored as sorted, disjoint, non-touching half-open intervals [start, stop).
+    Membership and range queries bisect, set operations sweep both interval lists once.
+    """
+    def __init__(self, intervals: collections.abc.Iterable[tuple[int, int]] = (), *, inclusive: bool = False) -> None:
+        self.starts: list[int] = []
+        self.stops: list[int] = []
+
+        merged: list[tuple[int, int]] = []
+        for start, stop in sorted((start, stop + 1 if inclusive else stop) for start, stop in intervals):
+            if start >= stop:
+                continue
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+            else:
+                merged.append((start, stop))
+        for start, stop in merged:
+            self.starts.append(start)
+            self.stops.append(stop)
+
+    @classmethod
+    def _from_sorted(cls, starts: list[int], stops: list[int]) -> typing.Self:
+        interval_set: IntervalSet = cls()
+        interval_set.starts = starts
+        interval_set.stops = stops
+        return interval_set
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list(self)})'
+
+    def __iter__(self) -> collections.abc.Iterator[tuple[int, int]]:
+        return zip(self.starts, self.stops)
+
+    def __len__(self) -> int:
+        """ Number of intervals, see total() for the number of integers """
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self.starts == other.starts and self.stops == other.stops
+
+    def __contains__(self, n: int) -> bool:
+        i: int = bisect.bisect_right(self.starts, n) - 1
+        return i >= 0 and n < self.stops[i]
+
+    def total(self) -> int:
+        return sum(stop - start for start, stop in self)
+
+    def interval_containing(self, n: int) -> tuple[int, int] | None:
+        i: int = bisect.bisect_right(self.starts, n) - 1
+        if i >= 0 and n < self.stops[i]:
+            return self.starts[i], self.stops[i]
+        return None
+
+    def covers(self, start: int, stop: int) -> bool:
+        """ Every integer in [start, stop) is in the set """
+        if start >= stop:
+            return True
+        i: int = bisect.bisect_right(self.starts, start) - 1
+        return i >= 0 and stop <= self.stops[i]
+
+    def overlaps(self, start: int, stop: int) -> bool:
+        """ Any integer in [start, stop) is in the set """
+        i: int = bisect.bisect_left(self.stops, start + 1)
+        return start < stop and i < len(self.starts) and self.starts[i] < stop
+
+    def clip(self, start: int, stop: int) -> typing.Self:
+        """ Only the parts inside [start, stop) """
+        first: int = bisect.bisect_right(self.stops, start)
+        last: int = bisect.bisect_left(self.starts, stop)
+        starts: list[int] = self.starts[first:last]
+        stops: list[int] = self.stops[first:last]
+        if starts:
+            starts[0] = max(starts[0], start)
+            stops[-1] = min(stops[-1], stop)
+        return self._from_sorted(starts, stops)
+
+    def gaps(self, start: int, stop: int) -> typing.Self:
+        """ The parts of [start, stop) not in the set """
+        return IntervalSet([(start, stop)]) - self
+
+    def add(self, start: int, stop: int) -> None:
+        merged: IntervalSet = self | IntervalSet([(start, stop)])
+        self.starts, self.stops = merged.starts, merged.stops
+
+    def discard(self, start: int, stop: int) -> None:
+        remaining: IntervalSet = self - IntervalSet([(start, stop)])
+        self.starts, self.stops = remaining.starts, remaining.stops
+
+    def __or__(self, other: typing.Self) -> typing.Self:
+        return IntervalSet(itertools.chain(self, other))
+
+    def __and__(self, other: typing.Self) -> typing.Self:
+        starts: list[int] = []
+        stops: list[int] = []
+        i: int = 0
+        j: int = 0
+        while i < len(self.starts) and j < len(other.starts):
+            start: int = max(self.starts[i], other.starts[j])
+            stop: int = min(self.stops[i], other.stops[j])
+            if start < stop:
+                starts.append(start)
+                stops.append(stop)
+            if self.stops[i] < other.stops[j]:
+                i += 1
+            else:
+                j += 1
+        return self._from_sorted(starts, stops)
+
+    def __sub__(self, other: typing.Self) -> typing.Self:
+        starts: list[int] = []
+        stops: list[int] = []
+        j: int = 0
+        for start, stop in self:
+            while j < len(other.starts) and other.stops[j] <= start:
+                j += 1
+            k: int = j
+            while k < len(other.starts) and other.starts[k] < stop:
+                if start < other.starts[k]:
+                    starts.append(start)
+                    stops.append(other.starts[k])
+                start = max(start, other.stops[k])
+                k += 1
+            if start < stop:
+                starts.append(start)
+                stops.append(stop)
+        return self._from_sorted(starts, stops)
+
+
+class RangeMap:
+    """
+    Piecewise-linear integer map, n -> n + offset on each of a set of disjoint half-open source ranges
+    and the identity everywhere else.
+    """
+    def __init__(self, pieces: collections.abc.Iterable[tuple[int, int, int]] = ()) -> None:
+        """ pieces: (start, stop, offset) """
+        self.starts: list[int] = []
+        self.stops: list[int] = []
+        self.offsets: list[int] = []
+        for start, stop, offset in sorted(pieces):
+            if start >= stop or offset == 0:
+                continue
+            if self.stops and start < self.stops[-1]:
+                raise ValueError(f'source range [{start}, {stop}) overlaps [{self.starts[-1]}, {self.stops[-1]})')
+            if self.stops and start == self.stops[-1] and offset == self.offsets[-1]:
+                self.stops[-1] = stop
+                continue
+            self.starts.append(start)
+            self.stops.append(stop)
+            self.offsets.append(offset)
+
+    @classmethod
+    def from_destinations(cls, ranges: collections.abc.Iterable[tuple[int, int, int]]) -> typing.Self:
+        """ ranges: (destination start, source start, length) """
+        return cls((source, source + length, destination - source) for destination, source, length in ranges)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({list(self)})'
+
+    def __iter__(self) -> collections.abc.Iterator[tuple[int, int, int]]:
+        return zip(self.starts, self.stops, self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, n: int) -> int:
+        i: int = bisect.bisect_right(self.starts, n) - 1
+        if i >= 0 and n < self.stops[i]:
+            return n + self.offsets[i]
+        return n
+
+    def segment(self, n: int) -> tuple[float, float, int]:
+        """ (start, stop, offset) of the piece n is in, including the identity gaps which may be unbounded """
+        i: int = bisect.bisect_right(self.starts, n) - 1
+        if i >= 0 and n < self.stops[i]:
+            return self.starts[i], self.stops[i], self.offsets[i]
+        start: float = self.stops[i] if i >= 0 else -math.inf
+        stop: float = self.starts[i + 1] if i + 1 < len(self.starts) else math.inf
+        return start, stop, 0
+
+    def pieces(self, start: float = -math.inf, stop: float = math.inf) -> collections.abc.Iterator[tuple[float, float, int]]:
+        """ Every piece overlapping [start, stop), identity gaps included, clipped to [start, stop) """
+        cursor: float = start
+        i: int = bisect.bisect_right(self.stops, start)
+        while cursor < stop:
+            if i < len(self.starts) and self.starts[i] <= cursor:
+                piece_stop: float = min(self.stops[i], stop)
+                yield cursor, piece_stop, self.offsets[i]
+                i += 1
+            else:
+                piece_stop = min(self.starts[i], stop) if i < len(self.starts) else stop
+                yield cursor, piece_stop, 0
+            cursor = piece_stop
+
+    def map_intervals(self, intervals: IntervalSet) -> IntervalSet:
+        """ Image of every integer in intervals, a whole range at a time """
+        images: list[tuple[int, int]] = []
+        for start, stop in intervals:
+            images.extend((piece_start + offset, piece_stop + offset)
+                          for piece_start, piece_stop, offset in self.pieces(start, stop))
+        return IntervalSet(images)
+
+    def then(self, other: typing.Self) -> typing.Self:
+        """ Composition, applying self first and then other """
+        composed: list[tuple[int, int, int]] = []
+        for start, stop, offset in self.pieces():
+            composed.extend((image_start - offset, image_stop - offset, offset + other_offset)
+                            for image_start, image_stop, other_offset in other.pieces(start + offset, stop + offset))
+        return RangeMap(composed)
+
+
+class DisjointSet(typing.Generic[_T]):
+    """
+    Union-find over hashable keys, interned to indices so parents and sizes live in flat arrays.
+    Path halving plus union by size keep every operation near constant time. The number of components
+    and a histogram of component sizes are kept up to date, so largest() never has to scan the keys.
+    """
+    def __init__(self, keys: collections.abc.Iterable[_T] = ()) -> None:
+        self.keys: list[_T] = []
+        self.index: dict[_T, int] = {}
+        self.components: int = 0
+        self.__parent: array.array = array.array('l')
+        self.__size: array.array = array.array('l')
+        self.__size_counts: dict[int, int] = {}
+        self.__sizes: list[int] = []  # distinct component sizes, ascending
+        for key in keys:
+            self.add(key)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self)} keys, {self.components} components)'
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: _T) -> bool:
+        return key in self.index
+
+    def add(self, key: _T) -> int:
+        """ Index of key, which starts out as a component of its own if it wasn't known yet """
+        i: int | None = self.index.get(key)
+        if i is None:
+            i = self.index[key] = len(self.keys)
+            self.keys.append(key)
+            self.__parent.append(i)
+            self.__size.append(1)
+            self.components += 1
+            self.__count_size(1, 1)
+        return i
+
+    def __root(self, i: int) -> int:
+        parent: array.array = self.__parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def __count_size(self, size: int, change: int) -> None:
+        size_counts: dict[int, int] = self.__size_counts
+        count: int = size_counts.get(size, 0) + change
+        if count:
+            if count == change:
+                bisect.insort(self.__sizes, size)
+            size_counts[size] = count
+        else:
+            del size_counts[size]
+            del self.__sizes[bisect.bisect_left(self.__sizes, size)]
+
+    def find(self, key: _T) -> _T:
+        """ Representative key of the component containing key """
+        return self.keys[self.__root(self.add(key))]
+
+    def union(self, key1: _T, key2: _T) -> bool:
+        """ Merge the components of both keys, False if they were already connected """
+        index: dict[_T, int] = self.index
+        root1: int = self.__root(index[key1] if key1 in index else self.add(key1))
+        root2: int = self.__root(index[key2] if key2 in index else self.add(key2))
+        if root1 == root2:
+            return False
+
+        size: array.array = self.__size
+        size1: int = size[root1]
+        size2: int = size[root2]
+        if size1 < size2:
+            root1, root2 = root2, root1
+        self.__parent[root2] = root1
+        size[root1] = size1 + size2
+        self.components -= 1
+
+        self.__count_size(size1, -1)
+        self.__count_size(size2, -1)
+        self.__count_size(size1 + size2, 1)
+        return True
+
+    def connected(self, key1: _T, key2: _T) -> bool:
+        return self.__root(self.add(key1)) == self.__root(self.add(key2))
+
+    def size(self, key: _T) -> int:
+        """ Number of keys in the component containing key """
+        return self.__size[self.__root(self.add(key))]
+
+    def largest(self, k: int = 1) -> list[int]:
+        """ Sizes of the k largest components, largest first """
+        sizes: list[int] = []
+        for size in reversed(self.__sizes):
+            sizes.extend([size] * min(self.__size_counts[size], k - len(sizes)))
+            if len(sizes) == k:
+                break
+        return sizes
+
+    def groups(self) -> list[set[_T]]:
+        """ Every component as a set of keys """
+        members: dict[int, set[_T]] = collections.defaultdict(set)
+        for i, key in enumerate(self.keys):
+            members[self.__root(i)].add(key)
+        return list(members.values())
@@ -0,0 +1,332 @@
+import array
+import enum
+import itertools
+import sys
+import typing
+import collections.abc
+
+try:
+    import numpy
+except ImportError:  # Pure Python fallback below
+    numpy = None
+
+
+@enum.unique
+class Boundary(enum.Enum):
+    FIXED = enum.auto()  # cells outside the grid are background forever
+    INFINITE = enum.auto()  # the grid grows by one cell a side every step, the background follows the rule too
+    WRAP = enum.auto()  # opposite faces of the grid are neighbors
+
+
+class Rule(typing.NamedTuple):
+    """
+    next_state(state, counts) gives a cell's next state from its state and how many neighbors are in each of
+    the counted states. Pattern rules instead get (state, (pattern,)), pattern reading the neighborhood as
+    binary digits with state 1 as a one and the first neighbor highest.
+    """
+    num_states: int
+    counted: tuple[int, ...]
+    next_state: collections.abc.Callable[[int, tuple[int, ...]], int]
+    pattern: bool = False
+
+    @classmethod
+    def life(cls, birth: collections.abc.Iterable[int], survive: collections.abc.Iterable[int]) -> typing.Self:
+        """ Dead 0 and alive 1 by the number of live neighbors, e.g. birth (3,) and survive (2, 3) for Conway's """
+        born: frozenset[int] = frozenset(birth)
+        survivors: frozenset[int] = frozenset(survive)
+        return cls(2, (1,), lambda state, counts: int(counts[0] in (survivors if state else born)))
+
+    @classmethod
+    def counting(cls,
+                 num_states: int,
+                 counted: collections.abc.Iterable[int],
+                 next_state: collections.abc.Callable[[int, tuple[int, ...]], int]) -> typing.Self:
+        return cls(num_states, tuple(counted), next_state)
+
+    @classmethod
+    def lookup(cls, table: collections.abc.Sequence[int]) -> typing.Self:
+        """ Dead 0 and alive 1, table indexed by the pattern of the neighborhood including the cell itself """
+        return cls(2, (), lambda _, pattern: table[pattern[0]], pattern=True)
+
+
+class Automaton:
+    """
+    Cellular automaton on a dense grid of any dimension, one byte per cell with the first axis varying fastest.
+    A step computes every cell at once: neighbor counts are sums of shifted copies of the grid, either NumPy
+    arrays or big ints holding one cell per byte lane, and a precomputed table maps the counts to new states.
+    """
+    def __init__(self,
+                 cells: collections.abc.Iterable[int],
+                 shape: collections.abc.Sequence[int],
+                 rule: Rule,
+                 *,
+                 origin: collections.abc.Sequence[int] | None = None,
+                 boundary: Boundary = Boundary.FIXED,
+                 background: int = 0,
+                 neighborhood: collections.abc.Iterable[collections.abc.Sequence[int]] | None = None,
+                 use_numpy: bool | None = None) -> None:
+        """
+        shape: size along each axis, origin: coordinates of the first cell. neighborhood: offsets of the
+        neighbors, by default every cell of the surrounding 3 x 3 x ... box, the cell itself only for patterns.
+        """
+        self.__cells: bytes = bytes(cells)
+        self.shape: tuple[int, ...] = tuple(shape)
+        self.dimensions: int = len(self.shape)
+        self.origin: tuple[int, ...] = tuple(origin) if origin is not None else (0,) * self.dimensions
+        self.rule: Rule = rule
+        self.boundary: Boundary = boundary
+        self.background: int = background
+        if len(self.__cells) != self.__size(self.shape):
+            raise ValueError(f'{len(self.__cells)} cells do not fill shape {self.shape}')
+
+        self.numpy: bool = numpy is not None if use_numpy is None else use_numpy
+        if self.numpy and numpy is None:
+            raise ImportError('use_numpy requires NumPy')
+
+        # The whole box sums axis by axis, far fewer shifts than one per neighbor
+        self.__box: bool = neighborhood is None
+        if neighborhood is None:
+            neighborhood = (tuple(reversed(offset)) for offset in itertools.product((-1, 0, 1), repeat=self.dimensions)
+                            if rule.pattern or any(offset))
+        self.neighborhood: tuple[tuple[int, ...], ...] = tuple(tuple(offset) for offset in neighborhood)
+        if any(len(offset) != self.dimensions or max(map(abs, offset)) > 1 for offset in self.neighborhood):
+            raise ValueError('neighbors must be adjacent cells with one coordinate per dimension')
+
+        # Counting rules index the table with state + num_states * (count0 + (neighbors + 1) * (count1 + ...))
+        self.__radix: int = len(self.neighborhood) + 1
+        if rule.pattern:
+            self.__table: bytes = bytes(rule.next_state(0, (pattern,)) for pattern in range(1 << len(self.neighborhood)))
+        else:
+            self.__table = bytes(rule.next_state(*self.__decode(index))
+                                 for index in range(rule.num_states * self.__radix ** len(rule.counted)))
+
+        self.__lane_bytes: int = 1 if len(self.__table) <= 0x100 else 2
+        if len(self.__table) > 0x10000:
+            raise ValueError('too many neighbor combinations for a lookup table')
+        self.__translation: bytes = self.__table.ljust(0x100, b'\0') if self.__lane_bytes == 1 else b''
+        self.__table_array = numpy.frombuffer(self.__table, dtype=numpy.uint8) if self.numpy else None
+
+    @classmethod
+    def from_lines(cls,
+                   lines: collections.abc.Iterable[str],
+                   states: str,
+                   rule: Rule,
+                   *,
+                   dimensions: int = 2,
+                   **kwargs) -> typing.Self:
+        """ states[i] is the tile for state i, shorter lines are padded with state 0. Extra dimensions have size 1 """
+        lines = list(lines)
+        width: int = max((len(line) for line in lines), default=0)
+        encoding: dict[str, int] = {tile: state for state, tile in enumerate(states)}
+        try:
+            cells: bytes = bytes(encoding[tile] for line in lines for tile in line.ljust(width, states[0]))
+        except KeyError as e:
+            raise ValueError(f'unknown tile {e}') from None
+        return cls(cells, (width, len(lines)) + (1,) * (dimensions - 2), rule, **kwargs)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({"x".join(map(str, self.shape))}, origin={self.origin})'
+
+    @property
+    def cells(self) -> bytes:
+        """ Snapshot of the grid, hashable for cycle detection """
+        return self.__cells
+
+    @cells.setter
+    def cells(self, cells: collections.abc.Iterable[int]) -> None:
+        cells = bytes(cells)
+        if len(cells) != len(self.__cells):
+            raise ValueError(f'{len(cells)} cells do not fill shape {self.shape}')
+        self.__cells = cells
+
+    def __getitem__(self, pt: collections.abc.Sequence[int]) -> int:
+        index: int = 0
+        stride: int = 1
+        for p, o, n in zip(pt, self.origin, self.shape):
+            p -= o
+            if self.boundary == Boundary.WRAP:
+                p %= n
+            elif not 0 <= p < n:
+                return self.background
+            index += p * stride
+            stride *= n
+        return self.__cells[index]
+
+    def count(self, state: int = 1) -> int:
+        """ Cells of the grid in state, the background beyond an infinite grid not included """
+        return self.__cells.count(state)
+
+    def step(self) -> bool:
+        """ False if nothing changed """
+        old: bytes = self.__cells
+        growth: int = 1 if self.boundary == Boundary.INFINITE else 0
+        if growth:
+            old = self.__pad(old, self.shape, growth)
+
+        cells: bytes = self.__step_numpy(growth) if self.numpy else self.__step_lanes(growth)
+        self.__cells = cells
+        self.shape = tuple(n + 2 * growth for n in self.shape)
+        self.origin = tuple(o - growth for o in self.origin)
+
+        background: int = self.background
+        if growth:
+            self.background = self.__next_background()
+        return cells != old or self.background != background
+
+    def run(self, steps: int) -> None:
+        for _ in range(steps):
+            self.step()
+
+    def run_until_stable(self) -> int:
+        """ Number of steps that changed something """
+        steps: int = 0
+        while self.step():
+            steps += 1
+        return steps
+
+    def __decode(self, index: int) -> tuple[int, tuple[int, ...]]:
+        """ (state, counts) for a table index """
+        index, state = divmod(index, self.rule.num_states)
+        counts: list[int] = []
+        for _ in self.rule.counted:
+            index, count = divmod(index, self.__radix)
+            counts.append(count)
+        return state, tuple(counts)
+
+    def __next_background(self) -> int:
+        """ A cell surrounded by background """
+        if self.rule.pattern:
+            pattern: int = (1 << len(self.neighborhood)) - 1 if self.background == 1 else 0
+            return self.__table[pattern]
+        counts: tuple[int, ...] = tuple(len(self.neighborhood) if self.background == state else 0
+                                        for state in self.rule.counted)
+        return self.rule.next_state(self.background, counts)
+
+    @staticmethod
+    def __size(shape: collections.abc.Iterable[int]) -> int:
+        size: int = 1
+        for n in shape:
+            size *= n
+        return size
+
+    def __pad(self, cells: bytes, shape: collections.abc.Sequence[int], width: int) -> bytes:
+        """ Surround the grid with width cells of background, or of the opposite face when wrapping """
+        block: int = 1
+        for n in shape:
+            edge: int = block * width
+            side: bytes = bytes([self.background]) * edge
+            pieces: list[bytes] = []
+            chunk: int = block * n
+            for start in range(0, len(cells), chunk):
+                piece: bytes = cells[start:start + chunk]
+                if self.boundary == Boundary.WRAP:
+                    pieces += (piece[chunk - edge:], piece, piece[:edge])
+                else:
+                    pieces += (side, piece, side)
+            cells = b''.join(pieces)
+            block *= n + 2 * width
+        return cells
+
+    @staticmethod
+    def __strip(cells: bytes, shape: collections.abc.Sequence[int]) -> bytes:
+        """ Remove the outermost layer of cells """
+        block: int = 1
+        for n in shape:
+            chunk: int = block * n
+            cells = b''.join(cells[start + block:start + chunk - block] for start in range(0, len(cells), chunk))
+            block *= n - 2
+        return cells
+
+    def __step_lanes(self, growth: int) -> bytes:
+        shape: tuple[int, ...] = tuple(n + 2 * growth + 2 for n in self.shape)
+        padded: bytes = self.__pad(self.__cells, self.shape, growth + 1)
+        lane_bits: int = 8 * self.__lane_bytes
+        full: int = (1 << lane_bits * len(padded)) - 1
+
+        strides: list[int] = []
+        stride: int = lane_bits
+        for n in shape:
+            strides.append(stride)
+            stride *= n
+
+        def lanes(data: bytes) -> int:
+            if self.__lane_bytes > 1:
+                widened: bytearray = bytearray(len(data) * self.__lane_bytes)
+                widened[::self.__lane_bytes] = data
+                data = widened
+            return int.from_bytes(data, 'little')
+
+        def shifted(value: int, offset: tuple[int, ...]) -> int:
+            """ Each lane gets the value of the lane offset away """
+            distance: int = sum(o * s for o, s in zip(offset, strides))
+            return value >> distance if distance >= 0 else value << -distance & full
+
+        # Lanes never carry into each other, every sum fits a lane
+        if self.rule.pattern:
+            plane: int = lanes(padded.translate(self.__indicator(1)))
+            index: int = 0
+            for bit, offset in enumerate(reversed(self.neighborhood)):
+                index += shifted(plane, offset) << bit
+        else:
+            index = lanes(padded)
+            radix: int = self.rule.num_states
+            for state in self.rule.counted:
+                plane = lanes(padded.translate(self.__indicator(state)))
+                if self.__box:
+                    count: int = plane
+                    for stride in strides:
+                        count = (count + (count >> stride) + (count << stride)) & full
+                    count -= plane
+                else:
+                    count = sum(shifted(plane, offset) for offset in self.neighborhood)
+                index += radix * count
+                radix *= self.__radix
+
+        raw: bytes = index.to_bytes(len(padded) * self.__lane_bytes, 'little')
+        if self.__lane_bytes == 1:
+            cells: bytes = raw.translate(self.__translation)
+        else:
+            indices: array.array = array.array('H', raw)
+            if sys.byteorder == 'big':
+                indices.byteswap()
+            cells = bytes(map(self.__table.__getitem__, indices))
+        return self.__strip(cells, shape)
+
+    @staticmethod
+    def __indicator(state: int) -> bytes:
+        """ Translation table marking cells in state with 1 """
+        return bytes(256)[:state] + b'\1' + bytes(255 - state)
+
+    def __step_numpy(self, growth: int) -> bytes:
+        grid = numpy.frombuffer(self.__cells, dtype=numpy.uint8).reshape(self.shape[::-1])
+        if self.boundary == Boundary.WRAP:
+            grid = numpy.pad(grid, growth + 1, mode='wrap')
+        else:
+            grid = numpy.pad(grid, growth + 1, constant_values=self.background)
+
+        def shifted(plane, offset: tuple[int, ...]):
+            """ Interior of plane moved by offset, NumPy axes being in reverse order """
+            return plane[tuple(slice(1 + o, n - 1 + o) for o, n in zip(reversed(offset), plane.shape))]
+
+        if self.rule.pattern:
+            plane = (grid == 1).astype(numpy.int64)
+            index = numpy.zeros(tuple(n - 2 for n in grid.shape), dtype=numpy.int64)
+            for offset in self.neighborhood:
+                index = index << 1 | shifted(plane, offset)
+        else:
+            index = shifted(grid, (0,) * self.dimensions).astype(numpy.int64)
+            radix: int = self.rule.num_states
+            for state in self.rule.counted:
+                plane = (grid == state).astype(numpy.int64)
+                if self.__box:
+                    count = plane
+                    for axis in range(count.ndim):
+                        n: int = count.shape[axis]
+                        count = sum(count.take(range(i, n - 2 + i), axis=axis) for i in range(3))
+                    count -= shifted(plane, (0,) * self.dimensions)
+                else:
+                    count = sum(shifted(plane, offset) for offset in self.neighborhood)
+                index += radix * count
+                radix *= self.__radix
+
+        return self.__table_array[index].tobytes()
@@ -0,0 +1,275 @@
+import argparse
+import contextlib
+import csv
+import dataclasses
+import gc
+import importlib.util
+import json
+import pathlib
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+import collections.abc
+
+ROOT: pathlib.Path = pathlib.Path(__file__).parent
+FIELDS: tuple[str, ...] = ('year', 'day', 'part', 'answer', 'runs',
+                           'parse_min_ms', 'parse_median_ms', 'solve_min_ms', 'solve_median_ms', 'peak_kib', 'error')
+
+
+@dataclasses.dataclass(frozen=True, order=True)
+class Puzzle:
+    year: int
+    day: int
+    path: pathlib.Path = dataclasses.field(compare=False)
+
+    def __str__(self) -> str:
+        return f'{self.year} Day {self.day}'
+
+    @property
+    def directory(self) -> pathlib.Path:
+        return self.path.parent
+
+    @property
+    def input_file(self) -> pathlib.Path:
+        return self.directory / 'input.txt'
+
+
+@dataclasses.dataclass
+class Result:
+    year: int
+    day: int
+    part: int
+    answer: str = ''
+    runs: int = 0
+    parse_min_ms: float = 0.0
+    parse_median_ms: float = 0.0
+    solve_min_ms: float = 0.0
+    solve_median_ms: float = 0.0
+    peak_kib: float = 0.0
+    error: str = ''
+
+    def key(self) -> tuple[int, int, int]:
+        return self.year, self.day, self.part
+
+
+def discover(root: pathlib.Path = ROOT) -> list[Puzzle]:
+    """ Every AoC*/Day N/Day N.py under root """
+    puzzles: list[Puzzle] = []
+    for path in root.glob('AoC*/Day */Day *.py'):
+        year_match: re.Match | None = re.fullmatch(r'AoC(\d+)', path.parent.parent.name)
+        day_match: re.Match | None = re.fullmatch(r'Day (\d+)', path.parent.name)
+        if year_match and day_match and path.stem == path.parent.name:
+            puzzles.append(Puzzle(int(year_match[1]), int(day_match[1]), path))
+    return sorted(puzzles)
+
+
+def select(puzzles: collections.abc.Iterable[Puzzle], patterns: collections.abc.Sequence[str]) -> list[Puzzle]:
+    """ Patterns are YEAR or YEAR/DAY, e.g. 2024 or 2019/15 """
+    if not patterns:
+        return list(puzzles)
+
+    selected: list[Puzzle] = []
+    for puzzle in puzzles:
+        for pattern in patterns:
+            year, _, day = pattern.partition('/')
+            if int(year) == puzzle.year and (not day or int(day) == puzzle.day):
+                selected.append(puzzle)
+                break
+    return selected
+
+
+@contextlib.contextmanager
+def puzzle_environment(puzzle: Puzzle) -> collections.abc.Iterator[None]:
+    # 2019 solutions import intcode through sys.path.append('..'), so run from inside the day directory
+    saved_path: list[str] = sys.path.copy()
+    sys.path[:0] = [str(ROOT), str(puzzle.directory.parent), str(puzzle.directory)]
+    try:
+        with contextlib.chdir(puzzle.directory):
+            yield
+    finally:
+        sys.path[:] = saved_path
+
+
+def load_solution(puzzle: Puzzle) -> types.ModuleType:
+    """ Import without running __main__, works for both the template and the older solve() convention """
+    name: str = f'aoc{puzzle.year}_day{puzzle.day}'
+    spec = importlib.util.spec_from_file_location(name, puzzle.path)
+    module: types.ModuleType = importlib.util.module_from_spec(spec)
+    with puzzle_environment(puzzle):
+        spec.loader.exec_module(module)
+    return module
+
+
+def read_input(module: types.ModuleType, puzzle: Puzzle) -> str:
+    if hasattr(module, 'get_puzzle_input'):
+        return module.get_puzzle_input(puzzle.input_file)
+    return puzzle.input_file.read_text().strip()
+
+
+def time_part(module: types.ModuleType, part: int, puzzle_input: str) -> tuple[object, int, int]:
+    """ return: (answer, parse time ns, solve time ns) """
+    solver: collections.abc.Callable = module.part1 if part == 1 else module.part2
+
+    start: int = time.perf_counter_ns()
+    data = module.parse(puzzle_input)
+    parsed: int = time.perf_counter_ns()
+    answer = solver(data)
+    finished: int = time.perf_counter_ns()
+
+    return answer, parsed - start, finished - parsed
+
+
+def peak_memory(module: types.ModuleType, part: int, puzzle_input: str) -> int:
+    """ Peak bytes allocated by parse + solve, measured separately since tracing slows everything down """
+    solver: collections.abc.Callable = module.part1 if part == 1 else module.part2
+
+    tracemalloc.start()
+    try:
+        solver(module.parse(puzzle_input))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(puzzle: Puzzle, part: int, *, runs: int = 5, warmup: int = 1, memory: bool = True) -> Result:
+    result: Result = Result(puzzle.year, puzzle.day, part)
+    if not puzzle.input_file.exists():
+        result.error = 'no input'
+        return result
+
+    try:
+        module: types.ModuleType = load_solution(puzzle)
+        if part == 2 and not hasattr(module, 'part2'):
+            result.error = 'no part 2'
+            return result
+
+        with puzzle_environment(puzzle):
+            puzzle_input: str = read_input(module, puzzle)
+
+            for _ in range(warmup):
+                time_part(module, part, puzzle_input)
+
+            parse_times: list[int] = []
+            solve_times: list[int] = []
+            for _ in range(runs):
+                gc.collect()
+                answer, parse_ns, solve_ns = time_part(module, part, puzzle_input)
+                parse_times.append(parse_ns)
+                solve_times.append(solve_ns)
+                result.answer = str(answer)
+
+            if memory:
+                result.peak_kib = round(peak_memory(module, part, puzzle_input) / 1024, 1)
+    except Exception as e:
+        result.error = f'{e.__class__.__name__}: {e}'
+        return result
+
+    result.runs = runs
+    result.parse_min_ms = round(min(parse_times) / 1e6, 3)
+    result.parse_median_ms = round(statistics.median(parse_times) / 1e6, 3)
+    result.solve_min_ms = round(min(solve_times) / 1e6, 3)
+    result.solve_median_ms = round(statistics.median(solve_times) / 1e6, 3)
+    return result
+
+
+def save_results(results: collections.abc.Sequence[Result], file: pathlib.Path) -> None:
+    rows: list[dict] = [dataclasses.asdict(r) for r in results]
+    if file.suffix == '.csv':
+        with file.open('w', newline='') as f:
+            writer: csv.DictWriter = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        file.write_text(json.dumps(rows, indent=2))
+
+
+def load_results(file: pathlib.Path) -> list[Result]:
+    if file.suffix == '.csv':
+        with file.open(newline='') as f:
+            rows: list[dict] = list(csv.DictReader(f))
+    else:
+        rows = json.loads(file.read_text())
+
+    results: list[Result] = []
+    for row in rows:
+        converted: dict = {}
+        for field in dataclasses.fields(Result):
+            converted[field.name] = field.type(row[field.name]) if field.name in row else field.default
+        results.append(Result(**converted))
+    return results
+
+
+def regressions(results: collections.abc.Iterable[Result],
+                baseline: collections.abc.Iterable[Result],
+                *,
+                threshold: float = 0.1,
+                min_ms: float = 1.0) -> list[tuple[Result, Result]]:
+    """ (current, baseline) pairs that now fail, changed answer or slowed down by more than threshold """
+    previous: dict[tuple[int, int, int], Result] = {r.key(): r for r in baseline if not r.error}
+
+    flagged: list[tuple[Result, Result]] = []
+    for result in results:
+        old: Result | None = previous.get(result.key())
+        if old is None:
+            continue
+        if result.error:
+            flagged.append((result, old))
+            continue
+        slower: bool = result.solve_median_ms > max(old.solve_median_ms * (1 + threshold), min_ms)
+        if slower or result.answer != old.answer:
+            flagged.append((result, old))
+    return flagged
+
+
+def report(result: Result) -> str:
+    prefix: str = f'{result.year} Day {result.day:>2} part {result.part}: '
+    if result.error:
+        return prefix + result.error
+    peak: str = f', peak {result.peak_kib} KiB' if result.peak_kib else ''
+    return prefix + f'parse {result.parse_median_ms} ms, solve {result.solve_median_ms} ms ' \
+                    f'(min {result.solve_min_ms} ms){peak}'
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Benchmark Advent of Code solutions')
+    parser.add_argument('puzzles', nargs='*', help='YEAR or YEAR/DAY, default is every puzzle')
+    parser.add_argument('-n', '--runs', type=int, default=5)
+    parser.add_argument('-w', '--warmup', type=int, default=1)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc peak memory run')
+    parser.add_argument('-o', '--output', type=pathlib.Path, help='save results to .json or .csv')
+    parser.add_argument('-b', '--baseline', type=pathlib.Path, help='flag regressions against saved results')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1, help='allowed slowdown, default 10%%')
+    args: argparse.Namespace = parser.parse_args()
+
+    results: list[Result] = []
+    for puzzle in select(discover(), args.puzzles):
+        for part in (1, 2):
+            result: Result = benchmark(puzzle, part, runs=args.runs, warmup=args.warmup, memory=not args.no_memory)
+            results.append(result)
+            print(report(result), flush=True)
+
+    if args.output:
+        save_results(results, args.output)
+
+    if args.baseline:
+        flagged: list[tuple[Result, Result]] = regressions(results, load_results(args.baseline),
+                                                           threshold=args.threshold)
+        print()
+        print(f'{len(flagged)} regression(s) against {args.baseline}')
+        for current, old in flagged:
+            if current.error:
+                change: str = current.error
+            elif current.answer != old.answer:
+                change = 'answer changed'
+            else:
+                change = f'{old.solve_median_ms} ms -> {current.solve_median_ms} ms'
+            print(f'    {current.year} Day {current.day} part {current.part}: {change}')
+        if flagged:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
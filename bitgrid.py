@@ -0,0 +1,134 @@
+import collections.abc
+import typing
+
+from xypair import XYpair, XYtuple
+
+
+class BitGrid:
+    """
+    Boolean grid with one int per row, bit x of rows[y] set when (x, y) is occupied. Whole rows shift, mask and
+    combine in single int operations, and a shape is a sequence of row masks tested against the rows it covers.
+    """
+    def __init__(self, width: int, rows: collections.abc.Iterable[int] = ()) -> None:
+        self.width: int = width
+        self.full: int = (1 << width) - 1
+        self.rows: list[int] = list(rows)
+
+    @classmethod
+    def from_lines(cls, lines: collections.abc.Iterable[str], occupied: str = '#') -> typing.Self:
+        lines = list(lines)
+        return cls(max((len(line) for line in lines), default=0),
+                   (sum(1 << x for x, tile in enumerate(line) if tile in occupied) for line in lines))
+
+    def __str__(self) -> str:
+        return '\n'.join(''.join('#' if row >> x & 1 else '.' for x in range(self.width)) for row in self.rows)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.width}x{self.height}, {len(self)} occupied)'
+
+    def __len__(self) -> int:
+        return sum(row.bit_count() for row in self.rows)
+
+    def __contains__(self, pt: XYtuple) -> bool:
+        x, y = pt
+        return 0 <= x and bool(self.row(y) >> x & 1)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BitGrid):
+            return NotImplemented
+        return self.width == other.width and self.rows == other.rows
+
+    @property
+    def height(self) -> int:
+        return len(self.rows)
+
+    def copy(self) -> typing.Self:
+        return self.__class__(self.width, self.rows)
+
+    def add(self, pt: XYtuple) -> None:
+        x, y = pt
+        if y >= len(self.rows):
+            self.rows.extend([0] * (y + 1 - len(self.rows)))
+        self.rows[y] |= 1 << x
+
+    def discard(self, pt: XYtuple) -> None:
+        x, y = pt
+        if 0 <= y < len(self.rows):
+            self.rows[y] &= ~(1 << x)
+
+    def points(self) -> collections.abc.Iterator[XYpair]:
+        for y, row in enumerate(self.rows):
+            while row:
+                low: int = row & -row
+                yield XYpair(low.bit_length() - 1, y)
+                row ^= low
+
+    def bounds(self) -> tuple[XYpair, XYpair] | None:
+        """ Top left and bottom right corners of the occupied cells, None if there are none """
+        occupied: list[int] = [y for y, row in enumerate(self.rows) if row]
+        if not occupied:
+            return None
+        columns: int = 0
+        for row in self.rows:
+            columns |= row
+        return XYpair((columns & -columns).bit_length() - 1, occupied[0]), \
+            XYpair(columns.bit_length() - 1, occupied[-1])
+
+    def top(self, num_rows: int) -> tuple[int, ...]:
+        """ The last num_rows rows, hashable for cycle detection on a growing stack """
+        return tuple(self.rows[-num_rows:])
+
+    def packed(self) -> int:
+        """ The whole grid as one int, row y at bit y * width """
+        packed: int = 0
+        for row in reversed(self.rows):
+            packed = packed << self.width | row
+        return packed
+
+    def pad(self, margin: int = 1) -> None:
+        """ Add margin empty cells on every side, occupied cells move by (margin, margin) """
+        self.rows = [0] * margin + [row << margin for row in self.rows] + [0] * margin
+        self.width += 2 * margin
+        self.full = (1 << self.width) - 1
+
+    def row(self, y: int) -> int:
+        """ Rows outside the grid are empty """
+        return self.rows[y] if 0 <= y < len(self.rows) else 0
+
+    def horizontal(self, y: int) -> int:
+        """ Cells of row y with an occupied cell among themselves and their left and right neighbors """
+        row: int = self.row(y)
+        return (row | row << 1 | row >> 1) & self.full
+
+    def vertical(self, y: int) -> int:
+        """ Cells of row y with an occupied cell among themselves and the cells above and below """
+        return self.row(y - 1) | self.row(y) | self.row(y + 1)
+
+    def neighborhood(self, y: int) -> int:
+        """ Cells of row y with an occupied cell anywhere in the 3 x 3 square around them, themselves included """
+        column: int = self.vertical(y)
+        return (column | column << 1 | column >> 1) & self.full
+
+    def roll(self, row: int, dx: int) -> int:
+        """ row moved dx cells to the right, wrapping around """
+        dx %= self.width
+        return (row << dx | row >> (self.width - dx)) & self.full
+
+    def shifted(self, shape: collections.abc.Sequence[int], dx: int) -> tuple[int, ...] | None:
+        """ shape moved dx cells to the right, None if a cell would leave the grid """
+        if dx >= 0:
+            moved: tuple[int, ...] = tuple(row << dx for row in shape)
+            return None if any(row & ~self.full for row in moved) else moved
+        return None if any(row & ((1 << -dx) - 1) for row in shape) else tuple(row >> -dx for row in shape)
+
+    def collides(self, shape: collections.abc.Sequence[int], y: int) -> bool:
+        """ shape[i] overlaps row y + i """
+        rows: list[int] = self.rows
+        return any(mask & rows[y + i] for i, mask in enumerate(shape) if 0 <= y + i < len(rows))
+
+    def place(self, shape: collections.abc.Sequence[int], y: int) -> None:
+        """ Occupy shape[i] in row y + i, adding rows as needed """
+        if y + len(shape) > len(self.rows):
+            self.rows.extend([0] * (y + len(shape) - len(self.rows)))
+        for i, mask in enumerate(shape):
+            self.rows[y + i] |= mask
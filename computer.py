@@ -1,5 +1,6 @@
 import abc
 import collections
+import enum
 import typing
 
 
@@ -17,6 +18,22 @@ class SpecialRegister:
         computer.register[self.key] = value
 
 
+@enum.unique
+class Profiling(enum.IntEnum):
+    OFF = 0  # final state only
+    COUNTERS = 1  # clock/instruction cycles and per-opcode counts
+    TRACE = 2  # counters plus addresses executed, per-address histogram and backward jumps
+
+
+class CompiledInstruction(typing.NamedTuple):
+    opcode: str | int
+    # Executes the instruction and returns the next IP, or None to hand the instruction back to step()
+    function: collections.abc.Callable[[], int | None]
+
+
+_INTERPRET: CompiledInstruction = CompiledInstruction('', lambda: None)
+
+
 class AbstractComputer(abc.ABC):
     # Set a specific register as the program counter
     ip: SpecialRegister = SpecialRegister()
@@ -33,7 +50,13 @@ class AbstractComputer(abc.ABC):
     # Configure number of clock cycles per instruction
     DEFAULT_CYCLES_PER_INSTRUCTION: int = 1
     CYCLES_PER_INSTRUCTION: dict[str | int, int] = {}
-    
+
+    # Run compiled instructions from compile_instruction() instead of fetch/decode/execute
+    COMPILE: bool = False
+
+    # Statistics collected while running
+    PROFILING: Profiling = Profiling.COUNTERS
+
     def __init__(self) -> None:
         self.register: dict[str | int, int] = collections.defaultdict(int)
         self._memory: dict[int, str | int] = {}
@@ -50,7 +73,13 @@ class AbstractComputer(abc.ABC):
         self.inputs_processed: int = 0
         self.outputs_generated: int = 0
         self.addresses_executed: set[int] = set()
-        
+        self.address_histogram: collections.Counter[int] = collections.Counter()
+        self.backward_jumps: collections.Counter[tuple[int, int]] = collections.Counter()
+
+        # Compiled program, None marks an address that still needs compiling
+        self._compiled: list[CompiledInstruction | None] = []
+        self._compiled_executions: list[int] = []
+
         # Initialize
         self.reset()
         self.clear_memory()
@@ -68,18 +97,28 @@ class AbstractComputer(abc.ABC):
         self.instruction_cycles = 0
         self.instruction_count = collections.defaultdict(int)
         self.addresses_executed = set()
+        self.address_histogram = collections.Counter()
+        self.backward_jumps = collections.Counter()
 
     def clear_registers(self) -> None:
-        self.register = collections.defaultdict(int)
+        # Cleared in place since compiled instructions hold a reference to the register file
+        self.register.clear()
     
     def read_memory(self, address: int) -> str | int:
         return self._memory[address]
     
     def write_memory(self, address: int, value: str | int) -> None:
         self._memory[address] = value
+
+        # Self-modifying code: recompile this address the next time it executes
+        if 0 <= address < len(self._compiled):
+            self.flush_compiled_statistics(address)
+            self._compiled[address] = None
     
     def clear_memory(self) -> None:
         self._memory = {}
+        self._compiled = []
+        self._compiled_executions = []
     
     def load_memory(self, memory_image: collections.abc.Iterable[str | int]) -> None:
         for address, data in enumerate(memory_image):
@@ -130,8 +169,116 @@ class AbstractComputer(abc.ABC):
         peer.send_to(self)
 
     def run(self) -> None:
+        if self.COMPILE:
+            self.run_compiled()
+            return
+
         while self.step() == self.CONTINUE:
             ...
+
+    def compile_instruction(self, address: int) -> CompiledInstruction | None:
+        """ Overwrite to translate the instruction at address into a closure with its operands pre-bound.
+            Return None to always interpret that instruction with step().
+        """
+        return None
+
+    def compile(self) -> None:
+        """ Reset the per-address compiled cache for the loaded image, addresses are compiled lazily on first run """
+        self._compiled = [None] * self.allocated_memory()
+        self._compiled_executions = [0] * self.allocated_memory()
+
+    def run_compiled(self) -> None:
+        if len(self._compiled) != self.allocated_memory():
+            self.compile()
+
+        code: list[CompiledInstruction | None] = self._compiled
+        executions: list[int] = self._compiled_executions
+        counting: bool = self.PROFILING >= Profiling.COUNTERS
+        tracing: bool = self.PROFILING >= Profiling.TRACE
+        ip: int = self.ip
+        try:
+            while True:
+                instruction: CompiledInstruction = _INTERPRET
+                if 0 <= ip < len(code):
+                    instruction = code[ip]
+                    if instruction is None:
+                        instruction = code[ip] = self.compile_instruction(ip) or _INTERPRET
+
+                next_ip: int | None = instruction.function()
+                if next_ip is None:
+                    # Let the interpreter handle it (not compiled, waiting for input, outside program, etc.)
+                    self.ip = ip
+                    result: bool = self.step()
+                    ip = self.ip
+                    if result == self.BREAK:
+                        return
+                    continue
+
+                if counting:
+                    executions[ip] += 1
+                    if tracing and next_ip <= ip:
+                        self.backward_jumps[ip, next_ip] += 1
+                ip = next_ip
+        finally:
+            self.ip = ip
+            self.flush_compiled_statistics()
+
+    def flush_compiled_statistics(self, address: int | None = None) -> None:
+        """ Compiled instructions only count executions per address, fold them into the statistics. """
+        addresses: collections.abc.Iterable[int] = range(len(self._compiled_executions)) if address is None \
+            else (address,)
+        for a in addresses:
+            count: int = self._compiled_executions[a]
+            if not count:
+                continue
+
+            opcode: str | int = self._compiled[a].opcode
+            self.clock_cycles += count * self.CYCLES_PER_INSTRUCTION.get(opcode, self.DEFAULT_CYCLES_PER_INSTRUCTION)
+            self.instruction_cycles += count
+            self.instruction_count[opcode] += count
+            if self.PROFILING >= Profiling.TRACE:
+                self.addresses_executed.add(a)
+                self.address_histogram[a] += count
+            self._compiled_executions[a] = 0
+
+    def hot_loops(self) -> list[tuple[int, int, int]]:
+        """ (first address, last address, iterations) of each loop closed by a backward jump, hottest first.
+            Only available with Profiling.TRACE.
+        """
+        return [(target, source, count) for (source, target), count in self.backward_jumps.most_common()]
+
+    def profile_report(self, top: int = 10) -> str:
+        lines: list[str] = [f'profiling: {self.PROFILING.name}',
+                            f'instructions: {self.instruction_cycles}',
+                            f'clock cycles: {self.clock_cycles}']
+
+        if self.instruction_count:
+            lines.append('opcodes:')
+            for opcode, count in sorted(self.instruction_count.items(), key=lambda item: -item[1]):
+                lines.append(f'    {opcode}: {count}')
+
+        if self.address_histogram:
+            lines.append('hottest addresses:')
+            for address, count in self.address_histogram.most_common(top):
+                instruction: str | int = self._memory.get(address, '')
+                lines.append(f'    {address}: {count}    {instruction}')
+
+        if self.backward_jumps:
+            lines.append('hot loops:')
+            for first, last, iterations in self.hot_loops()[:top]:
+                executed: int = sum(self.address_histogram[a] for a in range(first, last + 1))
+                lines.append(f'    {first}-{last}: {iterations} iterations, {executed} instructions')
+
+        return '\n'.join(lines)
+
+    def operand_reader(self, operand: str, base: int = 10) -> collections.abc.Callable[[], int]:
+        """ Compile-time version of register_or_immediate_operand_value() """
+        try:
+            value: int = self.immediate_value(operand, base)
+            return lambda: value
+        except ValueError:
+            register: dict[str | int, int] = self.register
+            return lambda: register[operand]
     
     def step(self) -> bool:
         """ Execute a single instruction.
@@ -147,8 +294,11 @@ class AbstractComputer(abc.ABC):
             self.ip = self.current_instruction_address()
             return self.BREAK
 
-        # Add before execute in case a jump modifies IP
-        self.addresses_executed.add(self.current_instruction_address())
+        if not self.PROFILING:
+            return self.BREAK if self.execute() == self.HALT else self.CONTINUE
+
+        # Save before execute in case a jump modifies IP
+        address: int = self.current_instruction_address()
 
         result: int = self.execute()
 
@@ -156,6 +306,11 @@ class AbstractComputer(abc.ABC):
         self.clock_cycles += self.current_instruction_clock_cycles()
         self.instruction_cycles += 1
         self.instruction_count[self.opcode] += 1
+        if self.PROFILING >= Profiling.TRACE:
+            self.addresses_executed.add(address)
+            self.address_histogram[address] += 1
+            if self.ip <= address:
+                self.backward_jumps[address, self.ip] += 1
 
         return self.BREAK if result == self.HALT else self.CONTINUE
 
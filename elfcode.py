@@ -0,0 +1,409 @@
+import typing
+import collections.abc
+
+
+class Instruction(typing.NamedTuple):
+    opcode: str
+    a: int
+    b: int
+    c: int
+
+
+# Right hand side of each opcode, {A}/{B} are register operands and {a}/{b} immediate ones
+EXPRESSIONS: dict[str, str] = {'addr': '{A} + {B}',
+                               'addi': '{A} + {b}',
+                               'mulr': '{A} * {B}',
+                               'muli': '{A} * {b}',
+                               'banr': '{A} & {B}',
+                               'bani': '{A} & {b}',
+                               'borr': '{A} | {B}',
+                               'bori': '{A} | {b}',
+                               'setr': '{A}',
+                               'seti': '{a}',
+                               'gtir': '{a} > {B}',
+                               'gtri': '{A} > {b}',
+                               'gtrr': '{A} > {B}',
+                               'eqir': '{a} == {B}',
+                               'eqri': '{A} == {b}',
+                               'eqrr': '{A} == {B}'}
+
+OPCODES: tuple[str, ...] = tuple(EXPRESSIONS)
+COMMUTATIVE: frozenset[str] = frozenset({'addr', 'mulr', 'banr', 'borr', 'eqrr'})
+
+
+def _source(opcode: str, a: str, b: str) -> str:
+    """ Python expression for opcode with operands already rendered, comparisons give 1 or 0 like Elfcode """
+    expression: str = EXPRESSIONS[opcode].format(A=a, B=b, a=a, b=b)
+    return f'(1 if {expression} else 0)' if opcode.startswith(('gt', 'eq')) else expression
+
+
+def _operation(opcode: str) -> collections.abc.Callable[[collections.abc.Sequence[int], int, int], int]:
+    expression: str = EXPRESSIONS[opcode]
+    a: str = 'r[a]' if '{A}' in expression else 'a'
+    b: str = 'r[b]' if '{B}' in expression else 'b'
+    return eval(f'lambda r, a, b: {_source(opcode, a, b)}')
+
+
+# Single instruction semantics, (registers, a, b) -> new value for register c
+OPERATIONS: dict[str, collections.abc.Callable[[collections.abc.Sequence[int], int, int], int]] = \
+    {opcode: _operation(opcode) for opcode in EXPRESSIONS}
+
+
+def parse_program(program_str: str) -> tuple[int | None, list[Instruction]]:
+    """ (IP register from the #ip declaration if there is one, instructions) """
+    ip_register: int | None = None
+    program: list[Instruction] = []
+    for line in program_str.split('\n'):
+        if line.startswith('#ip'):
+            ip_register = int(line.split()[1])
+        elif line.strip():
+            opcode, a, b, c = line.split()
+            program.append(Instruction(opcode, int(a), int(b), int(c)))
+    return ip_register, program
+
+
+# Idiom: (opcode, a, b, c) per instruction. Lowercase names bind registers, uppercase ones immediates, 'ip' is
+# the IP register, ints must match exactly and '@n' is the address start + n. '_' matches anything.
+# Operands of commutative opcodes may come in either order.
+_Pattern: typing.TypeAlias = tuple[tuple[str, str | int, str | int, str | int], ...]
+
+# for i in 1..n: for j in 1..n: if i * j == n: total += i
+DIVISOR_SUM: _Pattern = (('seti', 1, '_', 'i'),
+                         ('seti', 1, '_', 'j'),
+                         ('mulr', 'i', 'j', 't'),
+                         ('eqrr', 't', 'n', 't'),
+                         ('addr', 't', 'ip', 'ip'),
+                         ('addi', 'ip', 1, 'ip'),
+                         ('addr', 'i', 'total', 'total'),
+                         ('addi', 'j', 1, 'j'),
+                         ('gtrr', 'j', 'n', 't'),
+                         ('addr', 'ip', 't', 'ip'),
+                         ('seti', '@1', '_', 'ip'),
+                         ('addi', 'i', 1, 'i'),
+                         ('gtrr', 'i', 'n', 't'),
+                         ('addr', 't', 'ip', 'ip'),
+                         ('seti', '@0', '_', 'ip'))
+
+# q = 0, while (q + 1) * K <= x: q += 1
+DIVISION: _Pattern = (('seti', 0, '_', 'q'),
+                      ('addi', 'q', 1, 't'),
+                      ('muli', 't', 'K', 't'),
+                      ('gtrr', 't', 'x', 't'),
+                      ('addr', 't', 'ip', 'ip'),
+                      ('addi', 'ip', 1, 'ip'),
+                      ('seti', '@8', '_', 'ip'),
+                      ('addi', 'q', 1, 'q'),
+                      ('seti', '@0', '_', 'ip'))
+
+
+def _divisor_sum(n: int) -> int:
+    total: int = 0
+    i: int = 1
+    while i * i <= n:
+        if n % i == 0:
+            total += i if i * i == n else i + n // i
+        i += 1
+    return total
+
+
+def _divisor_sum_idiom(names: dict[str, int], start: int) -> collections.abc.Callable[[list[int]], int | None]:
+    i, j, t, n, total = names['i'], names['j'], names['t'], names['n'], names['total']
+
+    def run(r: list[int]) -> int | None:
+        if r[n] < 1:
+            return None
+        r[total] += _divisor_sum(r[n])
+        r[i] = r[j] = r[n] + 1
+        r[t] = 1
+        return start + len(DIVISOR_SUM)
+    return run
+
+
+def _division_idiom(names: dict[str, int], start: int) -> collections.abc.Callable[[list[int]], int | None]:
+    q, t, k, x = names['q'], names['t'], names['K'], names['x']
+
+    def run(r: list[int]) -> int | None:
+        if k < 1 or r[x] < 0:
+            return None
+        r[q] = r[x] // k
+        r[t] = 1
+        return start + len(DIVISION)
+    return run
+
+
+IDIOMS: tuple[tuple[_Pattern, collections.abc.Callable[[dict[str, int], int],
+                                                      collections.abc.Callable[[list[int]], int | None]]], ...] = \
+    ((DIVISOR_SUM, _divisor_sum_idiom), (DIVISION, _division_idiom))
+
+
+def _match_operands(pattern: tuple[str | int, ...],
+                    operands: tuple[int, ...],
+                    names: dict[str, int],
+                    ip_register: int | None,
+                    start: int) -> bool:
+    for expected, actual in zip(pattern, operands):
+        if expected == '_':
+            continue
+        if isinstance(expected, int):
+            if actual != expected:
+                return False
+        elif expected.startswith('@'):
+            if actual != start + int(expected[1:]):
+                return False
+        elif expected == 'ip':
+            if actual != ip_register:
+                return False
+        elif expected in names:
+            if names[expected] != actual:
+                return False
+        else:
+            names[expected] = actual
+    return True
+
+
+def match_idiom(pattern: _Pattern,
+                program: collections.abc.Sequence[Instruction],
+                start: int,
+                ip_register: int | None) -> dict[str, int] | None:
+    """
+    Operand bindings if the instructions at start follow pattern, None otherwise.
+    Registers bound to different names must differ, and from the IP register.
+    """
+    if ip_register is None or start + len(pattern) > len(program):
+        return None
+
+    names: dict[str, int] = {}
+    for (opcode, *expected), instruction in zip(pattern, program[start:]):
+        if instruction.opcode != opcode:
+            return None
+        operands: tuple[int, ...] = instruction[1:]
+        attempt: dict[str, int] = names.copy()
+        if _match_operands(tuple(expected), operands, attempt, ip_register, start):
+            names = attempt
+            continue
+        swapped: tuple[int, ...] = (operands[1], operands[0], operands[2])
+        attempt = names.copy()
+        if opcode in COMMUTATIVE and _match_operands(tuple(expected), swapped, attempt, ip_register, start):
+            names = attempt
+            continue
+        return None
+
+    registers: list[int] = [register for name, register in names.items() if name.islower()]
+    return names if len(set(registers)) == len(registers) and ip_register not in registers else None
+
+
+class Elfcode:
+    """
+    Elfcode VM with its instruction pointer optionally bound to a register. Programs run as straight-line
+    Python functions, one per basic block compiled on first entry, with known idioms like a nested-multiply
+    divisor search swapped for a native fast path. Breakpoint hooks get the VM and can stop the run.
+    """
+    def __init__(self,
+                 program: collections.abc.Iterable[tuple[str, int, int, int]],
+                 ip_register: int | None = None,
+                 *,
+                 num_registers: int = 6,
+                 idioms: bool = True) -> None:
+        self.program: list[Instruction] = [Instruction(*instruction) for instruction in program]
+        self.ip_register: int | None = ip_register
+        self.registers: list[int] = [0] * num_registers
+        self.ip: int = 0
+        self.idioms: bool = idioms
+        self.breakpoints: dict[int, collections.abc.Callable[[typing.Self], bool | None] | None] = {}
+        self.__paused: bool = False  # Stopped by the breakpoint at self.ip, which mustn't stop the next run again
+        self.__blocks: dict[int, collections.abc.Callable[[list[int]], int]] = {}
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self.program)} instructions, ip={self.ip}, registers={self.registers})'
+
+    def reset(self, registers: collections.abc.Iterable[int] = ()) -> None:
+        """ Back to the first instruction, registers cleared in place and then set from registers """
+        self.ip = 0
+        self.__paused = False
+        self.registers[:] = [0] * len(self.registers)
+        for i, value in enumerate(registers):
+            self.registers[i] = value
+
+    def halted(self) -> bool:
+        return not 0 <= self.ip < len(self.program)
+
+    def add_breakpoint(self,
+                       address: int,
+                       hook: collections.abc.Callable[[typing.Self], bool | None] | None = None) -> None:
+        """ hook(vm) runs before the instruction at address executes, run() stops if it returns True or there is none """
+        self.breakpoints[address] = hook
+        self.__blocks.clear()
+
+    def remove_breakpoint(self, address: int) -> None:
+        self.breakpoints.pop(address, None)
+        self.__blocks.clear()
+
+    def execute(self, instruction: tuple[str, int, int, int]) -> None:
+        """ Interpret a single instruction at self.ip, which then moves on """
+        opcode, a, b, c = instruction
+        registers: list[int] = self.registers
+        if self.ip_register is not None:
+            registers[self.ip_register] = self.ip
+        registers[c] = OPERATIONS[opcode](registers, a, b)
+        if self.ip_register is not None:
+            self.ip = registers[self.ip_register]
+        self.ip += 1
+
+    def step(self) -> None:
+        self.execute(self.program[self.ip])
+
+    def run(self) -> bool:
+        """ True once the program halts, False if a breakpoint stopped it. Running again resumes """
+        registers: list[int] = self.registers
+        blocks: dict[int, collections.abc.Callable[[list[int]], int]] = self.__blocks
+        breakpoints: dict[int, collections.abc.Callable[[typing.Self], bool | None] | None] = self.breakpoints
+        size: int = len(self.program)
+
+        ip: int = self.ip
+        resuming: bool = self.__paused
+        self.__paused = False
+        try:
+            while 0 <= ip < size:
+                if ip in breakpoints and not resuming:
+                    self.ip = ip
+                    hook: collections.abc.Callable[[typing.Self], bool | None] | None = breakpoints[ip]
+                    if hook is None or hook(self):
+                        self.__paused = True
+                        return False
+                    ip = self.ip
+                resuming = False
+
+                block: collections.abc.Callable[[list[int]], int] | None = blocks.get(ip)
+                if block is None:
+                    block = blocks[ip] = self.__compile(ip)
+                ip = block(registers)
+        finally:
+            self.ip = ip
+        return True
+
+    def __compile(self, start: int) -> collections.abc.Callable[[list[int]], int]:
+        block: collections.abc.Callable[[list[int]], int] = self.__compile_block(start)
+        if not self.idioms:
+            return block
+
+        for pattern, build in IDIOMS:
+            names: dict[str, int] | None = match_idiom(pattern, self.program, start, self.ip_register)
+            if names is None or any(start < address < start + len(pattern) for address in self.breakpoints):
+                continue
+            fast_path: collections.abc.Callable[[list[int]], int | None] = build(names, start)
+
+            def idiom(r: list[int]) -> int:
+                next_ip: int | None = fast_path(r)
+                return block(r) if next_ip is None else next_ip
+            return idiom
+        return block
+
+    def __compile_block(self, start: int) -> collections.abc.Callable[[list[int]], int]:
+        """ Straight-line code from start up to a write to the IP register, a breakpoint or the end of the program """
+        ip_register: int | None = self.ip_register
+
+        def operand(register: int, address: int) -> str:
+            # The IP register always holds the address of the executing instruction
+            return str(address) if register == ip_register else f'r{register}'
+
+        body: list[str] = []
+        read: set[int] = set()
+        written: set[int] = set()
+        address: int = start
+        next_ip: str = ''
+        while address < len(self.program):
+            opcode, a, b, c = self.program[address]
+            expression: str = EXPRESSIONS[opcode]
+            if '{A}' in expression and a != ip_register:
+                read.add(a)
+            if '{B}' in expression and b != ip_register:
+                read.add(b)
+            rhs: str = _source(opcode,
+                               operand(a, address) if '{A}' in expression else str(a),
+                               operand(b, address) if '{B}' in expression else str(b))
+            if c == ip_register:
+                body.append(f'ip = {rhs}')
+                next_ip = 'ip'
+                break
+            body.append(f'r{c} = {rhs}')
+            written.add(c)
+            address += 1
+            if address in self.breakpoints:
+                break
+
+        if not next_ip:
+            # Fell through without a jump, the IP register is left holding the last address executed
+            address -= 1
+            body.append(f'ip = {address}')
+            next_ip = 'ip'
+        if ip_register is not None:
+            body.append(f'r[{ip_register}] = ip')
+
+        lines: list[str] = [f'def block_{start}(r):']
+        lines.extend(f'    r{register} = r[{register}]' for register in sorted(read))
+        lines.extend(f'    {line}' for line in body)
+        lines.extend(f'    r[{register}] = r{register}' for register in sorted(written))
+        lines.append(f'    return {next_ip} + 1')
+
+        namespace: dict[str, typing.Any] = {}
+        exec('\n'.join(lines), namespace)
+        return namespace[f'block_{start}']
+
+    def jump_targets(self) -> set[int]:
+        """ Addresses reached by a jump to a constant address, the leaders of the program's basic blocks """
+        targets: set[int] = set()
+        for address, (opcode, a, b, c) in enumerate(self.program):
+            if c != self.ip_register:
+                continue
+            if opcode == 'seti':
+                targets.add(a + 1)
+            elif opcode in ('addi', 'muli') and a == self.ip_register:
+                targets.add((address + b if opcode == 'addi' else address * b) + 1)
+            else:
+                targets.add(address + 1)
+        return targets
+
+    def analyze(self, address: int) -> str:
+        """ Pseudo-code for the instruction at address, with IP reads folded into constants and jumps as gotos """
+        opcode, a, b, c = self.program[address]
+        expression: str = EXPRESSIONS[opcode]
+        ip: int | None = self.ip_register
+
+        left: str = 'ip' if c == ip else f'r[{c}]'
+        a_str: str = (str(address) if a == ip else f'r[{a}]') if '{A}' in expression else str(a)
+        b_str: str = (str(address) if b == ip else f'r[{b}]') if '{B}' in expression else str(b)
+        right: str = expression.format(A=a_str, B=b_str, a=a_str, b=b_str)
+        if opcode.startswith(('gt', 'eq')):
+            right = f'({right})'
+
+        # Evaluate constant operands in arithmetic instructions
+        if '(' not in right and 'r' not in right:
+            right = str(eval(right))
+
+        if left == 'ip' and 'r' not in right:
+            return f'goto {int(right) + 1}'
+
+        # Make operation in place if destination matches an operand
+        terms: list[str] = right.split()
+        if '(' not in right and len(terms) == 3:
+            if terms[0] == left:
+                return f'{left} {terms[1]}= {terms[2]}'
+            if terms[2] == left:
+                return f'{left} {terms[1]}= {terms[0]}'
+        return f'{left} = {right}'
+
+    def decompile(self, *, hex_constants: bool = False) -> str:
+        """ One line per instruction, basic blocks separated by blank lines """
+        leaders: set[int] = self.jump_targets()
+        instructions: list[str] = []
+        for address in range(len(self.program)):
+            line: str = self.analyze(address)
+            if line.startswith('goto') and not 0 <= int(line.split()[1]) < len(self.program):
+                line = 'HALT'
+            elif hex_constants and 'goto' not in line and '(' not in line and 'ip' not in line:
+                left, eq, *ops = line.split()
+                line = ' '.join([left, eq] + [hex(int(op)) if op.isdigit() and len(op) > 1 else op for op in ops])
+            if address in leaders and address:
+                instructions.append('')
+            instructions.append(f'{address}: {line}')
+        return '\n'.join(instructions)
@@ -1,4 +1,5 @@
-from collections.abc import Iterator, Generator
+from array import array
+from collections.abc import Iterable, Iterator, Generator
 from typing import Self, Any
 
 
@@ -75,3 +76,231 @@ class LLNode:
                 raise IndexError('not enough following nodes')
             cur_node = cur_node._next
         return cur_node
+
+
+class CircularList:
+    """
+    Circular doubly linked list of slot ids 0..capacity-1, stored in flat arrays instead of one object per node.
+    Slot ids are usually the values themselves (marbles, cups) or indices into a separate list of values.
+
+    With skip > 0, every skip-th slot or so is also on an express lane that remembers how many slots its segment
+    holds, so next() and prev() hop over whole segments. Segments are split or merged as slots come and go.
+    """
+    __slots__ = ('_next', '_prev', '_length', '_skip', '_owner', '_segment_length', '_express_next', '_express_prev')
+
+    def __init__(self, capacity: int, order: Iterable[int] = (), *, skip: int = 0) -> None:
+        self._next: array = array('l', [-1]) * capacity
+        self._prev: array = array('l', [-1]) * capacity
+        self._length: int = 0
+        self._skip: int = skip
+
+        if skip:
+            self._owner: array = array('l', [-1]) * capacity
+            self._segment_length: array = array('l', [0]) * capacity
+            self._express_next: array = array('l', [-1]) * capacity
+            self._express_prev: array = array('l', [-1]) * capacity
+
+        last: int = -1
+        for slot in order:
+            if last < 0:
+                self._link_first(slot)
+            else:
+                self.insert_after(last, slot)
+            last = slot
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, slot: int) -> bool:
+        return 0 <= slot < len(self._next) and self._next[slot] >= 0
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(capacity={len(self._next)}, length={self._length})'
+
+    @property
+    def successors(self) -> array:
+        """ The raw next links for tight loops, read only - mutating them bypasses the length and skip bookkeeping """
+        return self._next
+
+    def iter_from(self, slot: int) -> Iterator[int]:
+        """ Every slot in the circle, starting at slot """
+        nxt: array = self._next
+        cur: int = slot
+        for _ in range(self._length):
+            yield cur
+            cur = nxt[cur]
+
+    def _link_first(self, slot: int) -> None:
+        self._next[slot] = self._prev[slot] = slot
+        self._length = 1
+        if self._skip:
+            self._owner[slot] = self._express_next[slot] = self._express_prev[slot] = slot
+            self._segment_length[slot] = 1
+
+    def insert_after(self, anchor: int, slot: int) -> None:
+        if self._next[slot] >= 0:
+            raise ValueError(f'slot {slot} is already in the list')
+        nxt: array = self._next
+        successor: int = nxt[anchor]
+        self._prev[slot] = anchor
+        nxt[slot] = successor
+        self._prev[successor] = slot
+        nxt[anchor] = slot
+        self._length += 1
+        if self._skip:
+            self._attach(slot, self._owner[anchor])
+
+    def insert_before(self, anchor: int, slot: int) -> None:
+        self.insert_after(self._prev[anchor], slot)
+
+    def unlink(self, slot: int) -> None:
+        successor: int = self._next[slot]
+        predecessor: int = self._prev[slot]
+        self._next[predecessor] = successor
+        self._prev[successor] = predecessor
+        self._next[slot] = self._prev[slot] = -1
+        self._length -= 1
+        if self._skip:
+            self._detach(slot, successor)
+
+    def move_run(self, first: int, last: int, anchor: int) -> None:
+        """ Cut the run first..last and reinsert it, in order, right after anchor (not part of the run) """
+        if self._skip:
+            # Keeping segment owners right touches every moved slot anyway
+            run: list[int] = [first]
+            while run[-1] != last:
+                run.append(self._next[run[-1]])
+            for slot in run:
+                self.unlink(slot)
+            for slot in run:
+                self.insert_after(anchor, slot)
+                anchor = slot
+            return
+
+        nxt: array = self._next
+        prv: array = self._prev
+        before: int = prv[first]
+        after: int = nxt[last]
+        nxt[before] = after
+        prv[after] = before
+
+        successor: int = nxt[anchor]
+        nxt[anchor] = first
+        prv[first] = anchor
+        nxt[last] = successor
+        prv[successor] = last
+
+    def next(self, slot: int, steps: int = 1, /) -> int:
+        if steps == 1:
+            return self._next[slot]
+        if steps < 0:
+            raise IndexError('number of steps cannot be negative')
+
+        # Going all the way around is a no-op, and the other way around can be shorter
+        steps %= self._length
+        if steps > self._length // 2:
+            return self._walk_back(slot, self._length - steps)
+        return self._walk(slot, steps)
+
+    def prev(self, slot: int, steps: int = 1, /) -> int:
+        if steps == 1:
+            return self._prev[slot]
+        if steps < 0:
+            raise IndexError('number of steps cannot be negative')
+
+        steps %= self._length
+        if steps > self._length // 2:
+            return self._walk(slot, self._length - steps)
+        return self._walk_back(slot, steps)
+
+    def _walk(self, cur: int, steps: int) -> int:
+        nxt: array = self._next
+        if self._skip and steps > self._skip:
+            owner: array = self._owner
+            while steps and owner[cur] != cur:
+                cur = nxt[cur]
+                steps -= 1
+            segment_length: array = self._segment_length
+            express_next: array = self._express_next
+            while steps and steps >= segment_length[cur]:
+                steps -= segment_length[cur]
+                cur = express_next[cur]
+
+        for _ in range(steps):
+            cur = nxt[cur]
+        return cur
+
+    def _walk_back(self, cur: int, steps: int) -> int:
+        prv: array = self._prev
+        if self._skip and steps > self._skip:
+            owner: array = self._owner
+            while steps and owner[cur] != cur:
+                cur = prv[cur]
+                steps -= 1
+            segment_length: array = self._segment_length
+            express_prev: array = self._express_prev
+            while steps and steps >= segment_length[express_prev[cur]]:
+                steps -= segment_length[express_prev[cur]]
+                cur = express_prev[cur]
+
+        for _ in range(steps):
+            cur = prv[cur]
+        return cur
+
+    def _attach(self, slot: int, owner: int) -> None:
+        self._owner[slot] = owner
+        self._segment_length[owner] += 1
+        if self._segment_length[owner] > 2 * self._skip:
+            self._split(owner)
+
+    def _split(self, express: int) -> None:
+        """ The second half of an oversized segment gets its own express slot """
+        middle: int = express
+        for _ in range(self._skip):
+            middle = self._next[middle]
+
+        self._segment_length[middle] = self._segment_length[express] - self._skip
+        self._segment_length[express] = self._skip
+        following: int = self._express_next[express]
+        self._express_next[express] = middle
+        self._express_prev[middle] = express
+        self._express_next[middle] = following
+        self._express_prev[following] = middle
+
+        cur: int = middle
+        for _ in range(self._segment_length[middle]):
+            self._owner[cur] = middle
+            cur = self._next[cur]
+
+        if self._segment_length[middle] > 2 * self._skip:
+            self._split(middle)
+
+    def _detach(self, slot: int, successor: int) -> None:
+        owner: int = self._owner[slot]
+        self._owner[slot] = -1
+        if owner != slot:
+            self._segment_length[owner] -= 1
+            return
+
+        # An express slot is leaving, the rest of its segment joins the previous one
+        remaining: int = self._segment_length[slot] - 1
+        predecessor: int = self._express_prev[slot]
+        following: int = self._express_next[slot]
+        self._segment_length[slot] = 0
+        if predecessor == slot:
+            if remaining == 0:
+                return
+            # Only segment in the list, promote the next slot instead
+            predecessor = successor
+            self._express_next[predecessor] = self._express_prev[predecessor] = predecessor
+        else:
+            self._express_next[predecessor] = following
+            self._express_prev[following] = predecessor
+
+        cur: int = successor
+        for _ in range(remaining):
+            self._owner[cur] = predecessor
+            cur = self._next[cur]
+        self._segment_length[predecessor] += remaining
+        if self._segment_length[predecessor] > 2 * self._skip:
+            self._split(predecessor)
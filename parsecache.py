@@ -0,0 +1,142 @@
+import copy
+import hashlib
+import inspect
+import pathlib
+import pickle
+import typing
+import collections.abc
+
+_T = typing.TypeVar('_T')
+
+
+class _Entry(typing.NamedTuple):
+    data: typing.Any  # pristine result, handed out as is only when copying is turned off
+    pickled: bytes | None  # unpickling is usually much faster than copy.deepcopy()
+
+
+class ParseCache:
+    """
+    Parse results keyed by parse function, input path and a hash of the input text.
+    Every hit is a fresh copy unless copying is turned off, so solvers that mutate their data stay correct.
+    With a directory, picklable results are also saved there and reused by later runs.
+    A parse can defer copying its result until snapshot(), keeping the copy out of a timed parse.
+    """
+    def __init__(self, directory: pathlib.Path | None = None) -> None:
+        self.directory: pathlib.Path | None = directory
+        self.entries: dict[str, _Entry] = {}
+        self.__pending: dict[str, tuple[typing.Any, bool]] = {}  # deferred results, not copied yet
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self.entries)} entries, hits={self.hits}, misses={self.misses})'
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.__pending.clear()
+        if self.directory is not None:
+            for file in self.directory.glob('*.pickle'):
+                file.unlink()
+
+    @staticmethod
+    def key(parse: collections.abc.Callable[[str], typing.Any],
+            puzzle_input: str,
+            path: pathlib.Path | str | None = None) -> str:
+        digest = hashlib.sha256()
+        digest.update(f'{parse.__module__}.{parse.__qualname__}\0{path or ""}\0'.encode())
+        try:
+            # A saved result is stale once the solution changes
+            digest.update(pathlib.Path(inspect.getsourcefile(parse)).read_bytes())
+        except (TypeError, OSError):
+            pass
+        digest.update(puzzle_input.encode())
+        return digest.hexdigest()
+
+    def parse(self,
+              parse: collections.abc.Callable[[str], _T],
+              puzzle_input: str,
+              *,
+              path: pathlib.Path | str | None = None,
+              copy_result: bool = True,
+              defer_snapshot: bool = False) -> _T:
+        """ With defer_snapshot, the result is only copied by snapshot(), call it before changing the result """
+        key: str = self.key(parse, puzzle_input, path)
+
+        entry: _Entry | None = self.entries.get(key)
+        if entry is None and self.directory is not None:
+            entry = self.__load(key)
+
+        if entry is None:
+            self.misses += 1
+            data: _T = parse(puzzle_input)
+            if defer_snapshot:
+                self.__pending[key] = (data, copy_result)
+            else:
+                self.__store(key, data, copy_result)
+            # The first caller gets the original, later callers get copies
+            return data
+
+        if not copy_result and entry.data is None and entry.pickled is not None:
+            entry = self.entries[key] = _Entry(pickle.loads(entry.pickled), entry.pickled)
+
+        if entry.data is not None or entry.pickled is not None:
+            self.hits += 1
+            if not copy_result and entry.data is not None:
+                return entry.data
+            if entry.pickled is not None:
+                return pickle.loads(entry.pickled)
+            return copy.deepcopy(entry.data)
+
+        # Neither picklable nor copyable, e.g. a generator
+        self.misses += 1
+        return parse(puzzle_input)
+
+    def snapshot(self) -> None:
+        """ Store the results of deferred parses, before their first caller gets to change them """
+        for key, (data, copy_result) in self.__pending.items():
+            self.__store(key, data, copy_result)
+        self.__pending.clear()
+
+    def __store(self, key: str, data: typing.Any, copy_result: bool) -> _Entry:
+        pickled: bytes | None = None
+        try:
+            pickled = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            pass
+
+        pristine: typing.Any = data
+        if copy_result and pickled is None:
+            try:
+                pristine = copy.deepcopy(data)
+            except Exception:
+                pristine = None
+        elif copy_result:
+            pristine = None
+
+        entry: _Entry = _Entry(pristine, pickled)
+        self.entries[key] = entry
+        if self.directory is not None and pickled is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f'{key}.pickle').write_bytes(pickled)
+        return entry
+
+    def __load(self, key: str) -> _Entry | None:
+        file: pathlib.Path = self.directory / f'{key}.pickle'
+        if not file.exists():
+            return None
+        entry: _Entry = _Entry(None, file.read_bytes())
+        self.entries[key] = entry
+        return entry
+
+
+CACHE: ParseCache = ParseCache()
+
+
+def cached(parse: collections.abc.Callable[[str], _T], puzzle_input: str, **kwargs) -> _T:
+    """ Shared in-memory cache, e.g. so part 2 doesn't pay for parsing the same input again """
+    return CACHE.parse(parse, puzzle_input, **kwargs)
+
+
+def snapshot() -> None:
+    """ Store the shared cache's deferred parses """
+    CACHE.snapshot()
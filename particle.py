@@ -1,4 +1,9 @@
+import collections
+import itertools
+import statistics
 import typing
+import collections.abc
+from array import array
 
 import aoctools
 from xypair import XYpair, XYtuple
@@ -150,4 +155,158 @@ class Particle3D:
                     return t
 
         return -1
-    
\ No newline at end of file
+    
+
+class ParticleSystem:
+    """
+    Many particles at once, stored as one integer column per axis for position, velocity and acceleration.
+    Positions are optionally wrapped per axis, e.g. robots on a torus.
+    """
+    def __init__(self,
+                 positions: collections.abc.Iterable[collections.abc.Sequence[int]],
+                 velocities: collections.abc.Iterable[collections.abc.Sequence[int]],
+                 accelerations: collections.abc.Iterable[collections.abc.Sequence[int]] | None = None,
+                 *,
+                 wrap: collections.abc.Sequence[int] | None = None) -> None:
+        positions = list(positions)
+        self.dimensions: int = len(positions[0]) if positions else 0
+        self.time: int = 0
+        self.wrap: tuple[int, ...] | None = tuple(wrap) if wrap else None
+
+        self.position: list[array] = self.__columns(positions)
+        self.velocity: list[array] = self.__columns(velocities)
+        self.acceleration: list[array] = self.__columns(accelerations) if accelerations is not None \
+            else [array('q', [0]) * len(positions) for _ in range(self.dimensions)]
+        self.__wrap_positions()
+
+    @classmethod
+    def from_particles(cls, particles: collections.abc.Iterable[Particle2D | Particle3D], **kwargs) -> typing.Self:
+        particles = list(particles)
+        return cls((p.position for p in particles), (p.velocity for p in particles),
+                   (p.acceleration for p in particles), **kwargs)
+
+    def __columns(self, rows: collections.abc.Iterable[collections.abc.Sequence[int]]) -> list[array]:
+        rows = list(rows)
+        return [array('q', (row[axis] for row in rows)) for axis in range(self.dimensions)]
+
+    def __wrap_positions(self) -> None:
+        if self.wrap is not None:
+            for axis, size in enumerate(self.wrap):
+                self.position[axis] = array('q', (p % size for p in self.position[axis]))
+
+    def __len__(self) -> int:
+        return len(self.position[0]) if self.dimensions else 0
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self)} particles, t={self.time})'
+
+    def tick(self, n: int = 1) -> None:
+        """ Advance every particle n steps at once, acceleration applies before each move as in Particle.tick() """
+        triangle: int = n * (n + 1) // 2
+        for axis in range(self.dimensions):
+            self.position[axis] = array('q', (p + v * n + a * triangle for p, v, a in
+                                              zip(self.position[axis], self.velocity[axis], self.acceleration[axis])))
+            if any(self.acceleration[axis]):
+                self.velocity[axis] = array('q', (v + a * n for v, a in
+                                                  zip(self.velocity[axis], self.acceleration[axis])))
+        self.__wrap_positions()
+        self.time += n
+
+    def axis_at(self, axis: int, t: int) -> list[int]:
+        """ One coordinate of every particle t steps from now, without moving them """
+        triangle: int = t * (t + 1) // 2
+        coordinates: list[int] = [p + v * t + a * triangle for p, v, a in
+                                  zip(self.position[axis], self.velocity[axis], self.acceleration[axis])]
+        if self.wrap is not None:
+            size: int = self.wrap[axis]
+            coordinates = [c % size for c in coordinates]
+        return coordinates
+
+    def positions_at(self, t: int = 0) -> list[tuple[int, ...]]:
+        return list(zip(*(self.axis_at(axis, t) for axis in range(self.dimensions))))
+
+    def bounding_box(self, t: int = 0) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        """ (minimum corner, maximum corner) t steps from now """
+        columns: list[list[int]] = [self.axis_at(axis, t) for axis in range(self.dimensions)]
+        return tuple(min(c) for c in columns), tuple(max(c) for c in columns)
+
+    def spread(self, t: int = 0) -> int:
+        """ Sum of the bounding box sides, convex in t whenever nothing accelerates """
+        low, high = self.bounding_box(t)
+        return sum(h - l for l, h in zip(low, high))
+
+    def variance(self, axis: int, t: int = 0) -> float:
+        return statistics.pvariance(self.axis_at(axis, t))
+
+    def converge(self, limit: int) -> int:
+        """
+        Steps from now, up to limit, until the particles are packed tightest.
+        Binary search on the slope of spread(), so only valid while spread() is convex.
+        """
+        low: int = 0
+        high: int = limit
+        while low < high:
+            middle: int = (low + high) // 2
+            if self.spread(middle + 1) < self.spread(middle):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def __row(self, i: int) -> tuple[tuple[int, int, int], ...]:
+        return tuple((self.position[axis][i], self.velocity[axis][i], self.acceleration[axis][i])
+                     for axis in range(self.dimensions))
+
+    @staticmethod
+    def __pair_collision_time(first: tuple[tuple[int, int, int], ...], second: tuple[tuple[int, int, int], ...]) -> int:
+        # Same derivation as Particle.collision_time(), solved on the first axis where the particles differ
+        # and then checked on the others: dat^2 + (2dv + da)t + 2dp = 0
+        coefficients: list[tuple[int, int, int]] = []
+        for (p1, v1, a1), (p2, v2, a2) in zip(first, second):
+            if p1 != p2 or v1 != v2 or a1 != a2:
+                coefficients.append((a1 - a2, 2 * (v1 - v2) + a1 - a2, 2 * (p1 - p2)))
+
+        if not coefficients:
+            return 0
+
+        a, b, c = coefficients[0]
+        candidates: set[int] = {t for t in aoctools.quadratic_roots_int(a, b, c) if t is not None and t >= 0}
+        for t in sorted(candidates):
+            if all(a * t * t + b * t + c == 0 for a, b, c in coefficients[1:]):
+                return t
+        return -1
+
+    def collision_time(self, i: int, j: int) -> int:
+        """ First step (from now) when particles i and j share a position, -1 indicates no collision occurs """
+        return self.__pair_collision_time(self.__row(i), self.__row(j))
+
+    def collisions(self) -> list[tuple[int, set[int]]]:
+        """
+        (time, particles destroyed) in time order. Every pair is checked, but a pair only collides
+        if both particles survived every earlier collision.
+        """
+        rows: list[tuple[tuple[int, int, int], ...]] = [self.__row(i) for i in range(len(self))]
+        by_time: dict[int, list[tuple[int, int]]] = collections.defaultdict(list)
+        for i, j in itertools.combinations(range(len(self)), 2):
+            if (t := self.__pair_collision_time(rows[i], rows[j])) != -1:
+                by_time[t].append((i, j))
+
+        destroyed: set[int] = set()
+        results: list[tuple[int, set[int]]] = []
+        for t in sorted(by_time):
+            now: set[int] = set()
+            for i, j in by_time[t]:
+                if i not in destroyed and j not in destroyed:
+                    now.update((i, j))
+            if now:
+                destroyed |= now
+                results.append((t, now))
+        return results
+
+    def remove(self, indices: collections.abc.Iterable[int]) -> None:
+        removed: set[int] = set(indices)
+        keep: list[int] = [i for i in range(len(self)) if i not in removed]
+        for columns in (self.position, self.velocity, self.acceleration):
+            for axis in range(self.dimensions):
+                column: array = columns[axis]
+                columns[axis] = array('q', (column[i] for i in keep))
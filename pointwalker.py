@@ -1,5 +1,8 @@
+import bisect
+import contextlib
 import typing
 import enum
+import collections.abc
 
 import xypair
 
@@ -64,6 +67,9 @@ class Heading(enum.Enum):
     def reverse(self) -> typing.Self:
         return self.rotate(Direction.BACKWARD)
 
+    def delta(self) -> xypair.XYpair:
+        return _HEADING_DELTAS[self]
+
     def vertical(self) -> bool:
         return self == Heading.NORTH or self == Heading.SOUTH
 
@@ -71,11 +77,91 @@ class Heading(enum.Enum):
         return self == Heading.EAST or self == Heading.WEST
 
 
+_HEADING_DELTAS: dict[Heading, xypair.XYpair] = {
+    Heading.NORTH: xypair.XYpair(0, -1),
+    Heading.NORTHEAST: xypair.XYpair(1, -1),
+    Heading.EAST: xypair.XYpair(1, 0),
+    Heading.SOUTHEAST: xypair.XYpair(1, 1),
+    Heading.SOUTH: xypair.XYpair(0, 1),
+    Heading.SOUTHWEST: xypair.XYpair(-1, 1),
+    Heading.WEST: xypair.XYpair(-1, 0),
+    Heading.NORTHWEST: xypair.XYpair(-1, -1),
+}
+
+
 class State(typing.NamedTuple):
     position: xypair.XYpair
     heading: Heading
 
 
+class ObstacleIndex:
+    """ Obstacles sorted per row and per column, so a walker can jump straight to the next one in its way """
+    def __init__(self, obstacles: collections.abc.Iterable[xypair.XYtuple]) -> None:
+        self.rows: dict[int, list[int]] = {}
+        self.columns: dict[int, list[int]] = {}
+        for x, y in obstacles:
+            self.rows.setdefault(y, []).append(x)
+            self.columns.setdefault(x, []).append(y)
+        for line in (*self.rows.values(), *self.columns.values()):
+            line.sort()
+
+        # One temporary obstacle on top of the index, e.g. trying each candidate in turn
+        self.extra: xypair.XYpair | None = None
+
+    def __contains__(self, pt: xypair.XYtuple) -> bool:
+        x, y = pt
+        if self.extra is not None and self.extra == (x, y):
+            return True
+        row: list[int] = self.rows.get(y, [])
+        i: int = bisect.bisect_left(row, x)
+        return i < len(row) and row[i] == x
+
+    @contextlib.contextmanager
+    def extra_obstacle(self, pt: xypair.XYtuple) -> collections.abc.Iterator[None]:
+        self.extra = xypair.XYpair(*pt)
+        try:
+            yield
+        finally:
+            self.extra = None
+
+    def ahead(self, position: xypair.XYpair, heading: Heading) -> xypair.XYpair | None:
+        """ Nearest obstacle in a straight line from position, None if the way is clear """
+        x, y = position
+        found: xypair.XYpair | None = None
+        match heading:
+            case Heading.EAST:
+                row: list[int] = self.rows.get(y, [])
+                i: int = bisect.bisect_right(row, x)
+                if i < len(row):
+                    found = xypair.XYpair(row[i], y)
+            case Heading.WEST:
+                row = self.rows.get(y, [])
+                i = bisect.bisect_left(row, x)
+                if i > 0:
+                    found = xypair.XYpair(row[i - 1], y)
+            case Heading.SOUTH:
+                column: list[int] = self.columns.get(x, [])
+                i = bisect.bisect_right(column, y)
+                if i < len(column):
+                    found = xypair.XYpair(x, column[i])
+            case Heading.NORTH:
+                column = self.columns.get(x, [])
+                i = bisect.bisect_left(column, y)
+                if i > 0:
+                    found = xypair.XYpair(x, column[i - 1])
+            case _:
+                raise ValueError(f'obstacles are only indexed along rows and columns, not {heading}')
+
+        if self.extra is not None:
+            dx, dy = heading.delta()
+            distance: int = (self.extra.x - x) * dx + (self.extra.y - y) * dy
+            in_line: bool = self.extra.y == y if dy == 0 else self.extra.x == x
+            if in_line and distance > 0 and (found is None or distance < found.manhattan_distance(position)):
+                found = self.extra
+
+        return found
+
+
 class PointWalker:
     @typing.overload
     def __init__(self, initial_position: xypair.XYtuple, initial_heading: Heading | str, /) -> None:
@@ -143,24 +229,9 @@ class PointWalker:
         return self.peek()
 
     def peek(self, direction: Direction | str = Direction.FORWARD, *, distance: int = 1) -> xypair.XYpair:
-        peek_heading: Heading = self.heading.rotate(direction)
-        match peek_heading:
-            case Heading.NORTH:
-                return self.position.up(distance)
-            case Heading.NORTHEAST:
-                return self.position.up_right(distance)
-            case Heading.EAST:
-                return self.position.right(distance)
-            case Heading.SOUTHEAST:
-                return self.position.down_right(distance)
-            case Heading.SOUTH:
-                return self.position.down(distance)
-            case Heading.SOUTHWEST:
-                return self.position.down_left(distance)
-            case Heading.WEST:
-                return self.position.left(distance)
-            case Heading.NORTHWEST:
-                return self.position.up_left(distance)
+        peek_heading: Heading = self.heading if direction is Direction.FORWARD else self.heading.rotate(direction)
+        dx, dy = peek_heading.delta()
+        return xypair.XYpair(self.position.x + dx * distance, self.position.y + dy * distance)
 
     def step(self) -> None:
         self.move()
@@ -170,6 +241,29 @@ class PointWalker:
         self.record()
         self.position = self.peek(direction, distance=distance)
 
+    def walk_until_blocked(self, obstacles: ObstacleIndex) -> bool:
+        """ Jump to just in front of the next obstacle, False (and no move) if nothing is in the way """
+        obstacle: xypair.XYpair | None = obstacles.ahead(self.position, self.heading)
+        if obstacle is None:
+            return False
+
+        distance: int = obstacle.manhattan_distance(self.position) - 1
+        if distance:
+            self.move(distance)
+            self.steps_taken += distance
+        return True
+
+    def loops(self, obstacles: ObstacleIndex, turn: Direction | str = Direction.RIGHT) -> bool:
+        """ Walk until blocked, turn, repeat. Only turning states are remembered, True if one comes around again """
+        turns: set[State] = set()
+        while self.walk_until_blocked(obstacles):
+            state: State = self.state()
+            if state in turns:
+                return True
+            turns.add(state)
+            self.turn(turn)
+        return False
+
     def turn(self, direction: Direction | str) -> None:
         self.record()
         self.heading = self.heading.rotate(direction)
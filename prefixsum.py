@@ -0,0 +1,132 @@
+import itertools
+import operator
+import typing
+import collections.abc
+
+try:
+    import numpy
+except ImportError:  # Pure Python fallback below
+    numpy = None
+
+from space import Space
+from xypair import XYpair, XYtuple
+
+
+class PrefixSum2D:
+    """
+    Summed-area table, table[y][x] being the sum of every value above and to the left of (x, y) exclusive,
+    so any rectangle sum is four lookups. NumPy backs the table when installed, which limits values to int64.
+    """
+    def __init__(self,
+                 rows: collections.abc.Iterable[collections.abc.Iterable[int]],
+                 *,
+                 origin: XYtuple = (0, 0),
+                 use_numpy: bool | None = None) -> None:
+        """ origin: coordinates of rows[0][0], shorter rows are padded with 0 """
+        rows = [list(row) for row in rows]
+        self.height: int = len(rows)
+        self.width: int = max((len(row) for row in rows), default=0)
+        self.origin: XYpair = XYpair(*origin)
+
+        self.numpy: bool = numpy is not None if use_numpy is None else use_numpy
+        if self.numpy and numpy is None:
+            raise ImportError('use_numpy requires NumPy')
+
+        if self.numpy:
+            grid = numpy.zeros((self.height + 1, self.width + 1), dtype=numpy.int64)
+            for y, row in enumerate(rows):
+                grid[y + 1, 1:len(row) + 1] = row
+            self.table = grid.cumsum(axis=0).cumsum(axis=1)
+        else:
+            self.table: list[list[int]] = [[0] * (self.width + 1)]
+            for row in rows:
+                running: list[int] = list(itertools.accumulate(row, initial=0))
+                running.extend([running[-1]] * (self.width + 1 - len(running)))
+                self.table.append(list(map(operator.add, self.table[-1], running)))
+
+    @classmethod
+    def from_function(cls,
+                      width: int,
+                      height: int,
+                      value: collections.abc.Callable[[XYpair], int],
+                      *,
+                      origin: XYtuple = (0, 0),
+                      use_numpy: bool | None = None) -> typing.Self:
+        """ value(pt) for every pt in the width x height rectangle starting at origin """
+        x0, y0 = origin
+        return cls(([value(XYpair(x, y)) for x in range(x0, x0 + width)] for y in range(y0, y0 + height)),
+                   origin=origin, use_numpy=use_numpy)
+
+    @classmethod
+    def from_space(cls,
+                   space: Space,
+                   value: collections.abc.Callable[[str], int] | None = None,
+                   *,
+                   use_numpy: bool | None = None) -> typing.Self:
+        """ value(tile) for every item tile, default tiles count 0. By default digits or 1 per item """
+        if value is None:
+            value = int if space.integer_values else lambda _: 1
+
+        rows: list[list[int]] = [[0] * space.width for _ in range(space.height)]
+        for tile, pts in space.items.items():
+            tile_value: int = value(tile)
+            for pt in pts:
+                rows[pt.y][pt.x] = tile_value
+        return cls(rows, use_numpy=use_numpy)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.width}x{self.height}, origin={tuple(self.origin)})'
+
+    def rectangle(self, top_left: XYtuple, bottom_right: XYtuple) -> int:
+        """ Sum over the rectangle with both corners included, clipped to the grid """
+        x0: int = max(top_left[0] - self.origin.x, 0)
+        y0: int = max(top_left[1] - self.origin.y, 0)
+        x1: int = min(bottom_right[0] - self.origin.x + 1, self.width)
+        y1: int = min(bottom_right[1] - self.origin.y + 1, self.height)
+        if x1 <= x0 or y1 <= y0:
+            return 0
+        table = self.table
+        return int(table[y1][x1] - table[y0][x1] - table[y1][x0] + table[y0][x0])
+
+    def window(self, top_left: XYtuple, size: int) -> int:
+        """ Sum over the size x size square whose top left corner is top_left """
+        return self.rectangle(top_left, (top_left[0] + size - 1, top_left[1] + size - 1))
+
+    def best_window(self, size: int) -> tuple[int, XYpair] | None:
+        """
+        (sum, top left corner) of the size x size square with the largest sum, the first one in reading order
+        on ties. None if the square doesn't fit.
+        """
+        if not 0 < size <= min(self.width, self.height):
+            return None
+
+        if self.numpy:
+            table = self.table
+            sums = table[size:, size:] - table[:-size, size:] - table[size:, :-size] + table[:-size, :-size]
+            y, x = divmod(int(sums.argmax()), sums.shape[1])
+            return int(sums[y, x]), XYpair(x + self.origin.x, y + self.origin.y)
+
+        best: tuple[int, int, int] | None = None
+        for y, (upper, lower) in enumerate(zip(self.table, self.table[size:])):
+            # Sums of rows y to y + size - 1 up to each column, then differences size columns apart
+            columns: list[int] = list(map(operator.sub, lower, upper))
+            row_best: int = max(map(operator.sub, columns[size:], columns))
+            if best is None or row_best > best[0]:
+                windows: list[int] = list(map(operator.sub, columns[size:], columns))
+                best = (row_best, y, windows.index(row_best))
+
+        total, y, x = best
+        return total, XYpair(x + self.origin.x, y + self.origin.y)
+
+    def best_window_any_size(self,
+                             sizes: collections.abc.Iterable[int] | None = None) -> tuple[int, XYpair, int] | None:
+        """ (sum, top left corner, size) of the square with the largest sum over sizes, default every size """
+        if sizes is None:
+            sizes = range(1, min(self.width, self.height) + 1)
+
+        best: tuple[int, XYpair, int] | None = None
+        for size in sizes:
+            found: tuple[int, XYpair] | None = self.best_window(size)
+            if found is not None and (best is None or found[0] > best[0]):
+                best = (*found, size)
+        return best
@@ -0,0 +1,127 @@
+import argparse
+import concurrent.futures
+import contextlib
+import os
+import pathlib
+import resource
+import signal
+import sys
+import time
+import collections.abc
+
+import benchmark
+from benchmark import Puzzle, Result
+
+
+class PuzzleTimeout(BaseException):
+    """ Not an Exception, so neither the benchmark nor a solution's own except clauses swallow it """
+
+
+def _raise_timeout(*_) -> None:
+    raise PuzzleTimeout
+
+
+def limit_worker_memory(memory_mib: int) -> None:
+    """ Pool initializer, the address space limit applies to every task the worker runs """
+    if memory_mib > 0:
+        limit: int = memory_mib * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def run_task(puzzle: Puzzle, part: int, timeout: float) -> Result:
+    """ Runs inside a worker process, SIGALRM interrupts a solution that exceeds its time limit """
+    signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        # Solutions print their own progress, keep the streamed results readable
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            result: Result = benchmark.benchmark(puzzle, part, runs=1, warmup=0, memory=False)
+    except PuzzleTimeout:
+        return Result(puzzle.year, puzzle.day, part, error=f'timed out after {timeout} s')
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+    # benchmark() reports exceptions as errors, a MemoryError there means the worker hit its limit
+    if result.error.startswith('MemoryError'):
+        result.error = 'exceeded memory limit'
+    return result
+
+
+def schedule(tasks: collections.abc.Iterable[tuple[Puzzle, int]],
+             previous: collections.abc.Iterable[Result]) -> list[tuple[Puzzle, int]]:
+    """ Longest job first using previous timings, tasks without history are assumed to be the longest """
+    durations: dict[tuple[int, int, int], float] = {r.key(): r.parse_median_ms + r.solve_median_ms
+                                                   for r in previous if not r.error}
+
+    def expected(task: tuple[Puzzle, int]) -> float:
+        puzzle, part = task
+        return durations.get((puzzle.year, puzzle.day, part), float('inf'))
+
+    return sorted(tasks, key=expected, reverse=True)
+
+
+def run_all(puzzles: collections.abc.Iterable[Puzzle],
+            *,
+            jobs: int | None = None,
+            timeout: float = 60.0,
+            memory_mib: int = 0,
+            previous: collections.abc.Iterable[Result] = tuple()) -> collections.abc.Iterator[Result]:
+    """ Yield each result as soon as it finishes """
+    tasks: list[tuple[Puzzle, int]] = [(puzzle, part) for puzzle in puzzles if puzzle.input_file.exists()
+                                       for part in (1, 2)]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs or os.cpu_count(),
+                                                initializer=limit_worker_memory,
+                                                initargs=(memory_mib,)) as pool:
+        futures: dict[concurrent.futures.Future, tuple[Puzzle, int]] = \
+            {pool.submit(run_task, puzzle, part, timeout): (puzzle, part) for puzzle, part in schedule(tasks, previous)}
+
+        for future in concurrent.futures.as_completed(futures):
+            puzzle, part = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                # e.g. a worker killed by the OS, which breaks the rest of the pool too
+                yield Result(puzzle.year, puzzle.day, part, error=f'{e.__class__.__name__}: {e}')
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Run Advent of Code solutions in parallel')
+    parser.add_argument('puzzles', nargs='*', help='YEAR or YEAR/DAY, default is every puzzle')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='worker processes')
+    parser.add_argument('-t', '--timeout', type=float, default=60.0, help='seconds per part')
+    parser.add_argument('-m', '--memory', type=int, default=0, help='MiB per worker, 0 for no limit')
+    parser.add_argument('--timings', type=pathlib.Path,
+                        help='results file used to schedule longest jobs first, updated after the run')
+    args: argparse.Namespace = parser.parse_args()
+
+    previous: list[Result] = []
+    if args.timings and args.timings.exists():
+        previous = benchmark.load_results(args.timings)
+
+    start: float = time.perf_counter()
+    results: list[Result] = []
+    for result in run_all(benchmark.select(benchmark.discover(), args.puzzles),
+                          jobs=args.jobs,
+                          timeout=args.timeout,
+                          memory_mib=args.memory,
+                          previous=previous):
+        results.append(result)
+        print(benchmark.report(result), flush=True)
+
+    failed: int = sum(bool(r.error) for r in results)
+    print()
+    print(f'{len(results)} parts in {round(time.perf_counter() - start, 3)} s, {failed} failed')
+
+    if args.timings:
+        # Keep history for puzzles that weren't part of this run
+        merged: dict[tuple[int, int, int], Result] = {r.key(): r for r in previous}
+        merged.update((r.key(), r) for r in results)
+        benchmark.save_results(sorted(merged.values(), key=Result.key), args.timings)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
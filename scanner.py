@@ -0,0 +1,182 @@
+import functools
+import re
+import typing
+import collections.abc
+
+try:
+    import numpy
+except ImportError:  # Pure Python fallback below
+    numpy = None
+
+
+# Format spec -> (regex, converter). Plain {} is lazy like the parse module's
+_FIELDS: dict[str, tuple[str, collections.abc.Callable[[str], typing.Any]]] = {
+    '': (r'.+?', str),
+    'd': (r'[-+]?\d+', int),
+    'f': (r'[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?', float),
+    'w': (r'\w+', str),
+    'l': (r'[A-Za-z]+', str),
+    'S': (r'\S+', str),
+}
+
+# Within a single line, for matching every line of an input in one pass
+_LINE_FIELDS: dict[str, str] = {spec: pattern for spec, (pattern, _) in _FIELDS.items()} | {'': r'[^\n]+?'}
+
+_TOKEN: re.Pattern = re.compile(r'\{\{|\}\}|\{(?::(\w?))?\}')
+_INT: re.Pattern = re.compile(r'[-+]?\d+')
+
+
+class Format:
+    """
+    A parse module style format, e.g. 'mem[{:d}] = {:d}', compiled to a regex once. Fields are {} for any text,
+    {:d} int, {:f} float, {:w} word, {:l} letters and {:S} non-whitespace, {{ and }} are literal braces.
+    Results are tuples of converted fields, and a whole input of lines is matched in a single regex pass.
+    """
+    def __init__(self, format_str: str) -> None:
+        self.format: str = format_str
+        record: list[str] = []
+        line: list[str] = []
+        self.converters: list[collections.abc.Callable[[str], typing.Any]] = []
+        position: int = 0
+        for token in _TOKEN.finditer(format_str):
+            literal: str = re.escape(format_str[position:token.start()])
+            record.append(literal)
+            line.append(literal)
+            position = token.end()
+            if token[0] in ('{{', '}}'):
+                record.append(re.escape(token[0][0]))
+                line.append(re.escape(token[0][0]))
+                continue
+            spec: str = token[1] or ''
+            if spec not in _FIELDS:
+                raise ValueError(f'unknown field type {token[0]}')
+            pattern, converter = _FIELDS[spec]
+            record.append(f'({pattern})')
+            line.append(f'({_LINE_FIELDS[spec]})')
+            self.converters.append(converter)
+        tail: str = re.escape(format_str[position:])
+        record.append(tail)
+        line.append(tail)
+
+        # Records may span lines, a line pattern stays within its line so one pass finds every line
+        self.record: re.Pattern = re.compile(''.join(record), re.DOTALL)
+        self.line: re.Pattern = re.compile(f'^{"".join(line)}$', re.MULTILINE)
+        self.__all_text: bool = all(converter is str for converter in self.converters)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.format!r})'
+
+    def __convert(self, match: re.Match) -> tuple:
+        if self.__all_text:
+            return match.groups()
+        return tuple(converter(field) for converter, field in zip(self.converters, match.groups()))
+
+    def parse(self, text: str) -> tuple | None:
+        """ Fields if the whole text matches, else None """
+        match: re.Match | None = self.record.fullmatch(text)
+        return self.__convert(match) if match else None
+
+    def search(self, text: str) -> tuple | None:
+        """ Fields of the first match anywhere in text """
+        match: re.Match | None = self.record.search(text)
+        return self.__convert(match) if match else None
+
+    def findall(self, text: str) -> list[tuple]:
+        """ Fields of every non-overlapping match in text """
+        return [self.__convert(match) for match in self.record.finditer(text)]
+
+    def lines(self, text: str) -> list[tuple]:
+        """ Fields of every line, each of which must match """
+        text = text.rstrip('\n')
+        if not text:
+            return []
+        starts: list[int] = []
+        rows: list[tuple] = []
+        for match in self.line.finditer(text):
+            starts.append(match.start())
+            rows.append(self.__convert(match))
+        if len(rows) != text.count('\n') + 1:
+            self.__mismatch(text, starts)
+        return rows
+
+    def columns(self, text: str, *, use_numpy: bool = False) -> list[list] | list:
+        """ lines() transposed, one list per field. NumPy arrays if asked for """
+        rows: list[tuple] = self.lines(text)
+        columns: list[list] = [list(column) for column in zip(*rows)] if rows else [[] for _ in self.converters]
+        if not use_numpy:
+            return columns
+        if numpy is None:
+            raise ImportError('use_numpy requires NumPy')
+        return [numpy.array(column) for column in columns]
+
+    def stream(self,
+               source: typing.TextIO | collections.abc.Iterable[str],
+               *,
+               chunk_size: int = 1 << 16) -> collections.abc.Iterator[tuple]:
+        """
+        lines() over a file or any iterable of text chunks, a block of whole lines at a time. A line may be
+        split across chunks, only the unfinished end of a chunk is carried over.
+        """
+        if hasattr(source, 'read'):
+            source = iter(functools.partial(source.read, chunk_size), '')
+        pending: str = ''
+        for chunk in source:
+            text: str = pending + chunk
+            end: int = text.rfind('\n') + 1
+            pending = text[end:]
+            if end:
+                yield from self.lines(text[:end])
+        if pending:
+            yield from self.lines(pending)
+
+    def __mismatch(self, text: str, starts: list[int]) -> typing.NoReturn:
+        matched: set[int] = set(starts)
+        position: int = 0
+        for number, line in enumerate(text.split('\n'), start=1):
+            if position not in matched:
+                raise ValueError(f'line {number} does not match {self.format!r}: {line!r}')
+            position += len(line) + 1
+        raise ValueError(f'input does not match {self.format!r}')
+
+
+@functools.cache
+def compile_format(format_str: str) -> Format:
+    """ Shared compiled Format for each format string """
+    return Format(format_str)
+
+
+def parse(format_str: str, text: str) -> tuple | None:
+    """ Drop-in for parse.parse(), compiling each format only once """
+    return compile_format(format_str).parse(text)
+
+
+def search(format_str: str, text: str) -> tuple | None:
+    """ Drop-in for parse.search() """
+    return compile_format(format_str).search(text)
+
+
+def ints(text: str) -> list[int]:
+    """ Every signed int in text """
+    return list(map(int, _INT.findall(text)))
+
+
+def int_matrix(text: str, *, use_numpy: bool = False) -> list[list[int]] | typing.Any:
+    """ Signed ints of each line, a row per line. A 2D NumPy array if asked for, which needs equal rows """
+    rows: list[list[int]] = [list(map(int, _INT.findall(line))) for line in text.rstrip('\n').split('\n')]
+    if not use_numpy:
+        return rows
+    if numpy is None:
+        raise ImportError('use_numpy requires NumPy')
+    return numpy.array(rows, dtype=numpy.int64)
+
+
+def grid(text: str) -> tuple[bytearray, int, int]:
+    """ (cells, width, height) of a rectangular grid of ASCII tiles, cells row by row without newlines """
+    data: bytes = text.strip('\n').encode()
+    width: int = data.find(b'\n')
+    if width < 0:
+        return bytearray(data), len(data), 1 if data else 0
+    cells: bytearray = bytearray(data.replace(b'\n', b''))
+    if len(cells) % width:
+        raise ValueError('grid rows differ in length')
+    return cells, width, len(cells) // width
@@ -0,0 +1,204 @@
+import heapq
+import itertools
+import typing
+import collections.abc
+
+_S = typing.TypeVar('_S', bound=collections.abc.Hashable)
+
+
+class StateLayout:
+    """
+    Fixed-width unsigned fields packed into one int, the first field in the lowest bits. A packed state
+    hashes and compares as a plain int, a few bytes instead of a tuple or object per visited state.
+    """
+    def __init__(self, fields: collections.abc.Mapping[collections.abc.Hashable, int]
+                 | collections.abc.Iterable[tuple[collections.abc.Hashable, int]]) -> None:
+        """ fields: (name, width in bits) in packing order """
+        if isinstance(fields, collections.abc.Mapping):
+            fields = fields.items()
+
+        self.names: list[collections.abc.Hashable] = []
+        self.shifts: dict[collections.abc.Hashable, int] = {}
+        self.masks: dict[collections.abc.Hashable, int] = {}
+        self.bits: int = 0
+        for name, width in fields:
+            if width < 1:
+                raise ValueError(f'field {name} needs at least one bit')
+            self.names.append(name)
+            self.shifts[name] = self.bits
+            self.masks[name] = (1 << width) - 1
+            self.bits += width
+
+        self.__shift_list: list[int] = [self.shifts[name] for name in self.names]
+        self.__mask_list: list[int] = [self.masks[name] for name in self.names]
+
+        # The lowest and highest bit of every field, for updating all fields with one int operation
+        self.low_bits: int = sum(1 << self.shifts[name] for name in self.names)
+        self.high_bits: int = sum((self.masks[name] + 1) >> 1 << self.shifts[name] for name in self.names)
+
+    @classmethod
+    def uniform(cls, count: int, width: int) -> typing.Self:
+        """ count fields of width bits each, named 0 to count - 1 """
+        return cls((i, width) for i in range(count))
+
+    @classmethod
+    def from_maxima(cls, maxima: collections.abc.Mapping[collections.abc.Hashable, int]) -> typing.Self:
+        """ Fields just wide enough for values up to each maximum """
+        return cls((name, max(maximum.bit_length(), 1)) for name, maximum in maxima.items())
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self.names)} fields, {self.bits} bits)'
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def pack(self, values: collections.abc.Mapping[collections.abc.Hashable, int] | collections.abc.Iterable[int]) -> int:
+        """ values by field name, or in field order """
+        if isinstance(values, collections.abc.Mapping):
+            values = [values.get(name, 0) for name in self.names]
+        state: int = 0
+        for name, value, shift, mask in zip(self.names, values, self.__shift_list, self.__mask_list):
+            if not 0 <= value <= mask:
+                raise ValueError(f'{value} does not fit field {name}')
+            state |= value << shift
+        return state
+
+    def unpack(self, state: int) -> list[int]:
+        return [state >> shift & mask for shift, mask in zip(self.__shift_list, self.__mask_list)]
+
+    def get(self, state: int, name: collections.abc.Hashable) -> int:
+        return state >> self.shifts[name] & self.masks[name]
+
+    def replace(self, state: int, name: collections.abc.Hashable, value: int) -> int:
+        shift: int = self.shifts[name]
+        return state & ~(self.masks[name] << shift) | value << shift
+
+    def add(self, state: int, name: collections.abc.Hashable, delta: int) -> int:
+        """ No overflow check, a field pushed out of range corrupts its neighbor """
+        return state + (delta << self.shifts[name])
+
+
+class PackedSet:
+    """ Set of packed states, a bitmap when the states are small enough and a set of ints otherwise """
+    def __init__(self, bits: int, *, bitmap_limit: int = 26) -> None:
+        self.bitmap: bytearray | None = bytearray(((1 << bits) + 7) // 8) if bits <= bitmap_limit else None
+        self.states: set[int] = set()
+        self.size: int = 0
+
+    def __len__(self) -> int:
+        return self.size if self.bitmap is not None else len(self.states)
+
+    def __contains__(self, state: int) -> bool:
+        if self.bitmap is None:
+            return state in self.states
+        return bool(self.bitmap[state >> 3] & (1 << (state & 7)))
+
+    def add(self, state: int) -> bool:
+        """ False if state was already there """
+        if self.bitmap is None:
+            if state in self.states:
+                return False
+            self.states.add(state)
+            return True
+
+        byte: int = state >> 3
+        bit: int = 1 << (state & 7)
+        if self.bitmap[byte] & bit:
+            return False
+        self.bitmap[byte] |= bit
+        self.size += 1
+        return True
+
+
+def bfs(start: _S,
+        neighbors: collections.abc.Callable[[_S], collections.abc.Iterable[_S]],
+        is_target: collections.abc.Callable[[_S], bool],
+        *,
+        seen: PackedSet | set | None = None) -> tuple[int, _S] | None:
+    """ (steps, state) for the first target reached, level by level. seen may be pre-sized, e.g. a PackedSet """
+    if seen is None:
+        seen = set()
+    seen.add(start)
+
+    level: list[_S] = [start]
+    steps: int = 0
+    while level:
+        next_level: list[_S] = []
+        for state in level:
+            if is_target(state):
+                return steps, state
+            for next_state in neighbors(state):
+                if next_state not in seen:
+                    seen.add(next_state)
+                    next_level.append(next_state)
+        level = next_level
+        steps += 1
+    return None
+
+
+def dijkstra(start: _S,
+             transitions: collections.abc.Callable[[_S], collections.abc.Iterable[tuple[_S, int]]],
+             is_target: collections.abc.Callable[[_S], bool],
+             *,
+             heuristic: collections.abc.Callable[[_S], int] | None = None,
+             dominated: collections.abc.Callable[[_S, int], bool] | None = None) -> tuple[int, _S] | None:
+    """
+    (cost, state) for the cheapest target. A* when given a consistent heuristic. dominated(state, cost) can
+    discard a state before it is expanded, e.g. when a state at least as good was already settled.
+    """
+    tiebreak: collections.abc.Iterator[int] = itertools.count()
+    best: dict[_S, int] = {start: 0}
+    frontier: list[tuple[int, int, int, _S]] = [(heuristic(start) if heuristic else 0, next(tiebreak), 0, start)]
+    while frontier:
+        _, _, cost, state = heapq.heappop(frontier)
+        if cost > best[state]:
+            continue
+        if is_target(state):
+            return cost, state
+        if dominated is not None and dominated(state, cost):
+            continue
+
+        for next_state, step_cost in transitions(state):
+            next_cost: int = cost + step_cost
+            if next_cost < best.get(next_state, next_cost + 1):
+                best[next_state] = next_cost
+                estimate: int = next_cost + heuristic(next_state) if heuristic else next_cost
+                heapq.heappush(frontier, (estimate, next(tiebreak), next_cost, next_state))
+    return None
+
+
+def a_star(start: _S,
+           transitions: collections.abc.Callable[[_S], collections.abc.Iterable[tuple[_S, int]]],
+           is_target: collections.abc.Callable[[_S], bool],
+           heuristic: collections.abc.Callable[[_S], int],
+           **kwargs) -> tuple[int, _S] | None:
+    return dijkstra(start, transitions, is_target, heuristic=heuristic, **kwargs)
+
+
+def branch_and_bound(root: _S,
+                     branches: collections.abc.Callable[[_S], collections.abc.Iterable[_S]],
+                     value: collections.abc.Callable[[_S], int | None],
+                     bound: collections.abc.Callable[[_S], int],
+                     *,
+                     maximize: bool = True,
+                     dominated: collections.abc.Callable[[_S], bool] | None = None) -> int | None:
+    """
+    Best value(state) over every state reachable through branches, depth first. value() is None for states
+    that aren't solutions. bound(state) must never be worse than any value below state, subtrees that can't
+    beat the best so far are skipped.
+    """
+    sign: int = 1 if maximize else -1
+    best: int | None = None
+    stack: list[_S] = [root]
+    while stack:
+        state: _S = stack.pop()
+        if best is not None and sign * bound(state) <= sign * best:
+            continue
+        if dominated is not None and dominated(state):
+            continue
+
+        state_value: int | None = value(state)
+        if state_value is not None and (best is None or sign * state_value > sign * best):
+            best = state_value
+        stack.extend(branches(state))
+    return best
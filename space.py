@@ -1,14 +1,86 @@
 import collections
+import functools
+import heapq
+import itertools
+import typing
 
 import xypair
 
 
+_S = typing.TypeVar('_S', bound=collections.abc.Hashable)
+
+
+class _ItemSet(set):
+    """ Positions of one item, tells its Space before changing in place """
+    def __init__(self, pts: collections.abc.Iterable[xypair.XYpair] = (), space: 'Space | None' = None) -> None:
+        super().__init__(pts)
+        self.space: Space | None = space
+
+    def __repr__(self) -> str:
+        return repr(set(self))
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (list(self), self.space)
+
+
+class _ItemDict(dict):
+    """ Item -> positions, every set wrapped so changes through aliases like self.walls are seen too """
+    def __init__(self,
+                 items: collections.abc.Mapping[str, collections.abc.Iterable[xypair.XYpair]] | None = None,
+                 space: 'Space | None' = None) -> None:
+        self.space: Space | None = space
+        super().__init__({tile: self.__wrap(pts) for tile, pts in (items or {}).items()})
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (dict(self), self.space)
+
+    def __wrap(self, pts: collections.abc.Iterable[xypair.XYpair]) -> _ItemSet:
+        if isinstance(pts, _ItemSet) and pts.space is self.space:
+            return pts
+        return _ItemSet(pts, self.space)
+
+    def __setitem__(self, tile: str, pts: collections.abc.Iterable[xypair.XYpair]) -> None:
+        if self.space is not None:
+            self.space._items_changed()
+        super().__setitem__(tile, self.__wrap(pts))
+
+    def setdefault(self, tile: str, pts: collections.abc.Iterable[xypair.XYpair] = ()) -> _ItemSet:
+        if tile not in self:
+            self[tile] = pts
+        return self[tile]
+
+    def update(self, *args, **kwargs) -> None:
+        for tile, pts in dict(*args, **kwargs).items():
+            self[tile] = pts
+
+    def __ior__(self, other: collections.abc.Mapping[str, collections.abc.Iterable[xypair.XYpair]]) -> typing.Self:
+        self.update(other)
+        return self
+
+
+def _notify_first(method: collections.abc.Callable) -> collections.abc.Callable:
+    @functools.wraps(method)
+    def changing(self, *args):
+        if self.space is not None:
+            self.space._items_changed()
+        return method(self, *args)
+    return changing
+
+
+for _name in ('add', 'discard', 'remove', 'pop', 'clear', 'update', 'difference_update', 'intersection_update',
+              'symmetric_difference_update', '__ior__', '__iand__', '__isub__', '__ixor__'):
+    setattr(_ItemSet, _name, _notify_first(getattr(set, _name)))
+for _name in ('__delitem__', 'pop', 'popitem', 'clear'):
+    setattr(_ItemDict, _name, _notify_first(getattr(dict, _name)))
+
+
 class Space:
     def __init__(self,
                  space_str: str | collections.abc.Sequence[str],
                  item_types: collections.abc.Container[str] = tuple(),
                  *,
-                 default: str = '.') -> None:
+                 default: str = '.',
+                 dense: bool = False) -> None:
 
         if isinstance(space_str, str):
             space_str = space_str.split('\n')
@@ -17,17 +89,66 @@ class Space:
 
         self.height: int = len(space_str)
         self.width: int = max(len(s) for s in space_str)
-        self.items: dict[str, set[xypair.XYpair]] = collections.defaultdict(set)
         self.integer_values: bool = False
         self.default: str = default
-
-        for y, line in enumerate(space_str):
-            for x, tile in enumerate(line):
-                if (not item_types and tile != self.default) or tile in item_types:
-                    self.items[tile].add(xypair.XYpair(x, y))
-        self.items = dict(self.items)
+        self.item_types: collections.abc.Container[str] = item_types
+
+        # Dense mode stores one byte per tile, items is derived from it on first access
+        self.dense: bool = dense
+        self._grid: bytearray = bytearray()
+        self._items: _ItemDict | None = None
+
+        # Open tile -> open neighbors, one index per set of nonblockers. set_tile() patches it, any other change to
+        # items drops it
+        self._adjacency: dict[frozenset[str], dict[xypair.XYpair, tuple[xypair.XYpair, ...]]] = {}
+        self._packer: xypair.PointPacker | None = None
+
+        if self.dense:
+            self._grid = bytearray([self.__encode(default)]) * (self.width * self.height)
+            for y, line in enumerate(space_str):
+                for x, tile in enumerate(line):
+                    if self.is_item(tile):
+                        self._grid[y * self.width + x] = self.__encode(tile)
+        else:
+            items: dict[str, set[xypair.XYpair]] = collections.defaultdict(set)
+            for y, line in enumerate(space_str):
+                for x, tile in enumerate(line):
+                    if self.is_item(tile):
+                        items[tile].add(xypair.XYpair(x, y))
+            self._items = _ItemDict(items, self)
+
+    @property
+    def items(self) -> dict[str, set[xypair.XYpair]]:
+        # Read-only in dense mode, where tiles change through set_tile() so the grid and items stay in sync
+        if self._items is None:
+            self._items = self.__derive_items()
+        return self._items
+
+    @items.setter
+    def items(self, items: dict[str, set[xypair.XYpair]]) -> None:
+        if self.dense:
+            grid: bytearray = bytearray([self.__encode(self.default)]) * (self.width * self.height)
+            for tile, pts in items.items():
+                code: int = self.__encode(tile)
+                for pt in pts:
+                    if not self.in_space(pt):
+                        raise IndexError(f'{pt} is outside of space')
+                    grid[pt.y * self.width + pt.x] = code
+            self._grid = grid
+        self._items = _ItemDict(items, self)
+        self.invalidate_adjacency()
+
+    def _items_changed(self) -> None:
+        """ Called by items and its sets before they change in place """
+        if self.dense:
+            raise TypeError('items of a dense space are read-only, change tiles with set_tile()')
+        self.invalidate_adjacency()
 
     def __str__(self) -> str:
+        if self.dense:
+            return '\n'.join(self._grid[y * self.width:(y + 1) * self.width].decode('latin-1')
+                             for y in range(self.height))
+
         lines: list[str] = []
         for y in range(self.height):
             line: str = ''
@@ -42,13 +163,81 @@ class Space:
         return '\n'.join(lines)
 
     def __getitem__(self, pt: xypair.XYtuple) -> str:
-        value: str = self.default
+        value: str = self.tile(pt)
+        return int(value) if self.integer_values else value
+
+    def is_item(self, tile: str) -> bool:
+        return (not self.item_types and tile != self.default) or tile in self.item_types
+
+    @xypair.accept_tuple_method
+    def set_tile(self, pt: xypair.XYpair, tile: str) -> None:
+        """ Replace the tile at pt, untracked tiles are stored as the default """
+        if not self.is_item(tile):
+            tile = self.default
+
+        if self.dense:
+            if not self.in_space(pt):
+                raise IndexError(f'{pt} is outside of space')
+            index: int = pt.y * self.width + pt.x
+            old_tile: str = chr(self._grid[index])
+            self._grid[index] = self.__encode(tile)
+            if old_tile == tile:
+                return
+            if self._items is not None:
+                if old_tile != self.default:
+                    set.discard(self._items[old_tile], pt)
+                if tile != self.default:
+                    set.add(self.__item_set(tile), pt)
+        else:
+            for pts in self.items.values():
+                set.discard(pts, pt)
+            if tile != self.default:
+                set.add(self.__item_set(tile), pt)
+
+        self.invalidate_adjacency(pt)
+
+    def __item_set(self, tile: str) -> _ItemSet:
+        # Straight to the sets, set_tile() is the one way to change a dense space and updates adjacency itself
+        if tile not in self._items:
+            dict.__setitem__(self._items, tile, _ItemSet((), self))
+        return self._items[tile]
+
+    def tile(self, pt: xypair.XYtuple) -> str:
+        """ Raw tile character at pt, ignoring integer_values """
+        if self.dense:
+            x, y = pt
+            if 0 <= x < self.width and 0 <= y < self.height:
+                return chr(self._grid[y * self.width + x])
+            return self.default
+
         for item, pts in self.items.items():
             if pt in pts:
-                value = item
-                break
+                return item
+        return self.default
 
-        return int(value) if self.integer_values else value
+    @staticmethod
+    def __encode(tile: str) -> int:
+        code: int = ord(tile)
+        if code > 0xFF:
+            raise ValueError(f"tile '{tile}' cannot be stored in a dense space")
+        return code
+
+    def __derive_items(self) -> _ItemDict:
+        default: int = self.__encode(self.default)
+        items: dict[str, set[xypair.XYpair]] = collections.defaultdict(set)
+        for index, code in enumerate(self._grid):
+            if code != default:
+                y, x = divmod(index, self.width)
+                items[chr(code)].add(xypair.XYpair(x, y))
+        return _ItemDict(items, self)
+
+    def point_packer(self) -> xypair.PointPacker:
+        if self._packer is None:
+            self._packer = xypair.PointPacker(self.width, self.height)
+        return self._packer
+
+    def packed_items(self, item: str) -> set[int]:
+        return self.point_packer().encode_all(self.items.get(item, set()))
 
     @xypair.accept_tuple_method
     def in_space(self, pt: xypair.XYpair) -> bool:
@@ -105,6 +294,120 @@ class Space:
                 blockers.update(v)
         return blockers
 
+    def adjacency(self, *, nonblockers: collections.abc.Iterable[str] = tuple()) \
+            -> dict[xypair.XYpair, tuple[xypair.XYpair, ...]]:
+        """ Open tile -> open orthogonal neighbors, built once per set of nonblockers """
+        key: frozenset[str] = frozenset(nonblockers)
+        if key not in self._adjacency:
+            blockers: set[xypair.XYpair] = self.blockers(exclude=key)
+            open_pts: set[xypair.XYpair] = {xypair.XYpair(x, y)
+                                            for y in range(self.height)
+                                            for x in range(self.width)} - blockers
+            self._adjacency[key] = {pt: tuple(n for n in pt.neighbors() if n in open_pts) for pt in open_pts}
+        return self._adjacency[key]
+
+    def open_neighbors(self,
+                       pt: xypair.XYtuple,
+                       *,
+                       nonblockers: collections.abc.Iterable[str] = tuple()) -> tuple[xypair.XYpair, ...]:
+        adjacency: dict[xypair.XYpair, tuple[xypair.XYpair, ...]] = self.adjacency(nonblockers=nonblockers)
+        if pt in adjacency:
+            return adjacency[pt]
+
+        # Blocked tiles (e.g. a unit's own position) can still be left
+        return tuple(n for n in xypair.XYpair(*pt).neighbors() if n in adjacency)
+
+    def invalidate_adjacency(self, pt: xypair.XYtuple | None = None) -> None:
+        """ Drop the cached adjacency, or with pt just patch it around pt """
+        if pt is None:
+            self._adjacency = {}
+            return
+
+        pt = xypair.XYpair(*pt)
+        tile: str = self.tile(pt)
+        for nonblockers, adjacency in self._adjacency.items():
+            if self.in_space(pt) and (not self.is_item(tile) or tile in nonblockers):
+                adjacency[pt] = ()
+            else:
+                adjacency.pop(pt, None)
+
+            for n in (pt, *pt.neighbors()):
+                if n in adjacency:
+                    adjacency[n] = tuple(nn for nn in n.neighbors() if nn in adjacency)
+
+    def weighted_search(self,
+                        start: _S,
+                        is_target: collections.abc.Callable[[_S], bool],
+                        transitions: collections.abc.Callable[[_S], collections.abc.Iterable[tuple[_S, int]]] | None = None,
+                        *,
+                        heuristic: collections.abc.Callable[[_S], int] | None = None,
+                        nonblockers: collections.abc.Iterable[str] = tuple(),
+                        stop_at_nearest: bool = True) \
+            -> dict[_S, tuple[int, list[_S]]]:
+        """ Dijkstra (A* if given a consistent heuristic) from start over states produced by transitions.
+            Default transitions are single steps between open tiles, but states can be anything hashable,
+            e.g. pointwalker.State for position + heading.
+            return: state -> (cost, all predecessors on equal-cost paths) for every settled state
+        """
+        if transitions is None:
+            transitions = self.__unit_steps(nonblockers)
+        if heuristic is None:
+            heuristic = self.__no_heuristic
+
+        tiebreak: collections.abc.Iterator[int] = itertools.count()
+        found: dict[_S, tuple[int, list[_S]]] = {start: (0, [])}
+        settled: set[_S] = set()
+        frontier: list[tuple[int, int, int, _S]] = [(heuristic(start), next(tiebreak), 0, start)]
+        target_cost: int | None = None
+
+        while frontier:
+            estimate, _, cost, state = heapq.heappop(frontier)
+            if target_cost is not None and estimate > target_cost:
+                break
+            if state in settled or cost > found[state][0]:
+                continue
+            settled.add(state)
+
+            if stop_at_nearest and is_target(state):
+                if target_cost is None:
+                    target_cost = cost
+                continue
+
+            for next_state, step_cost in transitions(state):
+                next_cost: int = cost + step_cost
+                if next_state not in found or next_cost < found[next_state][0]:
+                    found[next_state] = (next_cost, [state])
+                    heapq.heappush(frontier, (next_cost + heuristic(next_state), next(tiebreak), next_cost, next_state))
+                elif next_cost == found[next_state][0] and state not in found[next_state][1]:
+                    found[next_state][1].append(state)
+
+        return {state: found[state] for state in settled}
+
+    @staticmethod
+    def on_shortest_paths(results: collections.abc.Mapping[_S, tuple[int, list[_S]]],
+                          targets: collections.abc.Iterable[_S]) -> set[_S]:
+        """ Every state on some minimum-cost path to targets, without enumerating the paths """
+        on_path: set[_S] = set()
+        pending: list[_S] = [t for t in targets if t in results]
+        while pending:
+            state: _S = pending.pop()
+            if state not in on_path:
+                on_path.add(state)
+                pending.extend(results[state][1])
+        return on_path
+
+    def __unit_steps(self, nonblockers: collections.abc.Iterable[str]) \
+            -> collections.abc.Callable[[xypair.XYpair], collections.abc.Iterable[tuple[xypair.XYpair, int]]]:
+        nonblockers = frozenset(nonblockers)
+
+        def steps(pt: xypair.XYpair) -> collections.abc.Iterable[tuple[xypair.XYpair, int]]:
+            return ((n, 1) for n in self.open_neighbors(pt, nonblockers=nonblockers))
+        return steps
+
+    @staticmethod
+    def __no_heuristic(_) -> int:
+        return 0
+
     def reachable(self,
                   start: xypair.XYtuple,
                   targets: collections.abc.Iterable[xypair.XYtuple],
@@ -178,7 +481,7 @@ class Space:
                       stop_at_nearest: bool = False) \
             -> dict[xypair.XYpair, tuple[int, list[xypair.XYpair]]]:
 
-        blockers: set[xypair.XYtuple] = self.blockers(exclude=nonblockers)
+        adjacency: dict[xypair.XYpair, tuple[xypair.XYpair, ...]] = self.adjacency(nonblockers=nonblockers)
 
         found: dict[xypair.XYpair, tuple[int, list[xypair.XYpair]]] = {}
         edge: dict[xypair.XYpair, tuple[int, list[xypair.XYpair]]] = {xypair.XYpair(*start): (0, [])}
@@ -187,11 +490,15 @@ class Space:
         while edge and not found.keys() >= targets and not (stop_at_nearest and found.keys() & targets):
             new_edge: dict[xypair.XYpair, tuple[int, list[xypair.XYpair]]] = {}
             for cur_pt, (steps, path_prev) in edge.items():
-                for n in self.neighbors(cur_pt) - blockers - found.keys():
+                open_pts: tuple[xypair.XYpair, ...] = adjacency[cur_pt] if cur_pt in adjacency \
+                    else self.open_neighbors(cur_pt, nonblockers=nonblockers)
+                for n in open_pts:
+                    if n in found:
+                        continue
                     if n in new_edge:
-                        new_edge[n][1].append(xypair.XYpair(*cur_pt))
+                        new_edge[n][1].append(cur_pt)
                     else:
-                        new_edge[xypair.XYpair(*n)] = (steps + 1, [xypair.XYpair(*cur_pt)])
+                        new_edge[n] = (steps + 1, [cur_pt])
             edge = new_edge
             found.update(edge)
 
@@ -0,0 +1,155 @@
+import collections.abc
+import typing
+
+from pointwalker import Direction, Heading
+from xypair import XYpair, XYtuple
+
+
+class SparseGrid:
+    """
+    Unbounded grid of small int states, one byte per cell in square chunks keyed by chunk coordinate. A chunk is
+    allocated on the first write into it, reading anywhere else gives default.
+    """
+    def __init__(self, *, default: int = 0, chunk_bits: int = 6) -> None:
+        """ Chunks are 2 ** chunk_bits cells on a side """
+        self.default: int = default
+        self.chunk_bits: int = chunk_bits
+        self.chunk_size: int = 1 << chunk_bits
+        self.chunks: dict[tuple[int, int], bytearray] = {}
+
+    @classmethod
+    def from_lines(cls,
+                   lines: collections.abc.Iterable[str],
+                   states: str,
+                   *,
+                   origin: XYtuple = (0, 0),
+                   **kwargs) -> typing.Self:
+        """ states[i] is the tile for state i, tiles in the default state aren't written """
+        grid: SparseGrid = cls(**kwargs)
+        encoding: dict[str, int] = {tile: state for state, tile in enumerate(states)}
+        x0, y0 = origin
+        for y, line in enumerate(lines):
+            for x, tile in enumerate(line):
+                if tile not in encoding:
+                    raise ValueError(f"unknown tile '{tile}'")
+                if encoding[tile] != grid.default:
+                    grid[x0 + x, y0 + y] = encoding[tile]
+        return grid
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self.chunks)} chunks of {self.chunk_size}x{self.chunk_size})'
+
+    def chunk(self, chunk_x: int, chunk_y: int) -> bytearray:
+        """ Rows of the chunk one after the other, allocated if needed """
+        chunk: bytearray | None = self.chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            chunk = self.chunks[chunk_x, chunk_y] = bytearray([self.default]) * (self.chunk_size * self.chunk_size)
+        return chunk
+
+    def __getitem__(self, pt: XYtuple) -> int:
+        x, y = pt
+        chunk: bytearray | None = self.chunks.get((x >> self.chunk_bits, y >> self.chunk_bits))
+        if chunk is None:
+            return self.default
+        mask: int = self.chunk_size - 1
+        return chunk[(y & mask) << self.chunk_bits | x & mask]
+
+    def __setitem__(self, pt: XYtuple, state: int) -> None:
+        x, y = pt
+        mask: int = self.chunk_size - 1
+        self.chunk(x >> self.chunk_bits, y >> self.chunk_bits)[(y & mask) << self.chunk_bits | x & mask] = state
+
+    def count(self, state: int) -> int:
+        """ Cells in a state other than default """
+        if state == self.default:
+            raise ValueError('infinitely many cells are in the default state')
+        return sum(chunk.count(state) for chunk in self.chunks.values())
+
+    def counts(self) -> dict[int, int]:
+        """ Number of cells in each state other than default """
+        totals: list[int] = [0] * 256
+        for chunk in self.chunks.values():
+            for state in set(chunk):
+                totals[state] += chunk.count(state)
+        return {state: total for state, total in enumerate(totals) if total and state != self.default}
+
+    def cells(self, state: int) -> collections.abc.Iterator[XYpair]:
+        """ Every cell in a state other than default, chunk by chunk """
+        if state == self.default:
+            raise ValueError('infinitely many cells are in the default state')
+        for (chunk_x, chunk_y), chunk in self.chunks.items():
+            index: int = chunk.find(state)
+            while index >= 0:
+                y, x = divmod(index, self.chunk_size)
+                yield XYpair(chunk_x * self.chunk_size + x, chunk_y * self.chunk_size + y)
+                index = chunk.find(state, index + 1)
+
+
+class Ant:
+    """
+    Langton's ant style walker on a SparseGrid: turn by the state underfoot, rewrite that state, step forward.
+    run() keeps everything in locals and touches the chunk dict only when crossing into another chunk.
+    """
+    def __init__(self,
+                 grid: SparseGrid,
+                 position: XYtuple,
+                 heading: Heading | str,
+                 turns: collections.abc.Mapping[int, Direction | str],
+                 next_states: collections.abc.Mapping[int, int]) -> None:
+        """ turns and next_states by state underfoot, states missing from them go straight on and stay """
+        self.grid: SparseGrid = grid
+        self.position: XYpair = XYpair(*position)
+        self.heading: Heading = heading if isinstance(heading, Heading) else Heading[heading.upper()]
+        self.steps_taken: int = 0
+        self.writes: list[int] = [0] * 256  # times each state was written
+
+        # Heading after the turn by state << 3 | heading, with the wraparound done up front
+        rotation: list[int] = [0] * 256
+        for state, turn in turns.items():
+            rotation[state] = (turn if isinstance(turn, Direction) else Direction[turn.upper()]).value
+        self.__turned: list[int] = [(heading + rotation[state]) % len(Heading)
+                                    for state in range(256) for heading in range(len(Heading))]
+        self.__next_states: bytearray = bytearray(range(256))
+        for state, next_state in next_states.items():
+            self.__next_states[state] = next_state
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.position}, {self.heading.name})'
+
+    def run(self, steps: int) -> None:
+        grid: SparseGrid = self.grid
+        bits: int = grid.chunk_bits
+        mask: int = grid.chunk_size - 1
+        turned: list[int] = self.__turned
+        next_states: bytearray = self.__next_states
+        writes: list[int] = self.writes
+        dxs: list[int] = [heading.delta().x for heading in Heading]
+        dys: list[int] = [heading.delta().y for heading in Heading]
+
+        x, y = self.position
+        chunk_x: int = x >> bits
+        chunk_y: int = y >> bits
+        x &= mask
+        y &= mask
+        heading: int = self.heading.value
+        chunk: bytearray = grid.chunk(chunk_x, chunk_y)
+        for _ in range(steps):
+            i: int = y << bits | x
+            state: int = chunk[i]
+            heading = turned[state << 3 | heading]
+            state = next_states[state]
+            chunk[i] = state
+            writes[state] += 1
+
+            x += dxs[heading]
+            y += dys[heading]
+            if x & ~mask or y & ~mask:
+                chunk_x += x >> bits
+                chunk_y += y >> bits
+                x &= mask
+                y &= mask
+                chunk = grid.chunk(chunk_x, chunk_y)
+
+        self.position = XYpair(chunk_x << bits | x, chunk_y << bits | y)
+        self.heading = tuple(Heading)[heading]
+        self.steps_taken += steps
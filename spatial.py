@@ -0,0 +1,175 @@
+import heapq
+import itertools
+import math
+import typing
+import collections.abc
+
+Point: typing.TypeAlias = tuple[int, ...]  # XYpair, XYZtrio or any plain tuple of ints
+_P = typing.TypeVar('_P', bound=Point)
+
+
+def _squared_distance(a: Point, b: Point) -> int:
+    return sum((p - q) * (p - q) for p, q in zip(a, b))
+
+
+def _manhattan_distance(a: Point, b: Point) -> int:
+    return sum(abs(p - q) for p, q in zip(a, b))
+
+
+class KDTree(typing.Generic[_P]):
+    """
+    Static k-d tree stored implicitly: each subrange of self.points has its splitting point at the middle,
+    split along axis depth % dimensions. Distances are compared squared so they stay exact.
+    """
+    def __init__(self, points: collections.abc.Iterable[_P]) -> None:
+        self.points: list[_P] = list(points)
+        self.dimensions: int = len(self.points[0]) if self.points else 0
+
+        # Indices into the original order, so ties and pairs can be reported consistently
+        self.order: list[int] = list(range(len(self.points)))
+        self.__build(0, len(self.order), 0)
+        self.points = [self.points[i] for i in self.order]
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self)} points, {self.dimensions}D)'
+
+    def __build(self, lo: int, hi: int, depth: int) -> None:
+        if hi - lo <= 1:
+            return
+        axis: int = depth % self.dimensions
+        self.order[lo:hi] = sorted(self.order[lo:hi], key=lambda i: self.points[i][axis])
+        middle: int = (lo + hi) // 2
+        self.__build(lo, middle, depth + 1)
+        self.__build(middle + 1, hi, depth + 1)
+
+    def __k_nearest(self, target: Point, k: int, exclude: int = -1) -> list[tuple[int, int]]:
+        """ Sorted (squared distance, position in self.points) of the k nearest, skipping position exclude """
+        best: list[tuple[int, int]] = []  # max-heap of (-squared distance, -position)
+
+        def search(lo: int, hi: int, depth: int) -> None:
+            if lo >= hi:
+                return
+            middle: int = (lo + hi) // 2
+            pt: _P = self.points[middle]
+            if middle != exclude:
+                d2: int = _squared_distance(pt, target)
+                if len(best) < k:
+                    heapq.heappush(best, (-d2, -middle))
+                elif (-d2, -middle) > best[0]:
+                    heapq.heapreplace(best, (-d2, -middle))
+
+            axis: int = depth % self.dimensions
+            delta: int = target[axis] - pt[axis]
+            near, far = ((lo, middle), (middle + 1, hi)) if delta < 0 else ((middle + 1, hi), (lo, middle))
+            search(*near, depth + 1)
+            if len(best) < k or delta * delta <= -best[0][0]:
+                search(*far, depth + 1)
+
+        search(0, len(self.points), 0)
+        return sorted((-d2, -position) for d2, position in best)
+
+    def nearest(self, target: Point, k: int = 1) -> list[tuple[float, _P]]:
+        """ (distance, point) for the k points closest to target, closest first """
+        return [(math.sqrt(d2), self.points[position]) for d2, position in self.__k_nearest(target, k)]
+
+    def within(self, center: Point, radius: float) -> list[_P]:
+        """ Every point no further than radius from center """
+        return self.__within(center, radius * radius, _squared_distance, lambda delta: delta * delta)
+
+    def within_manhattan(self, center: Point, radius: int) -> list[_P]:
+        """ Every point in the Manhattan ball of radius around center """
+        return self.__within(center, radius, _manhattan_distance, abs)
+
+    def __within(self,
+                 center: Point,
+                 limit: float,
+                 distance: collections.abc.Callable[[Point, Point], int],
+                 axis_distance: collections.abc.Callable[[int], int]) -> list[_P]:
+        found: list[_P] = []
+        stack: list[tuple[int, int, int]] = [(0, len(self.points), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            if lo >= hi:
+                continue
+            middle: int = (lo + hi) // 2
+            pt: _P = self.points[middle]
+            if distance(pt, center) <= limit:
+                found.append(pt)
+
+            axis: int = depth % self.dimensions
+            delta: int = center[axis] - pt[axis]
+            # Only cross the splitting plane if it is within range
+            if delta <= 0 or axis_distance(delta) <= limit:
+                stack.append((lo, middle, depth + 1))
+            if delta >= 0 or axis_distance(delta) <= limit:
+                stack.append((middle + 1, hi, depth + 1))
+        return found
+
+    def closest_pairs(self) -> collections.abc.Iterator[tuple[float, _P, _P]]:
+        """
+        Every pair of points, closest first, generated lazily. Each point keeps a cursor into its own
+        sorted neighbor list, fetched in doubling batches, so memory grows with the pairs consumed.
+        """
+        num_points: int = len(self.points)
+        neighbors: list[list[tuple[int, int]]] = [[] for _ in range(num_points)]
+        candidates: list[tuple[int, int, int, int, int]] = []
+
+        def push(position: int, rank: int) -> None:
+            if rank == len(neighbors[position]) and rank < num_points - 1:
+                neighbors[position] = self.__k_nearest(self.points[position], max(2 * rank, 1), position)
+            if rank < len(neighbors[position]):
+                d2, other = neighbors[position][rank]
+                first, second = sorted((self.order[position], self.order[other]))
+                heapq.heappush(candidates, (d2, first, second, position, rank))
+
+        for position in range(num_points):
+            push(position, 0)
+
+        while candidates:
+            d2, first, _, position, rank = heapq.heappop(candidates)
+            other: int = neighbors[position][rank][1]
+            # Both ends of a pair find it, report it from the end that came first in the input
+            if self.order[position] == first:
+                yield math.sqrt(d2), self.points[position], self.points[other]
+            push(position, rank + 1)
+
+
+def _distance_to_box(pt: Point, corner: Point, size: int) -> int:
+    """ Manhattan distance from pt to the box of side size with minimum corner corner """
+    return sum(max(low - p, 0, p - (low + size - 1)) for p, low in zip(pt, corner))
+
+
+def most_overlapping_point(balls: collections.abc.Sequence[tuple[Point, int]],
+                           reference: Point | None = None) -> tuple[int, Point]:
+    """
+    (count, point) for a point inside the most Manhattan balls (center, radius), closest to reference
+    (default the origin) among those. Boxes are subdivided best first, a box's count of overlapping balls
+    being an upper bound for every point inside it.
+    """
+    dimensions: int = len(balls[0][0])
+    reference = reference or (0,) * dimensions
+
+    corner: Point = tuple(min(center[axis] - radius for center, radius in balls) for axis in range(dimensions))
+    extent: int = max(max(center[axis] + radius for center, radius in balls) - corner[axis] + 1
+                      for axis in range(dimensions))
+    size: int = 1
+    while size < extent:
+        size *= 2
+
+    boxes: list[tuple[int, int, int, Point]] = [(-len(balls), _distance_to_box(reference, corner, size), size, corner)]
+    while boxes:
+        negative_count, _, size, corner = heapq.heappop(boxes)
+        if size == 1:
+            return -negative_count, corner
+
+        half: int = size // 2
+        for offsets in itertools.product((0, half), repeat=dimensions):
+            child: Point = tuple(c + offset for c, offset in zip(corner, offsets))
+            count: int = sum(_distance_to_box(center, child, half) <= radius for center, radius in balls)
+            if count:
+                heapq.heappush(boxes, (-count, _distance_to_box(reference, child, half), half, child))
+
+    raise ValueError('no balls given')
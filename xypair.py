@@ -9,17 +9,26 @@ XYtuple: typing.TypeAlias = tuple[int, ...]
 def accept_tuple(func: collections.abc.Callable) -> collections.abc.Callable:
     @functools.wraps(func)
     def wrapper(pair_or_tuple: XYtuple, *args, **kwargs):
-        return func(XYpair(*pair_or_tuple), *args, **kwargs)
+        if pair_or_tuple.__class__ is not XYpair:
+            pair_or_tuple = XYpair(*pair_or_tuple)
+        return func(pair_or_tuple, *args, **kwargs)
     return wrapper
 
 
 def accept_tuple_method(func: collections.abc.Callable) -> collections.abc.Callable:
     @functools.wraps(func)
     def wrapper(self, pair_or_tuple: XYtuple, *args, **kwargs):
-        return func(self, XYpair(*pair_or_tuple), *args, **kwargs)
+        if pair_or_tuple.__class__ is not XYpair:
+            pair_or_tuple = XYpair(*pair_or_tuple)
+        return func(self, pair_or_tuple, *args, **kwargs)
     return wrapper
 
 
+ORTHOGONAL_OFFSETS: tuple[tuple[int, int], ...] = ((0, -1), (0, 1), (-1, 0), (1, 0))
+DIAGONAL_OFFSETS: tuple[tuple[int, int], ...] = ((1, -1), (-1, -1), (1, 1), (-1, 1))
+ALL_OFFSETS: tuple[tuple[int, int], ...] = ORTHOGONAL_OFFSETS + DIAGONAL_OFFSETS
+
+
 @typing.final
 class XYpair(typing.NamedTuple):
     x: int = 0
@@ -89,15 +98,12 @@ class XYpair(typing.NamedTuple):
         return True
 
     def neighbors(self, *, include_corners: bool = False, corners_only: bool = False) -> set[typing.Self]:
-        diagonal: set[XYpair] = {self.up_right(), self.up_left(), self.down_right(), self.down_left()}
+        x, y = self
         if corners_only:
-            return diagonal
-
-        orthogonal: set[XYpair] = {self.up(), self.down(), self.left(), self.right()}
+            return {XYpair(x + dx, y + dy) for dx, dy in DIAGONAL_OFFSETS}
         if include_corners:
-            return orthogonal | diagonal
-
-        return orthogonal
+            return {XYpair(x + dx, y + dy) for dx, dy in ALL_OFFSETS}
+        return {XYpair(x + dx, y + dy) for dx, dy in ORTHOGONAL_OFFSETS}
 
     def surrounding(self, radius: int) -> set[typing.Self]:
         pts: set[XYpair] = set()
@@ -131,6 +137,8 @@ class XYpair(typing.NamedTuple):
         return abs(self.x - start.x) + abs(self.y - start.y)
 
     def __add__(self, other: XYtuple) -> typing.Self:
+        if other.__class__ is XYpair:
+            return XYpair(self.x + other.x, self.y + other.y)
         if isinstance(other, tuple):
             other = XYpair(*other)
             return XYpair(self.x + other.x, self.y + other.y)
@@ -140,6 +148,8 @@ class XYpair(typing.NamedTuple):
         return self + other
 
     def __sub__(self, other: XYtuple) -> typing.Self:
+        if other.__class__ is XYpair:
+            return XYpair(self.x - other.x, self.y - other.y)
         if isinstance(other, tuple):
             other = XYpair(*other)
             return XYpair(self.x - other.x, self.y - other.y)
@@ -169,6 +179,55 @@ class XYpair(typing.NamedTuple):
         return self.distance(ORIGIN)
 
 
+@typing.final
+class PointPacker:
+    """ Encode points of a width x height grid as ints, pt = (y + margin) * stride + (x + margin).
+        The margin keeps neighbor offsets from wrapping onto the next row for points up to margin outside the grid.
+    """
+
+    def __init__(self, width: int, height: int, *, margin: int = 1) -> None:
+        self.width: int = width
+        self.height: int = height
+        self.margin: int = margin
+        self.stride: int = width + 2 * margin
+
+        self.orthogonal_offsets: tuple[int, ...] = tuple(self.offset(d) for d in ORTHOGONAL_OFFSETS)
+        self.diagonal_offsets: tuple[int, ...] = tuple(self.offset(d) for d in DIAGONAL_OFFSETS)
+        self.all_offsets: tuple[int, ...] = self.orthogonal_offsets + self.diagonal_offsets
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.width}, {self.height}, margin={self.margin})'
+
+    def offset(self, delta: XYtuple) -> int:
+        return delta[1] * self.stride + delta[0]
+
+    def encode(self, pt: XYtuple) -> int:
+        return (pt[1] + self.margin) * self.stride + pt[0] + self.margin
+
+    def decode(self, packed: int) -> XYpair:
+        y, x = divmod(packed, self.stride)
+        return XYpair(x - self.margin, y - self.margin)
+
+    def encode_all(self, pts: collections.abc.Iterable[XYtuple]) -> set[int]:
+        return {self.encode(pt) for pt in pts}
+
+    def decode_all(self, packed: collections.abc.Iterable[int]) -> set[XYpair]:
+        return {self.decode(p) for p in packed}
+
+    def in_grid(self, packed: int) -> bool:
+        y, x = divmod(packed, self.stride)
+        return self.margin <= x < self.width + self.margin and self.margin <= y < self.height + self.margin
+
+    def neighbors(self, packed: int, *, include_corners: bool = False, corners_only: bool = False) -> tuple[int, ...]:
+        if corners_only:
+            offsets: tuple[int, ...] = self.diagonal_offsets
+        elif include_corners:
+            offsets = self.all_offsets
+        else:
+            offsets = self.orthogonal_offsets
+        return tuple(packed + d for d in offsets)
+
+
 def reading_order(pt: XYtuple) -> tuple[int, ...]:
     return pt[::-1]
 